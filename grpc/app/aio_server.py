@@ -0,0 +1,1045 @@
+"""
+asyncio gRPC server, selected with GRPC_SERVER_MODE=aio.
+
+The library services run as coroutines on a single event loop, using
+psycopg 3's async connection pool and redis.asyncio. A request that waits
+on PostgreSQL, Redis or a Raft commit does not hold a thread, so
+concurrency is not limited by a worker pool. The Raft layer is unchanged.
+RaftNode keeps its own threads, and its RPC handlers run in the server's
+migration thread pool. The one exception is ``SubmitOperation``, which
+awaits the commit future instead. SQL, cache keys and Raft operations are
+shared with server.py.
+
+Started by ``python server.py`` when GRPC_SERVER_MODE=aio.
+"""
+
+import asyncio
+import inspect
+import json
+import math
+import os
+import signal
+import threading
+import time
+from concurrent import futures
+from datetime import datetime
+
+import bcrypt
+import grpc
+import psycopg
+import redis.asyncio as aioredis
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool
+
+import availability
+import library_pb2
+import library_pb2_grpc
+import operations
+import raft_pb2
+import raft_pb2_grpc
+import server as core
+
+# Connections the event loop may use at once; waiting requests queue in the
+# pool instead of failing. The threaded background worker keeps a small
+# psycopg2 pool of its own.
+AIO_DB_POOL_MIN = int(os.getenv('AIO_DB_POOL_MIN', '10'))
+AIO_DB_POOL_MAX = int(os.getenv('AIO_DB_POOL_MAX', '50'))
+AIO_WORKER_DB_POOL_MAX = int(os.getenv('AIO_WORKER_DB_POOL_MAX', '10'))
+# Past this many in-flight RPCs new ones get RESOURCE_EXHAUSTED
+AIO_MAX_CONCURRENT_RPCS = int(os.getenv('AIO_MAX_CONCURRENT_RPCS', '2000'))
+# Threads for the synchronous RaftNode handlers (each Replicate stream holds one)
+AIO_RAFT_WORKERS = int(os.getenv('AIO_RAFT_WORKERS', '32'))
+
+DB_POOL = None
+redis_client = aioredis.from_url(core.REDIS_URL, decode_responses=True)
+# Without decoding, for the GetSeats cache (serialized GetSeatsResponse bytes)
+redis_bytes_client = aioredis.from_url(core.REDIS_URL)
+# Leader address -> RaftServiceStub on an aio channel, for forwarded writes
+_leader_stubs = {}
+
+
+async def fetchone(query, params=()):
+    async with DB_POOL.connection() as conn:
+        cur = await conn.execute(query, params)
+        return await cur.fetchone()
+
+
+async def fetchall(query, params=()):
+    async with DB_POOL.connection() as conn:
+        cur = await conn.execute(query, params)
+        return await cur.fetchall()
+
+
+async def fetch_seats(request, from_memory):
+    """Async core.fetch_seats."""
+    async with DB_POOL.connection() as conn:
+        cur = await conn.execute(*core.seats_query(request))
+        seats = await cur.fetchall()
+        if from_memory:
+            return seats
+        cur = await conn.execute(*availability.blocking_seats_query(request.start_time, request.end_time))
+        blocked = [row['seat_id'] for row in await cur.fetchall()]
+    return availability.mark_available(seats, blocked)
+
+
+async def seat_location(seat_id):
+    location = core.SEAT_LOCATIONS.get(seat_id)
+    if location is None:
+        row = await fetchone('SELECT branch, area FROM seats WHERE id = %s', (seat_id,))
+        if row:
+            location = core.SEAT_LOCATIONS[seat_id] = (row['branch'], row['area'] or '')
+    return location
+
+
+async def invalidate_seat_cache(seat_id):
+    try:
+        location = await seat_location(seat_id)
+    except Exception as e:
+        print(f"Seat location lookup error: {e}")
+        location = None
+    tags = core.seat_cache_tags(location)
+    core.apply_seat_invalidation(tags)
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.delete(f"seat:{seat_id}")
+        for tag in tags:
+            pipe.incr(tag)
+        pipe.publish(core.SEATS_INVALIDATION_CHANNEL, json.dumps(tags))
+        await pipe.execute()
+    except Exception as e:
+        print(f"Cache invalidation error: {e}")
+
+
+class AsyncSingleFlight:
+    """core.SingleFlight for coroutines: one task per key, shared by every
+    caller that arrives while it runs."""
+
+    def __init__(self):
+        self.tasks = {}
+
+    def do(self, key, fn):
+        """Awaitable result of fn() or of the task already running for ``key``."""
+        task = self.tasks.get(key) or self._start(key, fn)
+        # A caller that gives up must not cancel the query for the others
+        return asyncio.shield(task)
+
+    def do_background(self, key, fn):
+        if key not in self.tasks:
+            self._start(key, fn)
+
+    def _start(self, key, fn):
+        task = self.tasks[key] = asyncio.ensure_future(fn())
+        task.add_done_callback(lambda done: self._finish(key, done))
+        return task
+
+    def _finish(self, key, task):
+        if self.tasks.get(key) is task:
+            del self.tasks[key]
+        if not task.cancelled() and task.exception() is not None:
+            print(f"[Cache] load of {key} failed: {task.exception()}")
+
+
+SEATS_LOADS = AsyncSingleFlight()
+
+
+# SEAT_STATE (its lock is held across each apply) and the staleness check
+# (RaftNode.state_lock) are read on a worker thread, not the event loop
+def seat_available_from_memory(seat_id, start_time, end_time):
+    """SEAT_STATE's answer for the seat, or None if it may not serve the read."""
+    if (core.SEAT_STATE is not None and core.SEAT_STATE.covers(start_time if start_time and end_time else None)
+            and core.replicated_state_fresh()):
+        return core.SEAT_STATE.is_available(seat_id, start_time, end_time)
+    return None
+
+
+async def seat_infos(request, seats, from_memory):
+    """core.seat_infos."""
+    if from_memory:
+        return await asyncio.to_thread(core.seat_infos, request, seats, from_memory)
+    return core.seat_infos(request, seats, from_memory)
+
+
+async def load_seats(request, cache_key, l1_key, tag, l1_version):
+    """Async core.load_seats."""
+    started = time.monotonic()
+    from_memory = await asyncio.to_thread(core.seats_from_memory, request, False)
+    seats = await fetch_seats(request, from_memory)
+    payload = core.seats_response(await seat_infos(request, seats, from_memory)).SerializeToString()
+    await redis_bytes_client.setex(
+        cache_key, math.ceil(core.SEATS_CACHE_TTL + core.SEATS_CACHE_STALE_TTL),
+        core.pack_seats_entry(payload, time.monotonic() - started)
+    )
+    core.L1_CACHE.put(l1_key, tag, payload, l1_version)
+    return payload
+
+
+async def record_seats_cache(outcome):
+    counts = core.SEATS_CACHE_STATS.record(outcome)
+    if counts:
+        print(core.cache_stats_line(counts))
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            for name, count in counts.items():
+                pipe.hincrby(core.SEATS_CACHE_STATS_KEY, name, count)
+            await pipe.execute()
+        except Exception as e:
+            print(f"Cache stats export error: {e}")
+
+
+def _leader_stub(address):
+    stub = _leader_stubs.get(address)
+    if stub is None:
+        stub = _leader_stubs[address] = raft_pb2_grpc.RaftServiceStub(grpc.aio.insecure_channel(address))
+    return stub
+
+
+async def submit_operation(node, request, context):
+    """RaftNode.SubmitOperation for coroutines: same deadline, shedding and
+    forwarding rules, but the commit is awaited on the event loop."""
+    caller_id = request.source_id or "client"
+    print(f"Node {node.node_id} runs RPC SubmitOperation called by Node {caller_id}")
+    deadline = time.time() + core.commit_timeout(context)
+
+    if node.transfer_target is not None or node.role == 'candidate':
+        # Leadership is moving: the threaded path holds the write until it settles
+        return await asyncio.to_thread(node.SubmitOperation, request, context)
+
+    if node.role != 'leader' or (node.leader_id and node.leader_id != node.node_id):
+        leader_address = node._get_leader_address()
+        if leader_address:
+            forward_request = raft_pb2.OperationRequest(
+                operation=request.operation, payload=request.payload, source_id=node.node_id
+            )
+            try:
+                node._log_client("SubmitOperation", node.leader_id or leader_address)
+                return await _leader_stub(leader_address).SubmitOperation(
+                    forward_request, timeout=max(deadline - time.time(), 0)
+                )
+            except grpc.RpcError as e:
+                print(f"[Raft] Forward SubmitOperation failed: {e}")
+        return raft_pb2.OperationResponse(success=False, result="No known leader", leader_id=node.leader_id or "")
+
+    # _propose takes RaftNode.state_lock, held by the Raft threads across log
+    # appends (fsync per record with fsync_mode='entry'): keep it off the event loop
+    proposal = await asyncio.to_thread(node._propose, request, deadline)
+    if isinstance(proposal, raft_pb2.OperationResponse):
+        return proposal
+    index, term, future = proposal
+    try:
+        # shield: a timeout must not cancel the future the apply loop resolves
+        outcome = await asyncio.wait_for(
+            asyncio.shield(asyncio.wrap_future(future)), max(deadline - time.time(), 0)
+        )
+    except asyncio.TimeoutError:
+        outcome = await asyncio.to_thread(node._abandon_commit_wait, index, future)
+    return node._commit_response(*node._commit_status(term, outcome))
+
+
+async def replicate(payload, source, context):
+    """Replicate a typed operation before touching the database. Returns the
+    OperationResponse, or None after setting the gRPC status."""
+    node = core.RAFT_NODE_INSTANCE
+    if node is None:
+        return raft_pb2.OperationResponse(success=True)
+    try:
+        response = await submit_operation(
+            node, raft_pb2.OperationRequest(payload=payload, source_id=f"{source}:{core.RAFT_NODE_ID}"), context
+        )
+    except Exception as e:
+        context.set_code(grpc.StatusCode.UNAVAILABLE)
+        context.set_details(f"Raft submit error: {e}")
+        return None
+    if not response.success:
+        context.set_code(core.raft_failure_code(response))
+        context.set_details(f"Raft commit failed: {response.result}")
+        return None
+    return response
+
+
+async def release_reservation_key(key):
+    """Undo a committed Reservation.Create whose database insert did not happen."""
+    node = core.RAFT_NODE_INSTANCE
+    if key is None or node is None:
+        return
+    request = raft_pb2.OperationRequest(payload=operations.reservation_abort(key), source_id=node.node_id)
+    response = await submit_operation(node, request, None)
+    if not response.success:
+        print(f"[Raft] Operation log not committed: {response.result}")
+
+
+async def linearizable_read_barrier(context):
+    """core.linearizable_read_barrier() without blocking the event loop."""
+    node = core.RAFT_NODE_INSTANCE
+    if node is None or await asyncio.to_thread(node.linearizable_read):
+        return True
+    context.set_code(grpc.StatusCode.UNAVAILABLE)
+    context.set_details('Linearizable read unavailable: no confirmed Raft leader')
+    return False
+
+
+def reservation_message(row):
+    return library_pb2.Reservation(
+        id=row['id'],
+        user_id=row['user_id'],
+        seat_id=row['seat_id'],
+        start_time=str(row['start_time']),
+        end_time=str(row['end_time']),
+        status=row['status'],
+        created_at=str(row['created_at']),
+        checked_in_at=str(row['checked_in_at']) if row['checked_in_at'] else ''
+    )
+
+
+def reservation_detail(row, student_id='', user_name=''):
+    return library_pb2.ReservationDetail(
+        id=row['id'],
+        user_id=row['user_id'],
+        seat_id=row['seat_id'],
+        start_time=str(row['start_time']),
+        end_time=str(row['end_time']),
+        status=row['status'],
+        created_at=str(row['created_at']),
+        checked_in_at=str(row['checked_in_at']) if row['checked_in_at'] else '',
+        branch=row['branch'],
+        area=row['area'] or '',
+        has_power=row['has_power'],
+        has_monitor=row['has_monitor'],
+        student_id=student_id,
+        user_name=user_name
+    )
+
+
+class AioRaftLeaderInterceptor(grpc.aio.ServerInterceptor):
+    """core.RaftLeaderInterceptor for grpc.aio: wraps coroutine handlers and
+    the synchronous RaftNode handlers alike."""
+
+    def __init__(self, raft_node):
+        self.raft_node = raft_node
+
+    async def intercept_service(self, continuation, handler_call_details):
+        handler = await continuation(handler_call_details)
+        if handler is None or handler.unary_unary is None:
+            return handler
+        behavior = handler.unary_unary
+
+        if inspect.iscoroutinefunction(behavior):
+            async def with_leader(request, context):
+                response = await behavior(request, context)
+                context.set_trailing_metadata(core.raft_leader_metadata(self.raft_node))
+                return response
+        else:
+            def with_leader(request, context):
+                response = behavior(request, context)
+                context.set_trailing_metadata(core.raft_leader_metadata(self.raft_node))
+                return response
+
+        return handler._replace(unary_unary=with_leader)
+
+
+class AioRaftService:
+    """RaftNode's RPCs as they are, except SubmitOperation (writes forwarded
+    by followers), which awaits the commit instead of holding a thread."""
+
+    def __init__(self, raft_node):
+        self.raft_node = raft_node
+
+    def __getattr__(self, name):
+        return getattr(self.raft_node, name)
+
+    async def SubmitOperation(self, request, context):
+        return await submit_operation(self.raft_node, request, context)
+
+
+class AuthServiceServicer(library_pb2_grpc.AuthServiceServicer):
+    async def Login(self, request, context):
+        try:
+            user = await fetchone(
+                'SELECT id, student_id, password_hash, name FROM users WHERE student_id = %s',
+                (request.student_id,)
+            )
+
+            # bcrypt is deliberately slow: keep it off the event loop
+            if not user or not await asyncio.to_thread(
+                bcrypt.checkpw, request.password.encode('utf-8'), user['password_hash'].encode('utf-8')
+            ):
+                context.set_code(grpc.StatusCode.UNAUTHENTICATED)
+                context.set_details('Invalid credentials')
+                return library_pb2.LoginResponse()
+
+            token = core.generate_jwt(user['id'], user['student_id'])
+
+            return library_pb2.LoginResponse(
+                token=token,
+                user_id=user['id'],
+                student_id=user['student_id'],
+                name=user['name'] or ''
+            )
+
+        except Exception as e:
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(str(e))
+            return library_pb2.LoginResponse()
+
+    async def Register(self, request, context):
+        try:
+            # Step 1: replicate the intent through Raft before executing
+            if await replicate(operations.auth_register(request.student_id, request.name),
+                               'AuthService', context) is None:
+                return library_pb2.RegisterResponse()
+
+            # Step 2: execute the actual user registration against the database
+            password_hash = (await asyncio.to_thread(
+                bcrypt.hashpw, request.password.encode('utf-8'), bcrypt.gensalt()
+            )).decode('utf-8')
+
+            try:
+                user = await fetchone(
+                    'INSERT INTO users (student_id, password_hash, name) VALUES (%s, %s, %s) RETURNING id, student_id, name',
+                    (request.student_id, password_hash, request.name)
+                )
+            except psycopg.IntegrityError:
+                context.set_code(grpc.StatusCode.ALREADY_EXISTS)
+                context.set_details('Student ID already exists')
+                return library_pb2.RegisterResponse()
+
+            token = core.generate_jwt(user['id'], user['student_id'])
+
+            return library_pb2.RegisterResponse(
+                token=token,
+                user_id=user['id'],
+                student_id=user['student_id'],
+                name=user['name'] or ''
+            )
+
+        except Exception as e:
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(str(e))
+            return library_pb2.RegisterResponse()
+
+    async def Verify(self, request, context):
+        try:
+            payload = core.verify_token(request.token)
+            return library_pb2.VerifyResponse(
+                valid=True,
+                user_id=payload['user_id'],
+                student_id=payload['student_id']
+            )
+        except Exception:
+            return library_pb2.VerifyResponse(valid=False)
+
+
+class SeatServiceServicer(library_pb2_grpc.SeatServiceServicer):
+    async def get_seat_availability(self, seat_id, start_time=None, end_time=None):
+        available = await asyncio.to_thread(seat_available_from_memory, seat_id, start_time, end_time)
+        if available is not None:
+            return available
+
+        if start_time and end_time:
+            result = await fetchone('''
+                SELECT COUNT(*) as conflict_count
+                FROM reservations
+                WHERE seat_id = %s
+                AND status NOT IN ('CANCELLED', 'NO_SHOW')
+                AND tsrange(start_time, end_time) && tsrange(%s, %s)
+            ''', (seat_id, start_time, end_time))
+            return result['conflict_count'] == 0
+
+        result = await fetchone('''
+            SELECT COUNT(*) as active_count
+            FROM reservations
+            WHERE seat_id = %s
+            AND status IN ('CONFIRMED', 'CHECKED_IN')
+            AND start_time <= NOW()
+            AND end_time > NOW()
+        ''', (seat_id,))
+        return result['active_count'] == 0
+
+    async def GetSeats(self, request, context):
+        try:
+            # A linearizable read must not be served from (possibly stale) cache
+            linearizable = core.wants_linearizable_read(context)
+            if linearizable and not await linearizable_read_barrier(context):
+                return library_pb2.GetSeatsResponse()
+
+            # Cache hits return the stored GetSeatsResponse bytes unparsed
+            if not linearizable:
+                tag = core.seats_cache_tag(request.branch, request.area)
+                l1_key = core.seats_cache_key(request, ())
+                l1_version = core.L1_CACHE.version
+                cached_response = core.L1_CACHE.get(l1_key)
+                if cached_response is not None:
+                    await record_seats_cache('l1_hit')
+                    return cached_response
+
+                cache_key = core.seats_cache_key(request, await redis_client.mget(core.SEATS_GENERATION_KEY, tag))
+
+                def load():
+                    return load_seats(request, cache_key, l1_key, tag, l1_version)
+
+                entry = await redis_bytes_client.get(cache_key)
+                if entry is not None:
+                    # Stale or due for early refresh: answer now, refresh behind
+                    cached_response, refresh_at, load_seconds = core.unpack_seats_entry(entry)
+                    if core.seats_entry_needs_refresh(refresh_at, load_seconds):
+                        SEATS_LOADS.do_background(cache_key, load)
+                        await record_seats_cache('refresh')
+                    else:
+                        core.L1_CACHE.put(l1_key, tag, cached_response, l1_version)
+                    await record_seats_cache('hit')
+                    return cached_response
+
+                # One query per key in this process; concurrent misses await it
+                await record_seats_cache('miss')
+                return await asyncio.wait_for(SEATS_LOADS.do(cache_key, load), core.rpc_timeout(context))
+
+            await record_seats_cache('bypass')
+            from_memory = await asyncio.to_thread(core.seats_from_memory, request, linearizable)
+            seats = await fetch_seats(request, from_memory)
+            return core.seats_response(await seat_infos(request, seats, from_memory))
+
+        except asyncio.TimeoutError:
+            context.set_code(grpc.StatusCode.DEADLINE_EXCEEDED)
+            context.set_details('Deadline exceeded waiting for the seat query')
+            return library_pb2.GetSeatsResponse()
+        except Exception as e:
+            print(f"[GetSeats] error: {e}")
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(str(e))
+            return library_pb2.GetSeatsResponse()
+
+    async def GetSeat(self, request, context):
+        try:
+            seat = await fetchone('SELECT * FROM seats WHERE id = %s', (request.seat_id,))
+
+            if not seat:
+                context.set_code(grpc.StatusCode.NOT_FOUND)
+                context.set_details('Seat not found')
+                return library_pb2.GetSeatResponse()
+
+            is_available = await self.get_seat_availability(request.seat_id)
+
+            return library_pb2.GetSeatResponse(
+                seat=library_pb2.Seat(
+                    id=seat['id'],
+                    branch=seat['branch'],
+                    area=seat['area'] or '',
+                    has_power=seat['has_power'],
+                    has_monitor=seat['has_monitor'],
+                    status=seat['status'],
+                    is_available=is_available
+                )
+            )
+
+        except Exception as e:
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(str(e))
+            return library_pb2.GetSeatResponse()
+
+    async def CheckAvailability(self, request, context):
+        try:
+            seat = await fetchone('SELECT id FROM seats WHERE id = %s', (request.seat_id,))
+
+            if not seat:
+                context.set_code(grpc.StatusCode.NOT_FOUND)
+                context.set_details('Seat not found')
+                return library_pb2.CheckAvailabilityResponse()
+
+            is_available = await self.get_seat_availability(request.seat_id, request.start_time, request.end_time)
+
+            return library_pb2.CheckAvailabilityResponse(
+                seat_id=request.seat_id,
+                available=is_available,
+                start_time=request.start_time,
+                end_time=request.end_time
+            )
+
+        except Exception as e:
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(str(e))
+            return library_pb2.CheckAvailabilityResponse()
+
+    async def GetBranches(self, request, context):
+        try:
+            l1_version = core.L1_CACHE.version
+            cached_response = core.L1_CACHE.get(core.BRANCHES_CACHE_KEY)
+            if cached_response is not None:
+                return cached_response
+
+            branches = await fetchall('''
+                SELECT branch, COUNT(*) as total_seats,
+                       COUNT(*) FILTER (WHERE has_power) as power_seats,
+                       COUNT(*) FILTER (WHERE has_monitor) as monitor_seats
+                FROM seats
+                GROUP BY branch
+                ORDER BY branch
+            ''')
+
+            result = [library_pb2.Branch(
+                branch=b['branch'],
+                total_seats=b['total_seats'],
+                power_seats=b['power_seats'],
+                monitor_seats=b['monitor_seats']
+            ) for b in branches]
+
+            serialized = library_pb2.GetBranchesResponse(branches=result).SerializeToString()
+            core.L1_CACHE.put(core.BRANCHES_CACHE_KEY, core.SEATS_GENERATION_KEY, serialized, l1_version)
+            return serialized
+
+        except Exception as e:
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(str(e))
+            return library_pb2.GetBranchesResponse()
+
+
+class ReservationServiceServicer(library_pb2_grpc.ReservationServiceServicer):
+    # Unlike the threaded handlers, no database connection is held while
+    # the Raft commit is awaited
+
+    async def CreateReservation(self, request, context):
+        try:
+            seat = await fetchone('SELECT id FROM seats WHERE id = %s', (request.seat_id,))
+
+            if not seat:
+                context.set_code(grpc.StatusCode.NOT_FOUND)
+                context.set_details('Seat not found')
+                return library_pb2.CreateReservationResponse()
+
+            # Step 1: replicate the intent through Raft; the replicated seat
+            # state machine detects conflicts when the entry is applied
+            try:
+                payload = operations.reservation_create(
+                    request.user_id, request.seat_id, request.start_time, request.end_time
+                )
+            except ValueError as e:
+                context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+                context.set_details(f"Invalid reservation: {e}")
+                return library_pb2.CreateReservationResponse()
+            raft_response = await replicate(payload, 'ReservationService', context)
+            if raft_response is None:
+                return library_pb2.CreateReservationResponse()
+
+            outcome = json.loads(raft_response.result) if raft_response.result.startswith('{') else {}
+            if outcome.get('error') == 'conflict' and await fetchone(
+                core.OVERLAPPING_RESERVATION_SQL, (request.seat_id, request.start_time, request.end_time)
+            ) is None:
+                # The seat state holds a reservation PostgreSQL does not (see
+                # core.SeatStateReconciler): let the exclusion constraint decide
+                print(f"[SeatState] Conflict on seat {request.seat_id} has no database row")
+                outcome = {}
+            if outcome.get('ok') is False:
+                if outcome.get('error') == 'conflict':
+                    context.set_code(grpc.StatusCode.ALREADY_EXISTS)
+                    context.set_details('Time slot conflict: seat already reserved for this time period')
+                else:
+                    context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+                    context.set_details(f"Invalid reservation: {outcome.get('details', outcome.get('error'))}")
+                return library_pb2.CreateReservationResponse()
+            reservation_key = outcome.get('key')
+
+            # Step 2: execute the actual reservation creation against the database
+            try:
+                reservation = await fetchone('''
+                    INSERT INTO reservations (user_id, seat_id, start_time, end_time, status)
+                    VALUES (%s, %s, %s, %s, 'CONFIRMED')
+                    RETURNING id, user_id, seat_id, start_time, end_time, status, created_at, checked_in_at
+                ''', (request.user_id, request.seat_id, request.start_time, request.end_time))
+            except psycopg.IntegrityError as e:
+                await release_reservation_key(reservation_key)
+
+                if 'reservations_no_overlap' in str(e):
+                    context.set_code(grpc.StatusCode.ALREADY_EXISTS)
+                    context.set_details('Time slot conflict: seat already reserved for this time period')
+                else:
+                    context.set_code(grpc.StatusCode.FAILED_PRECONDITION)
+                    context.set_details('Database constraint violation')
+
+                return library_pb2.CreateReservationResponse()
+            except Exception:
+                await release_reservation_key(reservation_key)
+                raise
+
+            await invalidate_seat_cache(request.seat_id)
+
+            return library_pb2.CreateReservationResponse(reservation=reservation_message(reservation))
+
+        except Exception as e:
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(str(e))
+            return library_pb2.CreateReservationResponse()
+
+    async def GetReservation(self, request, context):
+        try:
+            if core.wants_linearizable_read(context) and not await linearizable_read_barrier(context):
+                return library_pb2.GetReservationResponse()
+
+            reservation = await fetchone('''
+                SELECT r.*, s.branch, s.area, s.has_power, s.has_monitor,
+                       u.student_id, u.name as user_name
+                FROM reservations r
+                JOIN seats s ON r.seat_id = s.id
+                JOIN users u ON r.user_id = u.id
+                WHERE r.id = %s
+            ''', (request.reservation_id,))
+
+            if not reservation:
+                context.set_code(grpc.StatusCode.NOT_FOUND)
+                context.set_details('Reservation not found')
+                return library_pb2.GetReservationResponse()
+
+            return library_pb2.GetReservationResponse(
+                reservation=reservation_detail(
+                    reservation, reservation['student_id'], reservation['user_name'] or ''
+                )
+            )
+
+        except Exception as e:
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(str(e))
+            return library_pb2.GetReservationResponse()
+
+    async def CheckIn(self, request, context):
+        try:
+            # Step 1: validate the reservation against the database
+            reservation = await fetchone('''
+                SELECT id, status, start_time, end_time, seat_id
+                FROM reservations
+                WHERE id = %s
+            ''', (request.reservation_id,))
+
+            if not reservation:
+                context.set_code(grpc.StatusCode.NOT_FOUND)
+                context.set_details('Reservation not found')
+                return library_pb2.CheckInResponse()
+
+            if reservation['status'] != 'CONFIRMED':
+                context.set_code(grpc.StatusCode.FAILED_PRECONDITION)
+                context.set_details(f'Cannot check in: reservation status is {reservation["status"]}')
+                return library_pb2.CheckInResponse()
+
+            now = datetime.utcnow()
+
+            if now < reservation['start_time']:
+                context.set_code(grpc.StatusCode.FAILED_PRECONDITION)
+                context.set_details('Cannot check in before reservation start time')
+                return library_pb2.CheckInResponse()
+
+            if now > reservation['end_time']:
+                context.set_code(grpc.StatusCode.FAILED_PRECONDITION)
+                context.set_details('Cannot check in after reservation end time')
+                return library_pb2.CheckInResponse()
+
+            # Step 2: replicate the intent through Raft before writing
+            payload = operations.reservation_ref(
+                'check_in', request.reservation_id, reservation['seat_id'], reservation['start_time']
+            )
+            if await replicate(payload, 'ReservationService', context) is None:
+                return library_pb2.CheckInResponse()
+
+            # Step 3: execute the actual check-in against the database
+            updated_reservation = await fetchone('''
+                UPDATE reservations
+                SET status = 'CHECKED_IN', checked_in_at = NOW()
+                WHERE id = %s
+                RETURNING id, user_id, seat_id, start_time, end_time, status, created_at, checked_in_at
+            ''', (request.reservation_id,))
+
+            await invalidate_seat_cache(reservation['seat_id'])
+
+            return library_pb2.CheckInResponse(reservation=reservation_message(updated_reservation))
+
+        except Exception as e:
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(str(e))
+            return library_pb2.CheckInResponse()
+
+    async def CancelReservation(self, request, context):
+        try:
+            # Step 1: validate the reservation against the database
+            reservation = await fetchone('''
+                SELECT id, status, seat_id, start_time
+                FROM reservations
+                WHERE id = %s
+            ''', (request.reservation_id,))
+
+            if not reservation:
+                context.set_code(grpc.StatusCode.NOT_FOUND)
+                context.set_details('Reservation not found')
+                return library_pb2.CancelReservationResponse()
+
+            if reservation['status'] in ('CANCELLED', 'NO_SHOW', 'COMPLETED'):
+                context.set_code(grpc.StatusCode.FAILED_PRECONDITION)
+                context.set_details(f'Cannot cancel: reservation status is {reservation["status"]}')
+                return library_pb2.CancelReservationResponse()
+
+            # Step 2: replicate the intent through Raft before writing
+            payload = operations.reservation_ref(
+                'cancel', request.reservation_id, reservation['seat_id'], reservation['start_time']
+            )
+            if await replicate(payload, 'ReservationService', context) is None:
+                return library_pb2.CancelReservationResponse()
+
+            # Step 3: execute the actual cancellation against the database
+            cancelled_reservation = await fetchone('''
+                UPDATE reservations
+                SET status = 'CANCELLED'
+                WHERE id = %s
+                RETURNING id, user_id, seat_id, start_time, end_time, status, created_at, checked_in_at
+            ''', (request.reservation_id,))
+
+            await invalidate_seat_cache(reservation['seat_id'])
+
+            return library_pb2.CancelReservationResponse(reservation=reservation_message(cancelled_reservation))
+
+        except Exception as e:
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(str(e))
+            return library_pb2.CancelReservationResponse()
+
+    async def GetUserReservations(self, request, context):
+        try:
+            if core.wants_linearizable_read(context) and not await linearizable_read_barrier(context):
+                return library_pb2.GetUserReservationsResponse()
+
+            query = '''
+                SELECT r.*, s.branch, s.area, s.has_power, s.has_monitor
+                FROM reservations r
+                JOIN seats s ON r.seat_id = s.id
+                WHERE r.user_id = %s
+            '''
+            params = [request.user_id]
+
+            if request.status:
+                query += ' AND r.status = %s'
+                params.append(request.status)
+
+            if request.upcoming_only:
+                query += ' AND r.end_time > NOW()'
+
+            query += ' ORDER BY r.start_time DESC'
+
+            reservations = await fetchall(query, params)
+            result = [reservation_detail(r) for r in reservations]
+
+            return library_pb2.GetUserReservationsResponse(reservations=result, count=len(result))
+
+        except Exception as e:
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(str(e))
+            return library_pb2.GetUserReservationsResponse()
+
+
+class NotifyServiceServicer(library_pb2_grpc.NotifyServiceServicer):
+    async def AddToWaitlist(self, request, context):
+        try:
+            seat_id = request.seat_id if request.HasField('seat_id') else None
+
+            # Step 1: replicate the intent through Raft before executing
+            try:
+                payload = operations.waitlist_add(request.user_id, seat_id, request.branch, request.desired_time)
+            except ValueError as e:
+                context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+                context.set_details(f"Invalid desired_time: {e}")
+                return library_pb2.AddToWaitlistResponse()
+            if await replicate(payload, 'NotifyService', context) is None:
+                return library_pb2.AddToWaitlistResponse()
+
+            # Step 2: execute the actual waitlist insertion against the database
+            waitlist_entry = await fetchone('''
+                INSERT INTO waitlist (user_id, seat_id, branch, desired_time)
+                VALUES (%s, %s, %s, %s)
+                RETURNING id, user_id, seat_id, branch, desired_time, created_at
+            ''', (request.user_id, seat_id, request.branch, request.desired_time))
+
+            desired_time = waitlist_entry['desired_time']
+
+            return library_pb2.AddToWaitlistResponse(
+                entry=library_pb2.WaitlistEntry(
+                    id=waitlist_entry['id'],
+                    user_id=waitlist_entry['user_id'],
+                    seat_id=waitlist_entry['seat_id'] if waitlist_entry['seat_id'] else 0,
+                    branch=waitlist_entry['branch'] or '',
+                    desired_time=str(desired_time) if desired_time else '',
+                    created_at=str(waitlist_entry['created_at'])
+                )
+            )
+
+        except Exception as e:
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(str(e))
+            return library_pb2.AddToWaitlistResponse()
+
+    async def GetUserWaitlist(self, request, context):
+        try:
+            waitlist_entries = await fetchall('''
+                SELECT w.*, s.branch as seat_branch, s.area
+                FROM waitlist w
+                LEFT JOIN seats s ON w.seat_id = s.id
+                WHERE w.user_id = %s
+                ORDER BY w.created_at DESC
+            ''', (request.user_id,))
+
+            result = [library_pb2.WaitlistEntry(
+                id=e['id'],
+                user_id=e['user_id'],
+                seat_id=e['seat_id'] if e['seat_id'] else 0,
+                branch=e['branch'] or e['seat_branch'] or '',
+                desired_time=str(e['desired_time']) if e['desired_time'] else '',
+                created_at=str(e['created_at'])
+            ) for e in waitlist_entries]
+
+            return library_pb2.GetUserWaitlistResponse(entries=result, count=len(result))
+
+        except Exception as e:
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(str(e))
+            return library_pb2.GetUserWaitlistResponse()
+
+    async def RemoveFromWaitlist(self, request, context):
+        try:
+            # Step 1: look up the entry so replicas can identify it
+            entry = await fetchone('SELECT user_id, seat_id, branch, desired_time FROM waitlist WHERE id = %s',
+                                   (request.waitlist_id,))
+
+            if not entry:
+                context.set_code(grpc.StatusCode.NOT_FOUND)
+                context.set_details('Waitlist entry not found')
+                return library_pb2.RemoveFromWaitlistResponse()
+
+            # Step 2: replicate the intent through Raft before executing
+            payload = operations.waitlist_remove(
+                request.waitlist_id, entry['user_id'], entry['seat_id'], entry['branch'], entry['desired_time']
+            )
+            if await replicate(payload, 'NotifyService', context) is None:
+                return library_pb2.RemoveFromWaitlistResponse()
+
+            # Step 3: execute the actual removal against the database
+            deleted = await fetchone('DELETE FROM waitlist WHERE id = %s RETURNING id', (request.waitlist_id,))
+
+            if not deleted:
+                context.set_code(grpc.StatusCode.NOT_FOUND)
+                context.set_details('Waitlist entry not found')
+                return library_pb2.RemoveFromWaitlistResponse()
+
+            return library_pb2.RemoveFromWaitlistResponse(
+                message='Removed from waitlist',
+                id=deleted['id']
+            )
+
+        except Exception as e:
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(str(e))
+            return library_pb2.RemoveFromWaitlistResponse()
+
+    async def NotifyUsers(self, request, context):
+        try:
+            # Step 1: pick the next waiting user from the database
+            waitlist_entry = await fetchone('''
+                SELECT w.*, u.student_id, u.name
+                FROM waitlist w
+                JOIN users u ON w.user_id = u.id
+                WHERE w.seat_id = %s AND w.notified_at IS NULL
+                ORDER BY w.created_at
+                LIMIT 1
+            ''', (request.seat_id,))
+
+            if not waitlist_entry:
+                waitlist_entry = await fetchone('''
+                    SELECT w.*, u.student_id, u.name, s.branch
+                    FROM waitlist w
+                    JOIN users u ON w.user_id = u.id
+                    JOIN seats s ON s.id = %s
+                    WHERE w.branch = s.branch AND w.seat_id IS NULL AND w.notified_at IS NULL
+                    ORDER BY w.created_at
+                    LIMIT 1
+                ''', (request.seat_id,))
+
+            # Step 2: replicate the intent through Raft before writing
+            waiter = operations.waitlist_entry(
+                waitlist_entry['user_id'], waitlist_entry['seat_id'],
+                waitlist_entry['branch'], waitlist_entry['desired_time']
+            ) if waitlist_entry else None
+            payload = operations.waitlist_notify(request.seat_id, request.message, waiter)
+            if await replicate(payload, 'NotifyService', context) is None:
+                return library_pb2.NotifyUsersResponse()
+
+            if not waitlist_entry:
+                return library_pb2.NotifyUsersResponse(
+                    notified=False,
+                    user_id=0,
+                    student_id='',
+                    message='No users in waitlist for this seat'
+                )
+
+            # Step 3: record the notification in the database
+            async with DB_POOL.connection() as conn:
+                await conn.execute('''
+                    UPDATE waitlist
+                    SET notified_at = NOW()
+                    WHERE id = %s
+                ''', (waitlist_entry['id'],))
+
+            return library_pb2.NotifyUsersResponse(
+                notified=True,
+                user_id=waitlist_entry['user_id'],
+                student_id=waitlist_entry['student_id'],
+                message=request.message or 'A seat has become available'
+            )
+
+        except Exception as e:
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(str(e))
+            return library_pb2.NotifyUsersResponse()
+
+
+async def serve_async():
+    global DB_POOL
+    print("Initializing database connection pools...")
+    # The background worker stays threaded on a small psycopg2 pool
+    core.init_connection_pool(minconn=1, maxconn=AIO_WORKER_DB_POOL_MAX)
+    DB_POOL = AsyncConnectionPool(
+        core.DATABASE_URL, min_size=AIO_DB_POOL_MIN, max_size=AIO_DB_POOL_MAX,
+        kwargs={'row_factory': dict_row}, open=False
+    )
+    await DB_POOL.open()
+    raft_servicer = core.create_raft_node()
+
+    server = grpc.aio.server(
+        migration_thread_pool=futures.ThreadPoolExecutor(max_workers=AIO_RAFT_WORKERS),
+        interceptors=[AioRaftLeaderInterceptor(raft_servicer)],
+        maximum_concurrent_rpcs=AIO_MAX_CONCURRENT_RPCS
+    )
+
+    library_pb2_grpc.add_AuthServiceServicer_to_server(AuthServiceServicer(), server)
+    core.add_seat_service_to_server(SeatServiceServicer(), server)
+    library_pb2_grpc.add_ReservationServiceServicer_to_server(ReservationServiceServicer(), server)
+    library_pb2_grpc.add_NotifyServiceServicer_to_server(NotifyServiceServicer(), server)
+    library_pb2_grpc.add_OperationServiceServicer_to_server(core.OperationServiceServicer(raft_servicer), server)
+    raft_pb2_grpc.add_RaftServiceServicer_to_server(AioRaftService(raft_servicer), server)
+
+    server.add_insecure_port('[::]:9090')
+
+    worker_thread = threading.Thread(target=core.background_worker, daemon=True)
+    worker_thread.start()
+    # The invalidation subscriber is a thread too; L1_CACHE is lock-protected
+    core.start_seats_cache_subscriber()
+
+    async def shutdown():
+        # Same order as the threaded server: hand leadership off, then drain
+        print(f"[Raft] {core.RAFT_NODE_ID} received SIGTERM, shutting down")
+        if raft_servicer.role == 'leader':
+            await asyncio.to_thread(raft_servicer.transfer_leadership)
+        raft_servicer.stop()
+        await server.stop(core.GRPC_SHUTDOWN_GRACE)
+
+    loop = asyncio.get_running_loop()
+    loop.add_signal_handler(signal.SIGTERM, lambda: loop.create_task(shutdown()))
+
+    print(f'gRPC aio server started on port 9090 with {AIO_DB_POOL_MIN}-{AIO_DB_POOL_MAX} async database connections')
+    await server.start()
+    raft_servicer.start()
+    await server.wait_for_termination()
+    await DB_POOL.close()
+
+
+def serve():
+    asyncio.run(serve_async())
@@ -0,0 +1,56 @@
+"""
+Availability of every seat over one time window, computed in bulk.
+
+Instead of a correlated subquery (or a separate query) per seat, the seats
+blocked in the window come from one range query over ``reservations``, which
+the GiST exclusion index on ``(seat_id, tsrange(start_time, end_time))``
+answers. They are then matched against the seat list in one NumPy pass over a
+bitmap indexed by seat id. Seat ids are SERIAL, so the bitmap stays about as
+large as the seats table.
+"""
+
+import numpy as np
+
+# Without a window, a seat is unavailable while a reservation is in progress
+BLOCKING_NOW_QUERY = """
+    SELECT DISTINCT seat_id FROM reservations
+    WHERE status IN ('CONFIRMED', 'CHECKED_IN')
+    AND start_time <= NOW()
+    AND end_time > NOW()
+"""
+
+# Same predicate as the exclusion constraint, so its partial index applies
+BLOCKING_WINDOW_QUERY = """
+    SELECT DISTINCT seat_id FROM reservations
+    WHERE status NOT IN ('CANCELLED', 'NO_SHOW')
+    AND tsrange(start_time, end_time) && tsrange(%s, %s)
+"""
+
+
+def blocking_seats_query(start_time=None, end_time=None):
+    """SQL and parameters for the ids of seats with a reservation overlapping
+    [start_time, end_time), or in progress now without a window."""
+    if start_time and end_time:
+        return BLOCKING_WINDOW_QUERY, [start_time, end_time]
+    return BLOCKING_NOW_QUERY, []
+
+
+def available_mask(seat_ids, blocked_seat_ids):
+    """Boolean array, True where ``seat_ids[i]`` is not in ``blocked_seat_ids``."""
+    seat_ids = np.asarray(seat_ids, dtype=np.int64)
+    blocked_seat_ids = np.asarray(blocked_seat_ids, dtype=np.int64)
+    if not seat_ids.size:
+        return np.ones(0, dtype=bool)
+    size = int(seat_ids.max()) + 1
+    blocked = np.zeros(size, dtype=bool)
+    # Blocked seats outside the listed ids cannot affect the result
+    blocked[blocked_seat_ids[blocked_seat_ids < size]] = True
+    return ~blocked[seat_ids]
+
+
+def mark_available(seats, blocked_seat_ids):
+    """Set ``is_available`` on seat rows (mappings with an ``id``); returns ``seats``."""
+    mask = available_mask([seat['id'] for seat in seats], blocked_seat_ids)
+    for seat, is_available in zip(seats, mask.tolist()):
+        seat['is_available'] = is_available
+    return seats
@@ -0,0 +1,148 @@
+"""
+Typed Raft log operations.
+
+Writes are replicated as an encoded ``raft.Operation`` (a ``oneof`` over the
+operation messages in raft.proto) in ``LogEntry.payload``: integer ids,
+timestamps packed as microseconds since the epoch and no field names on the
+wire. The builders below return those bytes, ready for
+``OperationRequest(payload=...)``.
+
+``LogEntry.operation`` remains for free-form entries (``noop``, test
+operations) and for JSON entries written by older versions, which the seat
+state machine still replays.
+"""
+
+from datetime import datetime, timedelta
+
+import raft_pb2
+
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+STATUS_CODES = {'CONFIRMED': raft_pb2.CONFIRMED, 'CHECKED_IN': raft_pb2.CHECKED_IN}
+STATUS_NAMES = {code: name for name, code in STATUS_CODES.items()}
+
+
+def parse_time(value):
+    """Parse an ISO-8601 timestamp the way PostgreSQL casts it to TIMESTAMP."""
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        text = str(value).strip()
+        if text.endswith('Z'):
+            text = text[:-1]
+        parsed = datetime.fromisoformat(text)
+    # TIMESTAMP WITHOUT TIME ZONE ignores any offset (replace() is slow, so
+    # only pay for it when there is one)
+    return parsed.replace(tzinfo=None) if parsed.tzinfo is not None else parsed
+
+
+def pack_time(value):
+    """ISO string or datetime -> microseconds since the epoch (0 for unset)."""
+    if not value:
+        return 0
+    return (parse_time(value) - EPOCH) // MICROSECOND
+
+
+def unpack_time(micros):
+    return EPOCH + timedelta(0, 0, micros) if micros else None
+
+
+def _encode(**op):
+    return raft_pb2.Operation(**op).SerializeToString()
+
+
+def decode(payload):
+    """Return (kind, message) for an encoded Operation; kind is the oneof field name."""
+    op = raft_pb2.Operation.FromString(payload)
+    kind = op.WhichOneof('op')
+    return kind, getattr(op, kind) if kind else None
+
+
+def describe(entry):
+    """Short label for a log entry, for logs."""
+    payload = entry.get('payload')
+    if not payload:
+        return entry['operation']
+    try:
+        return decode(payload)[0] or 'empty'
+    except Exception:
+        return f"<{len(payload)} bytes>"
+
+
+def auth_register(student_id, name):
+    return _encode(auth_register=raft_pb2.AuthRegister(student_id=student_id, name=name))
+
+
+def reservation_create(user_id, seat_id, start_time, end_time):
+    # Hot path: filling the oneof field in place is about twice as fast as
+    # building the sub-message and copying it in through the constructor
+    op = raft_pb2.Operation()
+    create = op.reservation_create
+    create.user_id = user_id
+    create.seat_id = seat_id
+    create.start_time = pack_time(start_time)
+    create.end_time = pack_time(end_time)
+    return op.SerializeToString()
+
+
+def reservation_ref(kind, reservation_id, seat_id, start_time):
+    """``kind`` is ``check_in``, ``cancel`` or ``no_show``."""
+    op = raft_pb2.Operation()
+    ref = getattr(op, f"reservation_{kind}")
+    ref.reservation_id = reservation_id
+    ref.seat_id = seat_id
+    ref.start_time = pack_time(start_time)
+    return op.SerializeToString()
+
+
+def reservation_abort(key):
+    return _encode(reservation_abort=raft_pb2.ReservationAbort(key=key))
+
+
+def reservation_expire(before):
+    return _encode(reservation_expire=raft_pb2.ReservationExpire(before=pack_time(before)))
+
+
+def waitlist_entry(user_id, seat_id=None, branch=None, desired_time=None, notified=False):
+    return raft_pb2.WaitlistEntry(
+        user_id=user_id, seat_id=seat_id or 0, branch=branch or '',
+        desired_time=pack_time(desired_time), notified=notified
+    )
+
+
+def reservation_import(horizon, reservations, waitlist):
+    """``reservations`` / ``waitlist`` are database rows (dicts)."""
+    return _encode(reservation_import=raft_pb2.ReservationImport(
+        horizon=pack_time(horizon),
+        reservations=[
+            raft_pb2.ImportedReservation(
+                user_id=row['user_id'], seat_id=row['seat_id'],
+                start_time=pack_time(row['start_time']), end_time=pack_time(row['end_time']),
+                status=STATUS_CODES.get(row['status'], raft_pb2.CONFIRMED)
+            )
+            for row in reservations
+        ],
+        waitlist=[
+            waitlist_entry(row['user_id'], row['seat_id'], row['branch'], row['desired_time'],
+                           notified=row['notified_at'] is not None)
+            for row in waitlist
+        ],
+    ))
+
+
+def waitlist_add(user_id, seat_id=None, branch=None, desired_time=None):
+    return _encode(waitlist_add=waitlist_entry(user_id, seat_id, branch, desired_time))
+
+
+def waitlist_remove(waitlist_id, user_id, seat_id=None, branch=None, desired_time=None):
+    return _encode(waitlist_remove=raft_pb2.WaitlistRemove(
+        waitlist_id=waitlist_id, entry=waitlist_entry(user_id, seat_id, branch, desired_time)
+    ))
+
+
+def waitlist_notify(seat_id, message, entry=None):
+    """``entry`` is the waiter being notified as a WaitlistEntry, or None."""
+    notify = raft_pb2.WaitlistNotify(seat_id=seat_id, message=message)
+    if entry is not None:
+        notify.entry.CopyFrom(entry)
+    return _encode(waitlist_notify=notify)
@@ -0,0 +1,344 @@
+"""
+Durable storage for the Raft log and term/vote metadata.
+
+Log entries are kept in append-only segment files named after the index of
+their first entry (``log-00000000000000000001.seg``). Each record is::
+
+    <4-byte big-endian payload length> <4-byte big-endian crc32> <LogEntry protobuf>
+
+Writes are buffered and made durable by ``sync()``, which the Raft node calls
+once per replication round (group fsync). ``current_term`` / ``voted_for``
+live in a small ``meta.json`` that is replaced atomically on every change.
+On startup ``load()`` memory-maps the segments, validates every record and
+drops a torn tail left behind by a crash mid-write.
+
+Log compaction writes the state-machine snapshot to ``snapshot.bin``
+(``RSN2<8-byte last index><8-byte last term><4-byte config length>
+<ClusterConfig protobuf><data>``; files without the ``RSN2`` magic are the
+original config-less layout) and then deletes every segment whose entries are
+all covered by it.
+"""
+
+import json
+import mmap
+import os
+import struct
+import threading
+import zlib
+
+import raft_pb2
+
+RECORD_HEADER = struct.Struct('>II')
+SEGMENT_PREFIX = 'log-'
+SEGMENT_SUFFIX = '.seg'
+META_FILE = 'meta.json'
+SNAPSHOT_FILE = 'snapshot.bin'
+SNAPSHOT_MAGIC = b'RSN2'
+SNAPSHOT_HEADER = struct.Struct('>4sQQI')
+LEGACY_SNAPSHOT_HEADER = struct.Struct('>QQ')
+
+
+def _fsync_dir(path):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def config_message(servers):
+    """[{'id', 'address', 'learner'}, ...] -> ClusterConfig (None stays None)."""
+    if servers is None:
+        return None
+    return raft_pb2.ClusterConfig(servers=[
+        raft_pb2.ServerInfo(id=server['id'], address=server['address'], learner=server.get('learner', False))
+        for server in servers
+    ])
+
+
+def config_servers(message):
+    return [{'id': server.id, 'address': server.address, 'learner': server.learner} for server in message.servers]
+
+
+def log_entry_message(entry):
+    return raft_pb2.LogEntry(
+        index=entry['index'], term=entry['term'], operation=entry['operation'], payload=entry.get('payload', b''),
+        config=config_message(entry.get('config'))
+    )
+
+
+def log_entry_dict(message):
+    entry = {'index': message.index, 'term': message.term, 'operation': message.operation, 'payload': message.payload}
+    if message.HasField('config'):
+        entry['config'] = config_servers(message.config)
+    return entry
+
+
+def encode_record(entry):
+    payload = log_entry_message(entry).SerializeToString()
+    return RECORD_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def scan_records(buf):
+    """Yield (offset, LogEntry) for every intact record in ``buf``; stops at the first torn/corrupt one."""
+    offset = 0
+    size = len(buf)
+    while offset + RECORD_HEADER.size <= size:
+        length, crc = RECORD_HEADER.unpack_from(buf, offset)
+        start = offset + RECORD_HEADER.size
+        end = start + length
+        if end > size:
+            return
+        payload = buf[start:end]
+        if zlib.crc32(payload) != crc:
+            return
+        entry = raft_pb2.LogEntry()
+        entry.ParseFromString(payload)
+        yield offset, entry
+        offset = end
+
+
+class RaftStorage:
+    """Segmented write-ahead log plus metadata file for a single Raft node.
+
+    ``fsync_mode`` is ``'batch'`` (fsync on ``sync()``), ``'entry'`` (fsync after
+    every appended record) or ``'off'`` (never fsync; for benchmarks only).
+    """
+
+    def __init__(self, data_dir, segment_bytes=16 * 1024 * 1024, fsync_mode='batch'):
+        self.data_dir = data_dir
+        self.segment_bytes = segment_bytes
+        self.fsync_mode = fsync_mode
+        self.lock = threading.Lock()
+        # Held for the whole of an fsync in sync(), so a caller never returns
+        # while another caller's fsync of its records is still running
+        self.sync_lock = threading.Lock()
+        self.segments = []  # first indexes, ascending
+        self.active = None
+        self.active_size = 0
+        # append() calls so far / how many of them are known to be durable
+        self.appended_seq = 0
+        self.synced_seq = 0
+        os.makedirs(self.data_dir, exist_ok=True)
+
+    def _segment_path(self, first_index):
+        return os.path.join(self.data_dir, f"{SEGMENT_PREFIX}{first_index:020d}{SEGMENT_SUFFIX}")
+
+    def _list_segments(self):
+        firsts = []
+        for name in os.listdir(self.data_dir):
+            if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX):
+                firsts.append(int(name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)]))
+        return sorted(firsts)
+
+    def _load_segment(self, first_index, expected_index, entries):
+        """Append the segment's entries after ``expected_index - 1`` to ``entries``.
+
+        Returns the byte offset of the first torn, corrupt or out-of-sequence
+        record, or None if the whole segment is intact.
+        """
+        path = self._segment_path(first_index)
+        if os.path.getsize(path) == 0:
+            return None
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            valid_bytes = 0
+            for offset, entry in scan_records(buf):
+                if entry.index >= expected_index:
+                    if entry.index != expected_index:
+                        return offset
+                    entries.append(log_entry_dict(entry))
+                    expected_index += 1
+                valid_bytes = offset + RECORD_HEADER.size + entry.ByteSize()
+            return valid_bytes if valid_bytes < len(buf) else None
+
+    def load(self):
+        """Recover (current_term, voted_for, snapshot, entries) from disk.
+
+        ``snapshot`` is ``(last_index, last_term, data, config)`` or None;
+        ``entries`` only holds what comes after the snapshot.
+        """
+        current_term, voted_for = 0, None
+        meta_path = os.path.join(self.data_dir, META_FILE)
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                meta = json.load(f)
+            current_term = meta.get('current_term', 0)
+            voted_for = meta.get('voted_for')
+
+        snapshot = self.load_snapshot()
+        entries = []
+        with self.lock:
+            self.segments = self._list_segments()
+            for position, first_index in enumerate(self.segments):
+                expected_index = entries[-1]['index'] + 1 if entries else (snapshot[0] + 1 if snapshot else 1)
+                bad_offset = self._load_segment(first_index, expected_index, entries)
+                if bad_offset is not None:
+                    # Torn write or gap: everything from the first bad record on is lost
+                    print(f"[RaftStorage] truncating damaged log tail in segment {first_index}")
+                    with open(self._segment_path(first_index), 'r+b') as f:
+                        f.truncate(bad_offset)
+                        os.fsync(f.fileno())
+                    for stale in self.segments[position + 1:]:
+                        os.remove(self._segment_path(stale))
+                    self.segments = self.segments[:position + 1]
+                    _fsync_dir(self.data_dir)
+                    break
+            self._open_active_locked()
+        return current_term, voted_for, snapshot, entries
+
+    def load_snapshot(self):
+        path = os.path.join(self.data_dir, SNAPSHOT_FILE)
+        if not os.path.exists(path):
+            return None
+        with open(path, 'rb') as f:
+            raw = f.read()
+        if not raw.startswith(SNAPSHOT_MAGIC):
+            last_index, last_term = LEGACY_SNAPSHOT_HEADER.unpack_from(raw, 0)
+            return last_index, last_term, raw[LEGACY_SNAPSHOT_HEADER.size:], None
+        _, last_index, last_term, config_length = SNAPSHOT_HEADER.unpack_from(raw, 0)
+        config_end = SNAPSHOT_HEADER.size + config_length
+        config = None
+        if config_length:
+            config = config_servers(raft_pb2.ClusterConfig.FromString(raw[SNAPSHOT_HEADER.size:config_end]))
+        return last_index, last_term, raw[config_end:], config
+
+    def save_snapshot(self, last_index, last_term, data, config=None):
+        """Atomically replace the snapshot, then drop segments it fully covers.
+
+        ``config`` is the cluster configuration as of ``last_index``.
+        """
+        path = os.path.join(self.data_dir, SNAPSHOT_FILE)
+        tmp_path = path + '.tmp'
+        encoded_config = config_message(config).SerializeToString() if config is not None else b''
+        with open(tmp_path, 'wb') as f:
+            f.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, last_index, last_term, len(encoded_config)))
+            f.write(encoded_config)
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        _fsync_dir(self.data_dir)
+        self.compact(last_index)
+
+    def compact(self, last_index):
+        """Delete every non-active segment whose entries all have index <= ``last_index``."""
+        with self.lock:
+            removed = False
+            while len(self.segments) > 1 and self.segments[1] <= last_index + 1:
+                os.remove(self._segment_path(self.segments.pop(0)))
+                removed = True
+            if removed:
+                _fsync_dir(self.data_dir)
+
+    def reset(self):
+        """Discard every log segment (the log is replaced wholesale by a snapshot)."""
+        with self.lock:
+            if self.active:
+                self.active.close()
+                self.active = None
+            for first_index in self.segments:
+                os.remove(self._segment_path(first_index))
+            self.segments = []
+            self.synced_seq = self.appended_seq
+            _fsync_dir(self.data_dir)
+
+    def save_meta(self, current_term, voted_for):
+        meta_path = os.path.join(self.data_dir, META_FILE)
+        tmp_path = meta_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'current_term': current_term, 'voted_for': voted_for}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, meta_path)
+        _fsync_dir(self.data_dir)
+
+    def _open_active_locked(self, first_index=None):
+        if self.active:
+            self.active.flush()
+            if self.fsync_mode != 'off':
+                os.fsync(self.active.fileno())
+            self.active.close()
+            self.active = None
+        if first_index is not None:
+            self.segments.append(first_index)
+        if not self.segments:
+            return
+        path = self._segment_path(self.segments[-1])
+        self.active = open(path, 'ab')
+        self.active_size = self.active.tell()
+        if first_index is not None:
+            _fsync_dir(self.data_dir)
+
+    def append(self, entries):
+        """Buffer ``entries`` (list of dicts with consecutive indexes) at the end of the log."""
+        if not entries:
+            return
+        with self.lock:
+            for entry in entries:
+                if self.active is None or self.active_size >= self.segment_bytes:
+                    self._open_active_locked(first_index=entry['index'])
+                record = encode_record(entry)
+                self.active.write(record)
+                self.active_size += len(record)
+                if self.fsync_mode == 'entry':
+                    self.active.flush()
+                    os.fsync(self.active.fileno())
+            self.appended_seq += 1
+            if self.fsync_mode != 'batch':
+                self.synced_seq = self.appended_seq
+
+    def sync(self):
+        """Make every record appended before the call durable with a single fsync.
+
+        fsyncs are serialized on ``sync_lock``: a caller that finds one running
+        waits for it and returns without another fsync if it covered its
+        records. Only the flush happens under the storage lock; the fsync runs
+        on a duplicated descriptor so concurrent appends are not blocked by it.
+        """
+        with self.sync_lock:
+            with self.lock:
+                if self.active is None or self.synced_seq >= self.appended_seq:
+                    return
+                self.active.flush()
+                fd = os.dup(self.active.fileno())
+                target = self.appended_seq
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            with self.lock:
+                self.synced_seq = max(self.synced_seq, target)
+
+    def truncate_from(self, index):
+        """Drop every entry with index >= ``index`` (conflicting suffix from a deposed leader)."""
+        with self.lock:
+            if self.active:
+                self.active.flush()
+                self.active.close()
+                self.active = None
+            while self.segments and self.segments[-1] >= index:
+                os.remove(self._segment_path(self.segments.pop()))
+            if self.segments:
+                path = self._segment_path(self.segments[-1])
+                keep_bytes = None
+                with open(path, 'rb') as f:
+                    data = f.read()
+                for offset, entry in scan_records(data):
+                    if entry.index >= index:
+                        keep_bytes = offset
+                        break
+                if keep_bytes is not None:
+                    with open(path, 'r+b') as f:
+                        f.truncate(keep_bytes)
+                        os.fsync(f.fileno())
+            _fsync_dir(self.data_dir)
+            self._open_active_locked()
+
+    def close(self):
+        with self.lock:
+            if self.active:
+                self.active.flush()
+                if self.fsync_mode != 'off':
+                    os.fsync(self.active.fileno())
+                self.active.close()
+                self.active = None
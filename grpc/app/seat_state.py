@@ -0,0 +1,452 @@
+"""
+Replicated in-memory seat reservation state, applied from the Raft log.
+
+Every node feeds committed ``Reservation.*`` / ``Waitlist.*`` operations
+through ``SeatStateMachine.apply()`` in log order, so all nodes hold the same
+per-seat reservation timelines and waitlist queues. Conflict detection and
+availability checks are answered from memory; PostgreSQL (and its GiST
+exclusion constraint) remains the system of record and a backstop.
+
+Operations are the typed ``raft.Operation`` payloads built in
+operations.py; JSON operations written before those existed are still
+replayed. Reservations are identified by ``(seat_id, start_time)``, which is
+unique among active reservations because they never overlap on a seat.
+Waitlist entries are matched by ``(user_id, seat_id, branch, desired_time)``.
+"""
+
+import bisect
+import json
+import threading
+from datetime import datetime
+
+from google.protobuf.message import DecodeError
+
+import operations
+from operations import parse_time, unpack_time
+
+ACTIVE_NOW_STATUSES = ('CONFIRMED', 'CHECKED_IN')
+
+
+def waitlist_identity(user_id, seat_id=None, branch=None, desired_time=None):
+    """Normalized (user_id, seat_id, branch, desired_time) used to match waitlist entries."""
+    return [
+        int(user_id),
+        int(seat_id) if seat_id else None,
+        branch or None,
+        parse_time(desired_time).isoformat() if desired_time else None,
+    ]
+
+
+def _typed_identity(entry):
+    return waitlist_identity(entry.user_id, entry.seat_id, entry.branch, unpack_time(entry.desired_time))
+
+
+def _json_identity(op, seat_field='seat_id'):
+    return waitlist_identity(op['user_id'], op.get(seat_field), op.get('branch'), op.get('desired_time'))
+
+
+def _result(ok, **fields):
+    fields['ok'] = ok
+    return json.dumps(fields, sort_keys=True)
+
+
+# Results of the hot operations, preformatted exactly as _result() renders
+# them: json.dumps of these tiny dicts costs more than the apply itself.
+_OK = _result(True)
+_CONFLICT = _result(False, error='conflict')
+_NOT_FOUND = _result(False, error='not_found')
+
+
+def _created(key):
+    return f'{{"key": {key}, "ok": true}}'
+
+
+class SeatTimeline:
+    """Active reservations of one seat, ordered by start time.
+
+    Active reservations on a seat are pairwise disjoint, so their ends are
+    sorted too and a sorted array searched with bisect answers overlap and
+    stabbing queries in O(log n) -- the degenerate case of an interval tree.
+    """
+
+    __slots__ = ('starts', 'items')
+
+    def __init__(self):
+        self.starts = []
+        self.items = []  # [start, end, status, user_id, key], parallel to starts
+
+    def overlaps(self, start, end):
+        # Only the last reservation starting before `end` can reach into [start, end)
+        position = bisect.bisect_left(self.starts, end) - 1
+        return position >= 0 and self.items[position][1] > start
+
+    def active_at(self, moment):
+        position = bisect.bisect_right(self.starts, moment) - 1
+        if position < 0:
+            return False
+        _, end, status, _, _ = self.items[position]
+        return end > moment and status in ACTIVE_NOW_STATUSES
+
+    def find(self, start):
+        position = bisect.bisect_left(self.starts, start)
+        if position < len(self.starts) and self.starts[position] == start:
+            return position
+        return None
+
+    def insert(self, start, end, status, user_id, key):
+        position = bisect.bisect_left(self.starts, start)
+        self.starts.insert(position, start)
+        self.items.insert(position, [start, end, status, user_id, key])
+
+    def remove_at(self, position):
+        del self.starts[position]
+        del self.items[position]
+
+    def expire(self, before):
+        """Drop the reservations that ended by ``before``; returns their keys."""
+        # Ends are sorted as well, so the expired reservations are a prefix
+        count = 0
+        while count < len(self.items) and self.items[count][1] <= before:
+            count += 1
+        keys = [item[4] for item in self.items[:count]]
+        del self.starts[:count]
+        del self.items[:count]
+        return keys
+
+    def __len__(self):
+        return len(self.items)
+
+
+class SeatStateMachine:
+    """Deterministic reservation/waitlist state; plugs into ``RaftNode(state_machine=...)``.
+
+    ``imported`` is set once a ``Reservation.Import`` entry has loaded the
+    reservations that existed in PostgreSQL before the log did; until then
+    (and for ranges starting before ``import_horizon``) availability has to
+    come from the database. ``reservation_expire`` entries move
+    ``retention_horizon`` forward and drop what ended before it, which keeps
+    the state and its snapshots bounded; ranges starting before it also go
+    to the database.
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        self.seats = {}
+        self.by_key = {}  # reservation key (log index of its Create) -> (seat_id, start)
+        self.waitlist = []  # FIFO of [key, user_id, seat_id, branch, desired_time, notified]
+        self.imported = False
+        self.import_horizon = None
+        self.retention_horizon = None
+        self.applied_ops = 0
+
+    # -- Raft state machine interface -------------------------------------
+
+    def apply(self, entry):
+        payload = entry.get('payload')
+        try:
+            if payload:
+                kind, op = operations.decode(payload)
+                handler = self.HANDLERS.get(kind)
+            else:
+                op = json.loads(entry['operation'])
+                handler = self.JSON_HANDLERS.get(op.get('type')) if isinstance(op, dict) else None
+        except (TypeError, ValueError, DecodeError):
+            handler = None
+        if handler is None:
+            return f"Executed {operations.describe(entry)} at index {entry['index']} (term {entry['term']})"
+
+        with self.lock:
+            self.applied_ops += 1
+            try:
+                return handler(self, op, entry['index'])
+            except (KeyError, TypeError, ValueError) as e:
+                # Malformed payloads must fail the same way on every node
+                return _result(False, error='invalid', details=str(e))
+
+    def snapshot(self):
+        with self.lock:
+            seats = {
+                str(seat_id): [
+                    [start.isoformat(), end.isoformat(), status, user_id, key]
+                    for start, end, status, user_id, key in timeline.items
+                ]
+                for seat_id, timeline in self.seats.items() if len(timeline)
+            }
+            state = {
+                'seats': seats,
+                'waitlist': self.waitlist,
+                'imported': self.imported,
+                'import_horizon': self.import_horizon.isoformat() if self.import_horizon else None,
+                'retention_horizon': self.retention_horizon.isoformat() if self.retention_horizon else None,
+                'applied_ops': self.applied_ops,
+            }
+        return json.dumps(state, separators=(',', ':')).encode('utf-8')
+
+    def restore(self, data):
+        with self.lock:
+            self._reset()
+            if not data:
+                return
+            state = json.loads(data.decode('utf-8'))
+            for seat_id, items in state.get('seats', {}).items():
+                timeline = self.seats.setdefault(int(seat_id), SeatTimeline())
+                for start, end, status, user_id, key in items:
+                    start = parse_time(start)
+                    timeline.insert(start, parse_time(end), status, user_id, key)
+                    if key is not None:
+                        self.by_key[key] = (int(seat_id), start)
+            self.waitlist = state.get('waitlist', [])
+            self.imported = state.get('imported', False)
+            horizon = state.get('import_horizon')
+            self.import_horizon = parse_time(horizon) if horizon else None
+            retention = state.get('retention_horizon')
+            self.retention_horizon = parse_time(retention) if retention else None
+            self.applied_ops = state.get('applied_ops', 0)
+
+    # -- Reservation operations -------------------------------------------
+
+    def _timeline(self, seat_id):
+        timeline = self.seats.get(seat_id)
+        if timeline is None:
+            timeline = self.seats[seat_id] = SeatTimeline()
+        return timeline
+
+    def _create(self, index, seat_id, start, end, user_id):
+        if end <= start:
+            return _result(False, error='invalid', details='end_time must be after start_time')
+        timeline = self._timeline(seat_id)
+        if timeline.overlaps(start, end):
+            return _CONFLICT
+        timeline.insert(start, end, 'CONFIRMED', user_id, index)
+        self.by_key[index] = (seat_id, start)
+        return _created(index)
+
+    def _abort(self, key):
+        # The database rejected a Create that the log had accepted
+        location = self.by_key.pop(key, None)
+        if location is None:
+            return _NOT_FOUND
+        seat_id, start = location
+        timeline = self.seats[seat_id]
+        position = timeline.find(start)
+        if position is not None and timeline.items[position][4] == key:
+            timeline.remove_at(position)
+        return _OK
+
+    def _locate(self, seat_id, start):
+        timeline = self.seats.get(seat_id)
+        position = timeline.find(start) if timeline is not None else None
+        return timeline, position
+
+    def _release(self, seat_id, start):
+        # Cancel / NoShow: the slot stops blocking the seat
+        timeline, position = self._locate(seat_id, start)
+        if position is None:
+            return _NOT_FOUND
+        key = timeline.items[position][4]
+        timeline.remove_at(position)
+        self.by_key.pop(key, None)
+        return _OK
+
+    def _check_in(self, seat_id, start):
+        timeline, position = self._locate(seat_id, start)
+        if position is None:
+            return _NOT_FOUND
+        timeline.items[position][2] = 'CHECKED_IN'
+        return _OK
+
+    def _import(self, horizon, reservations, waitlist):
+        """``reservations``: (seat_id, start, end, status, user_id); ``waitlist``: (identity, notified)."""
+        if self.imported:
+            return _result(False, error='already_imported')
+        for seat_id, start, end, status, user_id in reservations:
+            timeline = self._timeline(seat_id)
+            if timeline.find(start) is not None or timeline.overlaps(start, end):
+                continue  # already known through a Create in the log
+            timeline.insert(start, end, status, user_id, None)
+        for identity, notified in waitlist:
+            self.waitlist.append([None] + identity + [notified])
+        self.imported = True
+        self.import_horizon = horizon
+        return _result(True, reservations=len(reservations))
+
+    def _expire(self, before):
+        if before is None:
+            return _result(False, error='invalid', details='before is required')
+        if self.retention_horizon is not None and before <= self.retention_horizon:
+            return _result(True, reservations=0, waitlist=0)
+        reservations = 0
+        for seat_id in list(self.seats):
+            timeline = self.seats[seat_id]
+            for key in timeline.expire(before):
+                reservations += 1
+                if key is not None:
+                    self.by_key.pop(key, None)
+            if not len(timeline):
+                del self.seats[seat_id]
+        waiting = [item for item in self.waitlist if not item[5]]
+        waitlist = len(self.waitlist) - len(waiting)
+        self.waitlist = waiting
+        self.retention_horizon = before
+        return _result(True, reservations=reservations, waitlist=waitlist)
+
+    def expirable(self, before):
+        """How many reservations and waitlist entries ``_expire(before)`` would drop."""
+        with self.lock:
+            ended = sum(
+                1 for timeline in self.seats.values() for item in timeline.items if item[1] <= before
+            )
+            return ended + sum(1 for item in self.waitlist if item[5])
+
+    # -- Waitlist operations ----------------------------------------------
+
+    def _find_waiting(self, identity):
+        for position, item in enumerate(self.waitlist):
+            if item[1:5] == identity:
+                return position
+        return None
+
+    def _waitlist_add(self, index, identity):
+        self.waitlist.append([index] + identity + [False])
+        return _created(index)
+
+    def _waitlist_remove(self, identity):
+        position = self._find_waiting(identity)
+        if position is None:
+            return _NOT_FOUND
+        del self.waitlist[position]
+        return _OK
+
+    def _waitlist_notify(self, identity):
+        # identity is the waiter, who may be waiting for any seat in the branch
+        # of the seat that freed up
+        position = self._find_waiting(identity) if identity is not None else None
+        if position is None:
+            return _NOT_FOUND
+        self.waitlist[position][5] = True
+        return _OK
+
+    # -- Typed operations (LogEntry.payload), keyed by Operation oneof field --
+
+    def _apply_create(self, op, index):
+        return self._create(index, op.seat_id, unpack_time(op.start_time), unpack_time(op.end_time), op.user_id)
+
+    def _apply_import(self, op, index):
+        reservations = [
+            (r.seat_id, unpack_time(r.start_time), unpack_time(r.end_time),
+             operations.STATUS_NAMES.get(r.status, 'CONFIRMED'), r.user_id)
+            for r in op.reservations
+        ]
+        waitlist = [(_typed_identity(w), w.notified) for w in op.waitlist]
+        return self._import(unpack_time(op.horizon), reservations, waitlist)
+
+    def _apply_waitlist_notify(self, op, index):
+        return self._waitlist_notify(_typed_identity(op.entry) if op.HasField('entry') else None)
+
+    HANDLERS = {
+        'reservation_create': _apply_create,
+        'reservation_abort': lambda self, op, index: self._abort(op.key),
+        'reservation_check_in': lambda self, op, index: self._check_in(op.seat_id, unpack_time(op.start_time)),
+        'reservation_cancel': lambda self, op, index: self._release(op.seat_id, unpack_time(op.start_time)),
+        'reservation_no_show': lambda self, op, index: self._release(op.seat_id, unpack_time(op.start_time)),
+        'reservation_import': _apply_import,
+        'reservation_expire': lambda self, op, index: self._expire(unpack_time(op.before)),
+        'waitlist_add': lambda self, op, index: self._waitlist_add(index, _typed_identity(op)),
+        'waitlist_remove': lambda self, op, index: self._waitlist_remove(_typed_identity(op.entry)),
+        'waitlist_notify': _apply_waitlist_notify,
+    }
+
+    # -- Legacy JSON operations (LogEntry.operation) ------------------------
+
+    def _apply_json_create(self, op, index):
+        return self._create(index, int(op['seat_id']), parse_time(op['start_time']), parse_time(op['end_time']),
+                            op.get('user_id'))
+
+    def _apply_json_import(self, op, index):
+        reservations = [
+            (int(r['seat_id']), parse_time(r['start_time']), parse_time(r['end_time']),
+             r.get('status', 'CONFIRMED'), r.get('user_id'))
+            for r in op['reservations']
+        ]
+        waitlist = [(_json_identity(w), bool(w.get('notified'))) for w in op.get('waitlist', [])]
+        return self._import(parse_time(op['horizon']), reservations, waitlist)
+
+    def _apply_json_waitlist_notify(self, op, index):
+        return self._waitlist_notify(_json_identity(op, 'waiting_seat_id') if 'user_id' in op else None)
+
+    JSON_HANDLERS = {
+        'Reservation.Create': _apply_json_create,
+        'Reservation.Abort': lambda self, op, index: self._abort(op['key']),
+        'Reservation.CheckIn': lambda self, op, index: self._check_in(int(op['seat_id']), parse_time(op['start_time'])),
+        'Reservation.Cancel': lambda self, op, index: self._release(int(op['seat_id']), parse_time(op['start_time'])),
+        'Reservation.NoShow': lambda self, op, index: self._release(int(op['seat_id']), parse_time(op['start_time'])),
+        'Reservation.Import': _apply_json_import,
+        'Waitlist.Add': lambda self, op, index: self._waitlist_add(index, _json_identity(op)),
+        'Waitlist.Remove': lambda self, op, index: self._waitlist_remove(_json_identity(op)),
+        'Waitlist.Notify': _apply_json_waitlist_notify,
+    }
+
+    # -- Local queries ------------------------------------------------------
+
+    def covers(self, start=None):
+        """True if memory alone can answer availability for a range starting at ``start``."""
+        if not self.imported:
+            return False
+        if start is None:
+            return True
+        start = parse_time(start)
+        return start >= self.import_horizon and (self.retention_horizon is None or start >= self.retention_horizon)
+
+    def is_available(self, seat_id, start_time=None, end_time=None, now=None):
+        """Mirror of the SQL availability checks: overlap with any active
+        reservation for a time range, otherwise "occupied right now"."""
+        with self.lock:
+            timeline = self.seats.get(seat_id)
+            if timeline is None:
+                return True
+            if start_time and end_time:
+                return not timeline.overlaps(parse_time(start_time), parse_time(end_time))
+            return not timeline.active_at(now or datetime.utcnow())
+
+    def diverged(self, rows, now):
+        """Compare the reservations running past ``now`` with ``rows``, the
+        active ones PostgreSQL holds (dicts with user_id, seat_id, start_time,
+        end_time). Returns ``(orphans, missing)``: ``(seat_id, start, key)`` of
+        reservations only held here, and rows only the database has, for
+        ranges memory covers."""
+        with self.lock:
+            held = {
+                (seat_id, item[0]): item[4]
+                for seat_id, timeline in self.seats.items()
+                for item in timeline.items if item[1] > now
+            }
+            stored = {(row['seat_id'], row['start_time']): row for row in rows}
+            orphans = sorted(
+                (seat_id, start, key) for (seat_id, start), key in held.items() if (seat_id, start) not in stored
+            )
+            missing = [
+                stored[location] for location in sorted(stored)
+                if location not in held and self.covers(location[1])
+            ]
+            return orphans, missing
+
+    def waitlist_length(self, seat_id=None, branch=None):
+        with self.lock:
+            return sum(
+                1 for item in self.waitlist
+                if not item[5] and (seat_id is None or item[2] == seat_id)
+                and (branch is None or item[3] == branch)
+            )
+
+    def stats(self):
+        with self.lock:
+            return {
+                'seats': len(self.seats),
+                'reservations': sum(len(t) for t in self.seats.values()),
+                'waitlist': len(self.waitlist),
+                'applied_ops': self.applied_ops,
+                'imported': self.imported,
+            }
@@ -1,6 +1,12 @@
 import os
 import sys
+import queue
 import random
+import signal
+import collections
+import math
+import struct
+import multiprocessing
 import grpc
 import psycopg2
 from psycopg2 import pool
@@ -20,9 +26,15 @@ import library_pb2
 import library_pb2_grpc
 import raft_pb2
 import raft_pb2_grpc
+import availability
+import operations
+from raft_storage import RaftStorage, config_message, config_servers, log_entry_dict, log_entry_message
+from seat_state import SeatStateMachine
 
 # Shared Raft node instance for logging hooks
 RAFT_NODE_INSTANCE = None
+# Replicated reservation/waitlist state applied from the Raft log
+SEAT_STATE = None
 
 DATABASE_URL = os.getenv('DATABASE_URL')
 REDIS_URL = os.getenv('REDIS_URL')
@@ -37,23 +49,126 @@ RAFT_NODE_ID = str(os.getenv('RAFT_NODE_ID') or os.getenv('INSTANCE_ID') or 'nod
 RAFT_SELF_ADDRESS = os.getenv('RAFT_SELF_ADDRESS')
 RAFT_PEERS_RAW = os.getenv('RAFT_PEERS', '')
 RAFT_RPC_TIMEOUT = float(os.getenv('RAFT_RPC_TIMEOUT', '0.75'))
+# Group commit: max entries per AppendEntries round (catch-up is chunked too), and
+# how long the leader lingers after the first new entry to collect more of them
+RAFT_MAX_APPEND_ENTRIES = int(os.getenv('RAFT_MAX_APPEND_ENTRIES', '512'))
+RAFT_BATCH_LINGER = float(os.getenv('RAFT_BATCH_LINGER_MS', '1')) / 1000.0
+# Pipelining: AppendEntries batches a follower may have outstanding at once
+# (1 = stop-and-wait). Probing followers always get a single request.
+RAFT_MAX_INFLIGHT_APPENDS = max(1, int(os.getenv('RAFT_MAX_INFLIGHT_APPENDS', '4')))
+# Send AppendEntries over one long-lived Replicate stream per follower instead
+# of a unary call each (peers without Replicate fall back to unary)
+RAFT_STREAM_REPLICATION = os.getenv('RAFT_STREAM_REPLICATION', 'true').lower() in ('1', 'true', 'yes')
+# Durable log: one sub-directory per node; set RAFT_DATA_DIR='' for an in-memory log
+RAFT_DATA_DIR = os.getenv('RAFT_DATA_DIR', 'raft_data')
+RAFT_SEGMENT_BYTES = int(os.getenv('RAFT_SEGMENT_BYTES', str(16 * 1024 * 1024)))
+RAFT_FSYNC_MODE = os.getenv('RAFT_FSYNC_MODE', 'batch')
+# Log compaction: snapshot the applied state once this many entries sit in memory
+RAFT_SNAPSHOT_THRESHOLD = int(os.getenv('RAFT_SNAPSHOT_THRESHOLD', '10000'))
+RAFT_SNAPSHOT_CHUNK_BYTES = int(os.getenv('RAFT_SNAPSHOT_CHUNK_BYTES', str(256 * 1024)))
+RAFT_SNAPSHOT_RPC_TIMEOUT = float(os.getenv('RAFT_SNAPSHOT_RPC_TIMEOUT', '10'))
+# Linearizable reads: ReadIndex by default; with leases the leader skips the
+# confirmation round while a quorum has heard from it within the lease window.
+RAFT_READ_TIMEOUT = float(os.getenv('RAFT_READ_TIMEOUT', '2.0'))
+RAFT_LEASE_READS = os.getenv('RAFT_LEASE_READS', 'false').lower() in ('1', 'true', 'yes')
+RAFT_CLOCK_DRIFT_BOUND = float(os.getenv('RAFT_CLOCK_DRIFT_BOUND', '0.1'))
+READ_CONSISTENCY_HEADER = 'x-read-consistency'
+# Trailing metadata on every unary response so clients can route writes to the leader
+LEADER_ID_HEADER = 'x-raft-leader-id'
+LEADER_ADDRESS_HEADER = 'x-raft-leader-address'
+NODE_ID_HEADER = 'x-raft-node-id'
+# Election hardening: a Pre-Vote round must succeed before a node bumps its
+# term, and a leader that loses contact with a majority steps down.
+RAFT_PRE_VOTE = os.getenv('RAFT_PRE_VOTE', 'true').lower() in ('1', 'true', 'yes')
+RAFT_CHECK_QUORUM = os.getenv('RAFT_CHECK_QUORUM', 'true').lower() in ('1', 'true', 'yes')
+# Graceful shutdown (SIGTERM): a leader hands off to its most up-to-date
+# follower first, giving up after RAFT_TRANSFER_TIMEOUT; then in-flight RPCs
+# get GRPC_SHUTDOWN_GRACE. Together they stay under compose's 10s stop timeout.
+RAFT_TRANSFER_TIMEOUT = float(os.getenv('RAFT_TRANSFER_TIMEOUT', '3.0'))
+GRPC_SHUTDOWN_GRACE = float(os.getenv('GRPC_SHUTDOWN_GRACE', '5.0'))
+# Membership changes (AddServer/RemoveServer). A new server is caught up in
+# rounds and joins once a round takes less than an election timeout.
+# RAFT_JOIN=true starts a node outside the configuration until it is added.
+RAFT_CATCHUP_ROUNDS = int(os.getenv('RAFT_CATCHUP_ROUNDS', '10'))
+RAFT_CATCHUP_TIMEOUT = float(os.getenv('RAFT_CATCHUP_TIMEOUT', '30'))
+RAFT_JOIN = os.getenv('RAFT_JOIN', 'false').lower() in ('1', 'true', 'yes')
+# Followers and learners answer availability from their replicated seat state
+# only while they applied the leader's commit index within this many seconds
+# (heartbeats come every RAFT_HEARTBEAT_INTERVAL); otherwise from PostgreSQL
+RAFT_MAX_READ_STALENESS = float(os.getenv('RAFT_MAX_READ_STALENESS', '3.0'))
+# The leader's background worker replicates a retention horizon this many
+# seconds in the past: reservations that ended before it and notified waitlist
+# entries leave the seat state (and its snapshots); older ranges go to SQL
+SEAT_STATE_RETENTION = float(os.getenv('SEAT_STATE_RETENTION', '3600'))
+# Writes wait for their commit at most RAFT_COMMIT_TIMEOUT, or until the
+# caller's gRPC deadline if that comes first.
+RAFT_COMMIT_TIMEOUT = float(os.getenv('RAFT_COMMIT_TIMEOUT', '5.0'))
+RAFT_OVERLOADED = 'Too many pending commits'
+# Writes held for a leadership transfer that outlasts their deadline
+RAFT_TRANSFERRING = 'Leadership transfer in progress'
+GRPC_MAX_WORKERS = int(os.getenv('GRPC_MAX_WORKERS', '100'))
+# 'threads' (grpc.server, psycopg2, redis-py) or 'aio' (aio_server.py:
+# grpc.aio with psycopg 3 and redis.asyncio). aio is not recommended: it
+# measured 2.5-3.8x slower for Raft writes (bench/results/GRPC_FIX_SUMMARY.md)
+GRPC_SERVER_MODE = os.getenv('GRPC_SERVER_MODE', 'threads')
+# Processes sharing port 9090 through SO_REUSEPORT (threads mode). The first
+# one runs the RaftNode; the others serve the library services and reach it
+# over RAFT_LOCAL_SOCKET, polling its Status every RAFT_STATUS_POLL_INTERVAL.
+GRPC_PROCESSES = int(os.getenv('GRPC_PROCESSES', '1'))
+# Past this many uncommitted writes (forwarded ones included) the leader sheds
+# new ones with RESOURCE_EXHAUSTED. The default (empty) allows one per handler
+# thread of a node, GRPC_MAX_WORKERS x GRPC_PROCESSES, so a node busy with
+# writes is not shed; a lower value keeps threads free for reads, at the cost
+# of refusing writes under load.
+RAFT_MAX_PENDING_COMMITS = int(os.getenv('RAFT_MAX_PENDING_COMMITS') or GRPC_MAX_WORKERS * GRPC_PROCESSES)
+RAFT_LOCAL_SOCKET = os.getenv('RAFT_LOCAL_SOCKET', f"/tmp/raft-{RAFT_NODE_ID}.sock")
+RAFT_STATUS_POLL_INTERVAL = float(os.getenv('RAFT_STATUS_POLL_INTERVAL', '0.2'))
+
+# Seat list cache keys embed this counter (shared with the REST services);
+# invalidation is one INCR instead of KEYS seats:* plus a DEL per key, and
+# entries of older generations age out with their TTL. GetSeats keys also
+# embed the counter of the branch/area scope they cover (seats_cache_tag),
+# so a seat change only bumps its own area, branch and the unscoped lists.
+SEATS_GENERATION_KEY = 'seats:generation'
+# GetSeats cache hits/misses are counted per process and added to this Redis
+# hash every SEATS_CACHE_STATS_INTERVAL seconds
+SEATS_CACHE_STATS_KEY = 'seats:cache:stats'
+SEATS_CACHE_STATS_INTERVAL = float(os.getenv('SEATS_CACHE_STATS_INTERVAL', '10'))
+# Process-local cache in front of Redis for GetSeats/GetBranches responses.
+# Invalidations are published on SEATS_INVALIDATION_CHANNEL; while a process
+# is not subscribed it skips the L1 cache, and L1_CACHE_TTL bounds staleness
+# should a message be lost. L1_CACHE_MAX_BYTES=0 turns it off.
+SEATS_INVALIDATION_CHANNEL = 'seats:invalidations'
+L1_CACHE_MAX_BYTES = int(os.getenv('L1_CACHE_MAX_BYTES', str(32 * 1024 * 1024)))
+L1_CACHE_TTL = float(os.getenv('L1_CACHE_TTL', '5'))
+# GetSeats entries are fresh for SEATS_CACHE_TTL seconds and then served stale
+# for up to SEATS_CACHE_STALE_TTL more while a background refresh runs (one
+# per key and process, on SEATS_REFRESH_WORKERS threads). The refresh may also
+# start early, more likely the older the entry and the slower its query
+# (XFetch, scaled by SEATS_CACHE_BETA; 0 turns early refresh off).
+SEATS_CACHE_TTL = float(os.getenv('SEATS_CACHE_TTL', '30'))
+SEATS_CACHE_STALE_TTL = float(os.getenv('SEATS_CACHE_STALE_TTL', '30'))
+SEATS_CACHE_BETA = float(os.getenv('SEATS_CACHE_BETA', '1.0'))
+SEATS_REFRESH_WORKERS = int(os.getenv('SEATS_REFRESH_WORKERS', '4'))
 
 redis_client = redis.from_url(REDIS_URL, decode_responses=True)
+# Without decoding, for values that are protobuf bytes (the GetSeats cache)
+redis_bytes_client = redis.from_url(REDIS_URL)
 db_semaphore = threading.BoundedSemaphore(DB_MAX_CONCURRENT)
 
 # Connection pool: min 10, max 100 connections per instance
 # With 3 instances: total 300 connections (matching PostgreSQL max_connections=300)
 connection_pool = None
 
-def init_connection_pool():
+def init_connection_pool(minconn=10, maxconn=100):
     global connection_pool
     try:
         connection_pool = pool.ThreadedConnectionPool(
-            minconn=10,
-            maxconn=100,
+            minconn=minconn,
+            maxconn=maxconn,
             dsn=DATABASE_URL
         )
-        print(f"Database connection pool initialized (10-100 connections)")
+        print(f"Database connection pool initialized ({minconn}-{maxconn} connections)")
     except Exception as e:
         print(f"Error creating connection pool: {e}")
         raise
@@ -92,16 +207,226 @@ def verify_token(token):
     except jwt.InvalidTokenError:
         raise Exception('Invalid token')
 
+def seats_cache_tag(branch, area):
+    """Generation counter of the seat lists filtered to ``branch``/``area``
+    ('' for no filter; an area filter without a branch counts as unscoped)."""
+    if not branch:
+        return f"{SEATS_GENERATION_KEY}:all"
+    if not area:
+        return f"{SEATS_GENERATION_KEY}:branch:{branch}"
+    return f"{SEATS_GENERATION_KEY}:area:{branch}:{area}"
+
+
+def seat_cache_tags(location):
+    """Counters to bump when a seat at ``location`` (branch, area) changes;
+    all seat lists when the location is unknown."""
+    if location is None:
+        return [SEATS_GENERATION_KEY]
+    branch, area = location
+    return list(dict.fromkeys([seats_cache_tag('', ''), seats_cache_tag(branch, ''), seats_cache_tag(branch, area)]))
+
+
+# seat id -> (branch, area); seats do not move, so entries never go stale
+SEAT_LOCATIONS = {}
+
+
+def seat_location(seat_id):
+    location = SEAT_LOCATIONS.get(seat_id)
+    if location is None:
+        conn = get_db_connection()
+        try:
+            cur = conn.cursor()
+            cur.execute('SELECT branch, area FROM seats WHERE id = %s', (seat_id,))
+            row = cur.fetchone()
+            cur.close()
+        finally:
+            return_db_connection(conn)
+        if row:
+            location = SEAT_LOCATIONS[seat_id] = (row[0], row[1] or '')
+    return location
+
+
 def invalidate_seat_cache(seat_id):
     try:
-        redis_client.delete(f"seat:{seat_id}")
-        keys = redis_client.keys(f"seats:*")
-        for key in keys:
-            redis_client.delete(key)
+        location = seat_location(seat_id)
+    except Exception as e:
+        print(f"Seat location lookup error: {e}")
+        location = None
+    tags = seat_cache_tags(location)
+    # This process's L1 entries go right away, so its next read sees the write
+    apply_seat_invalidation(tags)
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.delete(f"seat:{seat_id}")
+        for tag in tags:
+            pipe.incr(tag)
+        pipe.publish(SEATS_INVALIDATION_CHANNEL, json.dumps(tags))
+        pipe.execute()
     except Exception as e:
         print(f"Cache invalidation error: {e}")
 
 
+class LocalCache:
+    """Size-bounded LRU of serialized responses with a TTL. Entries are
+    filed under the generation tag they depend on, so invalidations received
+    over pub/sub can drop them."""
+
+    def __init__(self, max_bytes, ttl):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.entries = collections.OrderedDict()  # key -> (tag, expires_at, value)
+        self.keys_by_tag = collections.defaultdict(set)
+        self.size = 0
+        # Bumped by every invalidation: a value read from Redis or PostgreSQL
+        # before one may be stale and is not stored
+        self.version = 0
+        # Set while subscribed to SEATS_INVALIDATION_CHANNEL
+        self.coherent = False
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key) if self.coherent else None
+            if entry is None:
+                return None
+            if entry[1] <= time.monotonic():
+                self._remove_locked(key)
+                return None
+            self.entries.move_to_end(key)
+            return entry[2]
+
+    def put(self, key, tag, value, version):
+        with self.lock:
+            if not self.coherent or version != self.version or len(value) > self.max_bytes:
+                return
+            if key in self.entries:
+                self._remove_locked(key)
+            self.entries[key] = (tag, time.monotonic() + self.ttl, value)
+            self.keys_by_tag[tag].add(key)
+            self.size += len(value)
+            while self.size > self.max_bytes:
+                self._remove_locked(next(iter(self.entries)))
+
+    def invalidate(self, tags):
+        with self.lock:
+            self.version += 1
+            for tag in tags:
+                for key in list(self.keys_by_tag.get(tag, ())):
+                    self._remove_locked(key)
+
+    def clear(self):
+        with self.lock:
+            self._clear_locked()
+
+    def set_coherent(self, coherent):
+        with self.lock:
+            if not coherent:
+                self._clear_locked()
+            self.coherent = coherent
+
+    def _clear_locked(self):
+        self.version += 1
+        self.entries.clear()
+        self.keys_by_tag.clear()
+        self.size = 0
+
+    def _remove_locked(self, key):
+        tag, _, value = self.entries.pop(key)
+        self.size -= len(value)
+        keys = self.keys_by_tag[tag]
+        keys.discard(key)
+        if not keys:
+            del self.keys_by_tag[tag]
+
+
+L1_CACHE = LocalCache(L1_CACHE_MAX_BYTES, L1_CACHE_TTL)
+BRANCHES_CACHE_KEY = 'branches'
+
+
+def apply_seat_invalidation(tags):
+    if SEATS_GENERATION_KEY in tags:
+        L1_CACHE.clear()
+    else:
+        L1_CACHE.invalidate(tags)
+
+
+def seats_cache_subscriber():
+    """Apply the seat cache invalidations published by every process to
+    L1_CACHE. L1_CACHE serves reads only between the subscription being
+    confirmed and the connection failing, since messages may be lost outside
+    that window."""
+    client = redis.from_url(REDIS_URL, decode_responses=True, health_check_interval=10)
+    while True:
+        pubsub = client.pubsub()
+        try:
+            pubsub.subscribe(SEATS_INVALIDATION_CHANNEL)
+            while True:
+                message = pubsub.get_message(timeout=1.0)
+                if message is None:
+                    continue
+                if message['type'] == 'subscribe':
+                    L1_CACHE.set_coherent(True)
+                elif message['type'] == 'message':
+                    apply_seat_invalidation(json.loads(message['data']))
+        except Exception as e:
+            L1_CACHE.set_coherent(False)
+            print(f"[Cache] invalidation subscriber error: {e}; L1 cache off until resubscribed")
+            time.sleep(1.0)
+        finally:
+            pubsub.close()
+
+
+def start_seats_cache_subscriber():
+    if L1_CACHE_MAX_BYTES > 0:
+        threading.Thread(target=seats_cache_subscriber, daemon=True).start()
+
+
+class CacheStats:
+    """GetSeats cache outcome counters of this process."""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.counts = collections.Counter()
+        self.flushed_at = time.monotonic()
+
+    def record(self, outcome):
+        """Count ``outcome`` ('l1_hit', 'hit', 'miss', 'bypass' or 'refresh');
+        returns the counts to export once per interval, else None."""
+        with self.lock:
+            self.counts[outcome] += 1
+            now = time.monotonic()
+            if now - self.flushed_at < self.interval:
+                return None
+            counts, self.counts = self.counts, collections.Counter()
+            self.flushed_at = now
+            return counts
+
+
+def cache_stats_line(counts):
+    hits = counts['l1_hit'] + counts['hit']
+    lookups = hits + counts['miss']
+    ratio = hits / lookups if lookups else 0.0
+    return (f"[Cache] GetSeats hit ratio {ratio:.3f} (l1 hits={counts['l1_hit']} redis hits={counts['hit']} "
+            f"misses={counts['miss']} bypassed={counts['bypass']} refreshes={counts['refresh']})")
+
+
+SEATS_CACHE_STATS = CacheStats(SEATS_CACHE_STATS_INTERVAL)
+
+
+def record_seats_cache(outcome):
+    counts = SEATS_CACHE_STATS.record(outcome)
+    if counts:
+        print(cache_stats_line(counts))
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            for name, count in counts.items():
+                pipe.hincrby(SEATS_CACHE_STATS_KEY, name, count)
+            pipe.execute()
+        except Exception as e:
+            print(f"Cache stats export error: {e}")
+
+
 def parse_peer_config(raw_peers, node_id, self_address=None):
     peers = []
     for raw in raw_peers.split(','):
@@ -120,30 +445,259 @@ def parse_peer_config(raw_peers, node_id, self_address=None):
     return peers
 
 
-def submit_raft_operation_log(operation: str):
-    """Send a best-effort operation log to the Raft leader for replication."""
+def submit_raft_operation_log(payload: bytes):
+    """Send a best-effort typed operation (see operations.py) to the Raft leader for replication."""
     node = RAFT_NODE_INSTANCE
     if not node:
         return
-    leader_address = node._get_leader_address() or node.self_address
-    if not leader_address:
-        return
-    leader_id = node.leader_id or node.node_id
     try:
-        stub = node._get_stub_by_address(leader_address, leader_id)
-        node._log_client("SubmitOperation", leader_id)
-        response = stub.SubmitOperation(
-            raft_pb2.OperationRequest(operation=operation, source_id=node.node_id),
-            timeout=RAFT_RPC_TIMEOUT
-        )
+        # Followers (and worker processes) forward to the leader
+        response = node.SubmitOperation(raft_pb2.OperationRequest(payload=payload, source_id=node.node_id), None)
         if not response.success:
             print(f"[Raft] Operation log not committed: {response.result}")
     except Exception as e:
         print(f"[Raft] Failed to submit operation log: {e}")
 
 
+def commit_timeout(context):
+    """How long a write may wait for its commit: the caller's remaining gRPC
+    deadline, capped at RAFT_COMMIT_TIMEOUT (calls without a deadline report
+    a remaining time of centuries, or None under grpc.aio)."""
+    remaining = context.time_remaining() if context is not None else None
+    if remaining is None:
+        return RAFT_COMMIT_TIMEOUT
+    return min(remaining, RAFT_COMMIT_TIMEOUT)
+
+
+def raft_failure_code(response):
+    """gRPC status for a failed SubmitOperation: shed and timed-out writes
+    are worth retrying later, writes caught in a leadership transfer should
+    go to the new leader, anything else aborted."""
+    if response.result == RAFT_TRANSFERRING:
+        return grpc.StatusCode.UNAVAILABLE
+    if response.result == RAFT_OVERLOADED:
+        return grpc.StatusCode.RESOURCE_EXHAUSTED
+    if response.result == 'Commit timeout':
+        return grpc.StatusCode.DEADLINE_EXCEEDED
+    return grpc.StatusCode.ABORTED
+
+
+def wants_linearizable_read(context):
+    """True if the caller sent ``x-read-consistency: linearizable`` metadata."""
+    if context is None:
+        return False
+    for key, value in context.invocation_metadata():
+        if key == READ_CONSISTENCY_HEADER:
+            return value == 'linearizable'
+    return False
+
+
+def linearizable_read_barrier(context):
+    """Wait until this node has applied every write committed before the read
+    (Raft ReadIndex, or lease). Sets UNAVAILABLE and returns False on failure."""
+    node = RAFT_NODE_INSTANCE
+    if node is None or node.linearizable_read():
+        return True
+    context.set_code(grpc.StatusCode.UNAVAILABLE)
+    context.set_details('Linearizable read unavailable: no confirmed Raft leader')
+    return False
+
+
+def replicated_state_fresh():
+    """True if SEAT_STATE on this node may answer reads: it is the leader, or
+    it matched the leader's commit index within RAFT_MAX_READ_STALENESS."""
+    node = RAFT_NODE_INSTANCE
+    return node is None or node.read_staleness() <= RAFT_MAX_READ_STALENESS
+
+
+def raft_leader_metadata(node):
+    metadata = [(NODE_ID_HEADER, node.node_id)]
+    # During a leadership transfer, point clients at the incoming leader
+    leader_id = node.transfer_target or node.leader_id
+    if leader_id:
+        metadata.append((LEADER_ID_HEADER, leader_id))
+        leader_address = node.id_to_address.get(leader_id)
+        if leader_address:
+            metadata.append((LEADER_ADDRESS_HEADER, leader_address))
+    return tuple(metadata)
+
+
+class RaftLeaderInterceptor(grpc.ServerInterceptor):
+    """Attach the current Raft leader to the trailing metadata of unary calls."""
+
+    def __init__(self, raft_node):
+        self.raft_node = raft_node
+
+    def intercept_service(self, continuation, handler_call_details):
+        handler = continuation(handler_call_details)
+        if handler is None or handler.unary_unary is None:
+            return handler
+        behavior = handler.unary_unary
+
+        def with_leader(request, context):
+            response = behavior(request, context)
+            context.set_trailing_metadata(raft_leader_metadata(self.raft_node))
+            return response
+
+        return handler._replace(unary_unary=with_leader)
+
+
+def rpc_timeout(context):
+    """Seconds left until the call's deadline, None without one."""
+    # Calls without a deadline report a remaining time of centuries (None
+    # under grpc.aio)
+    remaining = context.time_remaining()
+    return remaining if remaining is not None and remaining < 86400 else None
+
+
+class LocalRaftProxy(grpc.GenericRpcHandler):
+    """Serves ``services`` in a worker process by relaying each call, as raw
+    bytes, to the Raft process over ``channel``."""
+
+    def __init__(self, channel, services):
+        self.handlers = {}
+        for service in services:
+            for method in service.methods:
+                path = f"/{service.full_name}/{method.name}"
+                self.handlers[path] = self._handler(channel, path, method.client_streaming, method.server_streaming)
+
+    def service(self, handler_call_details):
+        return self.handlers.get(handler_call_details.method)
+
+    @staticmethod
+    def _handler(channel, path, client_streaming, server_streaming):
+        if client_streaming and server_streaming:
+            upstream = channel.stream_stream(path)
+
+            def relay(request_iterator, context):
+                call = upstream(request_iterator, timeout=rpc_timeout(context))
+                context.add_callback(call.cancel)
+                try:
+                    yield from call
+                except grpc.RpcError as e:
+                    context.abort(e.code(), e.details())
+            return grpc.stream_stream_rpc_method_handler(relay)
+
+        upstream = channel.stream_unary(path) if client_streaming else channel.unary_unary(path)
+
+        def relay(request, context):
+            try:
+                return upstream(request, timeout=rpc_timeout(context))
+            except grpc.RpcError as e:
+                context.abort(e.code(), e.details())
+        if client_streaming:
+            return grpc.stream_unary_rpc_method_handler(relay)
+        return grpc.unary_unary_rpc_method_handler(relay)
+
+
+class RaftProcessClient:
+    """RAFT_NODE_INSTANCE in a worker process (GRPC_PROCESSES > 1).
+
+    Writes and read barriers go to the RaftNode in the Raft process over
+    ``channel``; node and leader ids and any transfer target for the trailing
+    metadata come from its Status, polled in the background. The worker exits with the Raft process.
+    """
+
+    def __init__(self, channel):
+        self.stub = raft_pb2_grpc.RaftServiceStub(channel)
+        self.node_id = RAFT_NODE_ID
+        self.leader_id = None
+        self.transfer_target = None
+        self.id_to_address = {}
+        threading.Thread(target=self._poll_status, daemon=True).start()
+
+    def _poll_status(self):
+        parent = os.getppid()
+        while os.getppid() == parent:
+            try:
+                status = self.stub.Status(raft_pb2.StatusRequest(), timeout=RAFT_RPC_TIMEOUT)
+                self.id_to_address = {server.id: server.address for server in status.servers}
+                self.leader_id = status.leader_id or None
+                self.transfer_target = status.transfer_target or None
+            except grpc.RpcError:
+                pass
+            time.sleep(RAFT_STATUS_POLL_INTERVAL)
+        print(f"[Worker {os.getpid()}] Raft process exited, stopping")
+        os._exit(1)
+
+    def SubmitOperation(self, request, context):
+        return self.stub.SubmitOperation(request, timeout=commit_timeout(context))
+
+    def linearizable_read(self, timeout=RAFT_READ_TIMEOUT):
+        try:
+            return self.stub.ReadIndex(
+                raft_pb2.ReadIndexRequest(source_id=self.node_id, local=True), timeout=timeout + RAFT_RPC_TIMEOUT
+            ).success
+        except grpc.RpcError:
+            return False
+
+
+class ReplicationStream:
+    """Leader side of one ``Replicate`` call to a follower.
+
+    Requests are written in order on a single HTTP/2 stream and the follower
+    answers them in the same order, so each response is matched to the
+    oldest unanswered request. ``on_response(request, sent_at, response)``
+    runs for every reply; once the stream breaks, ``on_broken(pending,
+    error)`` gets the requests that will never be answered.
+    """
+
+    def __init__(self, stub, on_response, on_broken):
+        self.on_response = on_response
+        self.on_broken = on_broken
+        self.requests = queue.Queue()
+        self.pending = collections.deque()  # (request, sent_at), oldest first
+        self.lock = threading.Lock()
+        self.closed = False
+        self.call = stub.Replicate(self._request_iterator())
+        threading.Thread(target=self._read_responses, daemon=True).start()
+
+    def _request_iterator(self):
+        while True:
+            request = self.requests.get()
+            if request is None:
+                return
+            yield request
+
+    def send(self, request, sent_at):
+        with self.lock:
+            if self.closed:
+                return False
+            self.pending.append((request, sent_at))
+            self.requests.put(request)
+        return True
+
+    def oldest_sent_at(self):
+        with self.lock:
+            return self.pending[0][1] if self.pending else None
+
+    def close(self):
+        with self.lock:
+            if self.closed:
+                return
+            self.closed = True
+            self.requests.put(None)
+        self.call.cancel()
+
+    def _read_responses(self):
+        error = None
+        try:
+            for response in self.call:
+                with self.lock:
+                    request, sent_at = self.pending.popleft()
+                self.on_response(request, sent_at, response)
+        except Exception as e:
+            error = e
+        with self.lock:
+            self.closed = True
+            self.requests.put(None)
+            pending = list(self.pending)
+            self.pending.clear()
+        self.on_broken(self, pending, error)
+
+
 class RaftNode(raft_pb2_grpc.RaftServiceServicer):
-    def __init__(self, node_id, peers, self_address=None):
+    def __init__(self, node_id, peers, self_address=None, storage=None, state_machine=None, join=False):
         self.node_id = str(node_id)
         self.peers = peers
         self.self_address = self_address
@@ -153,6 +707,22 @@ class RaftNode(raft_pb2_grpc.RaftServiceServicer):
         for peer in peers:
             self.id_to_address[peer['id']] = peer['address']
 
+        # Cluster configuration: the servers that vote and make up the majority.
+        # It starts as this node plus ``peers`` (nothing for a node waiting to
+        # be added, ``join``; peers then only help find the leader) and from
+        # there follows the newest config entry in the log. self.peers is
+        # every other member, plus a server the leader is catching up.
+        self.bootstrap_config = [] if join else (
+            [{'id': self.node_id, 'address': self_address or ''}]
+            + [{'id': peer['id'], 'address': peer['address']} for peer in peers]
+        )
+        self.snapshot_config = self.bootstrap_config
+        self.config = self.bootstrap_config
+        self.config_index = 0
+        self.voters = set()
+        self.learners = set()
+        self.catching_up = None
+
         self.current_term = 0
         self.voted_for = None
         self.leader_id = None
@@ -160,11 +730,75 @@ class RaftNode(raft_pb2_grpc.RaftServiceServicer):
         self.log = []
         self.commit_index = 0
         self.last_applied = 0
-        self.pending_events = {}
-        self.pending_results = {}
+        # index -> Future of a local SubmitOperation waiting for that entry;
+        # resolves to (applied term, result), or (None, None) if truncated
+        self.pending_commits = {}
+
+        # Applied state. Without a state machine, applying an entry only
+        # produces a result string and snapshots are empty.
+        self.state_machine = state_machine
+        # self.log holds the entries after the snapshot: log[0] has index snapshot_index + 1
+        self.snapshot_index = 0
+        self.snapshot_term = 0
+        self.snapshot_data = b''
+
+        # Persistent state is recovered before the node takes part in any RPC
+        self.storage = storage
+        if storage:
+            self.current_term, self.voted_for, snapshot, self.log = storage.load()
+            if snapshot:
+                self.snapshot_index, self.snapshot_term, self.snapshot_data, snapshot_config = snapshot
+                if snapshot_config is not None:
+                    self.snapshot_config = snapshot_config
+                if state_machine:
+                    state_machine.restore(self.snapshot_data)
+                self.commit_index = self.last_applied = self.snapshot_index
+            print(
+                f"[Raft] {self.node_id} recovered term={self.current_term} "
+                f"snapshot_index={self.snapshot_index} entries={len(self.log)}"
+            )
+        # Highest index known to be on stable storage (what the leader counts for itself)
+        self.durable_index = self._last_log_index()
+        # Bumped by every log truncation; an fsync that started before one
+        # says nothing about the entries appended after it
+        self.log_truncations = 0
+
+        # Leader-only replication progress, reinitialized on every election win
+        self.next_index = {}
+        self.match_index = {}
+        # Pipeline per follower: outstanding requests, the index the next batch
+        # starts at (ahead of next_index while batches are unacked), and the
+        # followers whose log is known to match ours (window open)
+        self.inflight_append = {}
+        self.send_index = {}
+        self.pipelining = set()
+        self.last_sent_at = {}
+        self.replication_streams = {}
+        self.unary_only_peers = set()
+        self.votes_received = set()
 
         self.state_lock = threading.RLock()
+        # Wakes the _run loop as soon as there is something to replicate
+        self.wakeup = threading.Condition(self.state_lock)
+        self.replication_pending = False
+        self.pending_since = 0.0
+        self.last_round_index = 0
+        # ReadIndex bookkeeping (monotonic clock): per-follower send time of the
+        # latest acknowledged AppendEntries, and the leader lease derived from it
+        self.read_cond = threading.Condition(self.state_lock)
+        self.peer_ack_at = {}
+        self.read_barrier = 0.0
+        self.lease_until = 0.0
+        self.leader_since = 0.0
+        self.election_round = 0
+        self.pre_votes = set()
+        # Follower we are handing leadership to; new writes wait while it is set
+        # (read_cond also signals transfer progress)
+        self.transfer_target = None
         self.stop_event = threading.Event()
+        # Bounded-staleness reads: when we last matched the leader's commit index
+        self.last_leader_contact = 0.0
+        self.leader_commit_seen = 0
         self.last_heartbeat = time.time()
         self.last_heartbeat_sent = 0.0
         self.election_timeout = self._random_election_timeout()
@@ -174,10 +808,18 @@ class RaftNode(raft_pb2_grpc.RaftServiceServicer):
         self.monitor_thread = None
 
         self.last_p_log_time = 0
+        # Batching metrics: AppendEntries rounds that carried entries, and
+        # commit-index advances (each one releases every waiter it covers)
+        self.replication_stats = {
+            'rounds': 0, 'round_entries': 0, 'max_round_entries': 0,
+            'commits': 0, 'committed_entries': 0, 'shed_writes': 0,
+        }
+        self.last_stats_rounds = 0
 
         self.failed_time={}
         for peer in self.peers:
             self.failed_time[peer["id"]] = 0
+        self._set_configuration_locked(*self._latest_config_locked())
         print(self.role)
 
 
@@ -186,11 +828,67 @@ class RaftNode(raft_pb2_grpc.RaftServiceServicer):
             self.monitor_thread = threading.Thread(target=self._run, daemon=True)
             self.monitor_thread.start()
 
+    def stop(self):
+        self.stop_event.set()
+        with self.state_lock:
+            self.wakeup.notify_all()
+            # Followers hold a server thread for every open Replicate stream
+            self._close_replication_streams_locked()
+
     def _random_election_timeout(self):
         return random.uniform(*RAFT_ELECTION_TIMEOUT_RANGE)
 
     def _majority(self):
-        return (len(self.peers) + 1) // 2 + 1
+        return len(self.voters) // 2 + 1
+
+    def _voter_peers_locked(self):
+        return [peer for peer in self.peers if peer['id'] in self.voters]
+
+    def _config_at_locked(self, index):
+        """(index, servers) of the configuration in effect at log ``index``."""
+        for position in range(min(index, self._last_log_index()) - self.snapshot_index - 1, -1, -1):
+            entry = self.log[position]
+            if entry.get('config') is not None:
+                return entry['index'], entry['config']
+        return self.snapshot_index, self.snapshot_config
+
+    def _latest_config_locked(self):
+        return self._config_at_locked(self._last_log_index())
+
+    def _set_configuration_locked(self, index, servers):
+        """Switch to ``servers``; a configuration is used as soon as it is in the log."""
+        self.config_index = index
+        self.config = servers
+        self.voters = {server['id'] for server in servers if not server.get('learner')}
+        self.learners = {server['id'] for server in servers if server.get('learner')}
+        for server in servers:
+            if server['address']:
+                self.id_to_address[server['id']] = server['address']
+        peers = [{'id': server['id'], 'address': server['address']} for server in servers if server['id'] != self.node_id]
+        if self.catching_up and self.catching_up['id'] not in self.voters:
+            peers.append(self.catching_up)
+        self._set_peers_locked(peers)
+
+    def _set_peers_locked(self, peers):
+        kept = {peer['id'] for peer in peers}
+        for peer in self.peers:
+            if peer['id'] in kept:
+                continue
+            stream = self.replication_streams.pop(peer['id'], None)
+            if stream:
+                stream.close()
+            for progress in (self.next_index, self.match_index, self.send_index, self.inflight_append,
+                             self.peer_ack_at, self.last_sent_at):
+                progress.pop(peer['id'], None)
+            self.pipelining.discard(peer['id'])
+        if self.role == 'leader':
+            # New followers are probed from the end of our log like after an election
+            last_index = self._last_log_index()
+            for peer in peers:
+                if peer['id'] not in self.next_index:
+                    self.next_index[peer['id']] = self.send_index[peer['id']] = last_index + 1
+                    self.match_index[peer['id']] = 0
+        self.peers = peers
 
     def _log_client(self, rpc_name, peer_id):
         print(f"Node {self.node_id} sends RPC {rpc_name} to Node {peer_id}")
@@ -198,6 +896,31 @@ class RaftNode(raft_pb2_grpc.RaftServiceServicer):
     def _should_step_down(self, response_term):
         return response_term > self.current_term
 
+    def _log_up_to_date(self, last_log_index, last_log_term):
+        """Election restriction (Raft §5.4.1): is the candidate's log at least as current as ours?"""
+        our_last_index = self._last_log_index()
+        return (last_log_term, last_log_index) >= (self._term_at(our_last_index), our_last_index)
+
+    def _leader_alive_locked(self):
+        """True while this node has recent evidence of a working leader."""
+        if self.role == 'leader':
+            return self._quorum_acked_since_locked(time.monotonic() - RAFT_ELECTION_TIMEOUT_RANGE[0])
+        return bool(self.leader_id) and time.time() - self.last_heartbeat < RAFT_ELECTION_TIMEOUT_RANGE[0]
+
+    def _check_quorum_locked(self):
+        """Step down if no majority acknowledged us within the max election timeout."""
+        now = time.monotonic()
+        window = RAFT_ELECTION_TIMEOUT_RANGE[1]
+        if now - self.leader_since < window or self._quorum_acked_since_locked(now - window):
+            return
+        print(f"[Raft] {self.node_id} lost contact with a majority, stepping down in term {self.current_term}")
+        self._close_replication_streams_locked()
+        self.role = 'follower'
+        self.leader_id = None
+        self.lease_until = 0.0
+        self._reset_timer()
+        self.read_cond.notify_all()
+
     def _get_stub(self, peer):
         address = peer['address']
         return self._get_stub_by_address(address, peer['id'])
@@ -219,15 +942,222 @@ class RaftNode(raft_pb2_grpc.RaftServiceServicer):
             return self.self_address
         return None
 
+    def _last_log_index(self):
+        return self.snapshot_index + len(self.log)
+
+    def _term_at(self, index):
+        if index == self.snapshot_index:
+            return self.snapshot_term
+        if index < self.snapshot_index or index > self._last_log_index():
+            return 0
+        return self.log[index - self.snapshot_index - 1]['term']
+
+    def _entries_from(self, index, limit):
+        start = index - self.snapshot_index - 1
+        return self.log[start:start + limit]
+
+    def _batch_full_locked(self):
+        return self._last_log_index() - self.last_round_index >= RAFT_MAX_APPEND_ENTRIES
+
+    def _signal_replication_locked(self):
+        if not self.replication_pending:
+            self.replication_pending = True
+            self.pending_since = time.time()
+            self.wakeup.notify()
+        elif self._batch_full_locked():
+            self.wakeup.notify()
+
+    def _next_tick_delay_locked(self, now):
+        if self.role == 'leader':
+            if self.replication_pending:
+                if self._batch_full_locked():
+                    return 0.0
+                return max(0.0, self.pending_since + RAFT_BATCH_LINGER - now)
+            return max(0.0, self.last_heartbeat_sent + RAFT_HEARTBEAT_INTERVAL - now)
+        return max(0.0, min(
+            self.last_heartbeat + self.election_timeout - now,
+            self.last_p_log_time + 3 - now
+        ))
+
+    def _persist_meta_locked(self):
+        if self.storage:
+            self.storage.save_meta(self.current_term, self.voted_for)
+
+    def _append_log_locked(self, entries):
+        self.log.extend(entries)
+        if self.storage:
+            self.storage.append(entries)
+        else:
+            self.durable_index = self._last_log_index()
+        for entry in reversed(entries):
+            if entry.get('config') is not None:
+                self._set_configuration_locked(entry['index'], entry['config'])
+                break
+
+    def _truncate_log_locked(self, index):
+        del self.log[index - self.snapshot_index - 1:]
+        self._fail_pending_commits_locked(lambda pending: pending >= index)
+        if self.storage:
+            self.storage.truncate_from(index)
+        self.durable_index = min(self.durable_index, index - 1)
+        self.log_truncations += 1
+        if index <= self.config_index:
+            # The uncommitted configuration went with the suffix: fall back
+            self._set_configuration_locked(*self._latest_config_locked())
+
+    def _fail_pending_commits_locked(self, dropped):
+        """Resolve the waiters of entries that will never be applied here."""
+        for index in [index for index in self.pending_commits if dropped(index)]:
+            self.pending_commits.pop(index).set_result((None, None))
+
+    def _sync_log(self):
+        """Group fsync of everything appended so far; called without state_lock held."""
+        if not self.storage:
+            return
+        with self.state_lock:
+            target = self._last_log_index()
+            truncations = self.log_truncations
+        self.storage.sync()
+        with self.state_lock:
+            if self.log_truncations == truncations:
+                self.durable_index = max(self.durable_index, min(target, self._last_log_index()))
+
+    def _step_down_locked(self, term):
+        self._close_replication_streams_locked()
+        self.current_term = term
+        self.role = 'follower'
+        self.voted_for = None
+        self.leader_id = None
+        self._persist_meta_locked()
+        self._reset_timer()
+        self.lease_until = 0.0
+        self.read_cond.notify_all()
+
+    def _accept_leader_locked(self, term, leader_id):
+        """Follow ``leader_id`` after an AppendEntries or InstallSnapshot of
+        ``term`` (>= current_term), stepping down if this node leads."""
+        if term > self.current_term:
+            self.current_term = term
+            # Only a new term clears the vote; clearing it within a term
+            # would let this node vote twice.
+            self.voted_for = None
+            self._persist_meta_locked()
+        if self.role == 'leader':
+            # No more pipelined entries or lease reads from a deposed leader
+            self._close_replication_streams_locked()
+            self.lease_until = 0.0
+            self.read_cond.notify_all()
+        self.role = 'follower'
+        if self.leader_id != leader_id:
+            self.leader_id = leader_id
+            # A finishing leadership transfer waits to learn the new leader
+            self.read_cond.notify_all()
+        self._reset_timer()
+
+    def _become_leader_locked(self):
+        self.role = 'leader'
+        self.leader_id = self.node_id
+        self.last_heartbeat_sent = 0.0
+        self._signal_replication_locked()
+        last_index = self._last_log_index()
+        self.next_index = {peer['id']: last_index + 1 for peer in self.peers}
+        self.match_index = {peer['id']: 0 for peer in self.peers}
+        self.send_index = dict(self.next_index)
+        self.pipelining = set()
+        self.peer_ack_at = {}
+        self.lease_until = 0.0
+        self.leader_since = time.monotonic()
+        self.read_cond.notify_all()
+        # A leader may only commit entries from its own term (Raft §5.4.2), so
+        # append a no-op to commit whatever predecessors left uncommitted.
+        self._append_log_locked([{'index': last_index + 1, 'term': self.current_term, 'operation': 'noop'}])
+
+    def _log_replication_stats_locked(self):
+        stats = self.replication_stats
+        if stats['rounds'] == self.last_stats_rounds:
+            return
+        self.last_stats_rounds = stats['rounds']
+        print(
+            f"[Raft] {self.node_id} replication: rounds={stats['rounds']} "
+            f"entries/round={stats['round_entries'] / stats['rounds']:.2f} "
+            f"max_round={stats['max_round_entries']} commits={stats['commits']} "
+            f"entries/commit={stats['committed_entries'] / max(1, stats['commits']):.2f}"
+        )
+
+    def _advance_commit_index_locked(self):
+        # Highest index replicated on a majority, counting the leader itself
+        match_indexes = sorted(
+            ([self.durable_index] if self.node_id in self.voters else [])
+            + [self.match_index.get(peer['id'], 0) for peer in self._voter_peers_locked()],
+            reverse=True
+        )
+        candidate = match_indexes[self._majority() - 1]
+        if candidate > self.commit_index and self._term_at(candidate) == self.current_term:
+            self.replication_stats['commits'] += 1
+            self.replication_stats['committed_entries'] += candidate - self.commit_index
+            self.commit_index = candidate
+            self._apply_commits_locked()
+
     def _apply_commits_locked(self):
-        while self.last_applied < self.commit_index and self.last_applied < len(self.log):
-            entry = self.log[self.last_applied]
-            result = f"Executed {entry['operation']} at index {entry['index']} (term {entry['term']})"
-            self.pending_results[entry['index']] = result
-            if entry['index'] in self.pending_events:
-                self.pending_events[entry['index']].set()
-            print(f"[Raft] {self.node_id} applied log index {entry['index']}: {entry['operation']}")
+        while self.last_applied < self.commit_index and self.last_applied < self._last_log_index():
+            entry = self.log[self.last_applied - self.snapshot_index]
+            if entry.get('config') is not None:
+                result = f"Configuration {', '.join(server['id'] for server in entry['config'])} at index {entry['index']}"
+            elif self.state_machine:
+                result = self.state_machine.apply(entry)
+            else:
+                result = f"Executed {operations.describe(entry)} at index {entry['index']} (term {entry['term']})"
+            # Only a local SubmitOperation waiter needs the result
+            future = self.pending_commits.pop(entry['index'], None)
+            if future is not None:
+                future.set_result((entry['term'], result))
+            print(f"[Raft] {self.node_id} applied log index {entry['index']}: {operations.describe(entry)}")
             self.last_applied += 1
+        self.read_cond.notify_all()
+        if len(self.log) >= RAFT_SNAPSHOT_THRESHOLD and self.last_applied > self.snapshot_index:
+            self._take_snapshot_locked()
+
+    def _take_snapshot_locked(self):
+        """Compact the log: capture the applied state and drop the entries it covers."""
+        index = self.last_applied
+        term = self._term_at(index)
+        data = self.state_machine.snapshot() if self.state_machine else b''
+        _, config = self._config_at_locked(index)
+        if self.storage:
+            self.storage.save_snapshot(index, term, data, config)
+        del self.log[:index - self.snapshot_index]
+        self.snapshot_index, self.snapshot_term, self.snapshot_data = index, term, data
+        self.snapshot_config = config
+        print(f"[Raft] {self.node_id} took snapshot at index {index} (term {term}), {len(self.log)} entries kept")
+
+    def _install_snapshot_locked(self, index, term, data, config=None):
+        """Replace applied state with a leader's snapshot (InstallSnapshot receiver rules)."""
+        if index <= self.last_applied:
+            return
+        if config is None:
+            config = self._config_at_locked(index)[1]
+        if self._term_at(index) == term and index <= self._last_log_index():
+            # Our log already extends past the snapshot: keep the suffix
+            del self.log[:index - self.snapshot_index]
+            if self.storage:
+                self.storage.save_snapshot(index, term, data, config)
+        else:
+            self.log = []
+            if self.storage:
+                self.storage.save_snapshot(index, term, data, config)
+                self.storage.reset()
+            self.durable_index = index
+        if self.state_machine:
+            self.state_machine.restore(data)
+        # Entries covered by the snapshot are never applied here one by one
+        self._fail_pending_commits_locked(lambda pending: pending <= index)
+        self.snapshot_index, self.snapshot_term, self.snapshot_data = index, term, data
+        self.snapshot_config = config
+        self._set_configuration_locked(*self._latest_config_locked())
+        self.commit_index = max(self.commit_index, index)
+        self.last_applied = index
+        self.durable_index = max(self.durable_index, index)
+        print(f"[Raft] {self.node_id} installed snapshot at index {index} (term {term})")
 
     def _start_election(self):
         with self.state_lock:
@@ -235,124 +1165,593 @@ class RaftNode(raft_pb2_grpc.RaftServiceServicer):
                 return
             if time.time() - self.last_heartbeat < self.election_timeout:
                 return
-            self.role = 'candidate'
-            self.current_term += 1
-            term = self.current_term
-            self.voted_for = self.node_id
-            self.leader_id = None
             self._reset_timer()
-            peers_snapshot = list(self.peers)
+            if self.node_id not in self.voters:
+                # Not (or no longer) a member of the configuration
+                return
+            if not RAFT_PRE_VOTE:
+                request = self._campaign_locked()
+                pre_vote = False
+            else:
+                # Pre-Vote (Raft thesis §9.6): ask whether we could win before
+                # touching current_term, so a node that was merely paused or
+                # partitioned cannot depose a healthy leader when it returns.
+                self.role = 'follower'
+                self.leader_id = None
+                self.election_round += 1
+                self.pre_votes = {self.node_id}
+                if len(self.pre_votes & self.voters) >= self._majority():
+                    request = self._campaign_locked()
+                    pre_vote = False
+                else:
+                    last_index = self._last_log_index()
+                    request = raft_pb2.VoteRequest(
+                        term=self.current_term + 1,
+                        candidate_id=self.node_id,
+                        last_log_index=last_index,
+                        last_log_term=self._term_at(last_index),
+                        pre_vote=True
+                    )
+                    pre_vote = True
+            round_id = self.election_round
+            peers_snapshot = self._voter_peers_locked()
+        if request is not None:
+            self._send_vote_requests(peers_snapshot, request, pre_vote, round_id)
+
+    def _campaign_locked(self):
+        """Become candidate for the next term; returns the RequestVote to fan out (None if already won)."""
+        self.role = 'candidate'
+        self.current_term += 1
+        self.voted_for = self.node_id
+        self._persist_meta_locked()
+        self.leader_id = None
+        self.votes_received = {self.node_id}
+        self._reset_timer()
+        if len(self.votes_received & self.voters) >= self._majority():
+            self._become_leader_locked()
+            print(f"Node {self.node_id} become the new leader")
+            return None
+        last_index = self._last_log_index()
+        return raft_pb2.VoteRequest(
+            term=self.current_term,
+            candidate_id=self.node_id,
+            last_log_index=last_index,
+            last_log_term=self._term_at(last_index)
+        )
 
-        votes = 1
-        majority = self._majority()
-        for peer in peers_snapshot:
-            stub = self._get_stub(peer)
-            peer_id = peer['id']
+    def _send_vote_requests(self, peers, request, pre_vote, round_id):
+        # Fan out concurrently; votes are tallied in callbacks as they arrive
+        rpc_name = "RequestVote (pre-vote)" if pre_vote else "RequestVote"
+        for peer in peers:
             try:
-                self._log_client("RequestVote", peer_id)
-                response = stub.RequestVote(
-                    raft_pb2.VoteRequest(
-                        term=term,
-                        candidate_id=self.node_id,
-                        last_log_index=0,
-                        last_log_term=0
-                    ),
-                    timeout=RAFT_RPC_TIMEOUT
-                )
+                self._log_client(rpc_name, peer['id'])
+                call = self._get_stub(peer).RequestVote.future(request, timeout=RAFT_RPC_TIMEOUT)
             except Exception as e:
-                print(f"[Raft] RequestVote to {peer_id} failed: {e}")
+                print(f"[Raft] {rpc_name} to {peer['id']} failed: {e}")
                 continue
+            if pre_vote:
+                call.add_done_callback(lambda f, peer=peer: self._on_pre_vote_done(peer, round_id, request.term, f))
+            else:
+                call.add_done_callback(lambda f, peer=peer: self._on_vote_done(peer, request.term, f))
+
+    def _on_pre_vote_done(self, peer, round_id, term, call):
+        try:
+            response = call.result()
+        except Exception as e:
+            print(f"[Raft] RequestVote (pre-vote) to {peer['id']} failed: {e}")
+            return
+
+        with self.state_lock:
+            if self._should_step_down(response.term):
+                self._step_down_locked(response.term)
+                return
+            # Abandon the round if a leader showed up or a newer round started
+            if (self.role != 'follower' or self.leader_id or round_id != self.election_round
+                    or term != self.current_term + 1 or not response.vote_granted):
+                return
+            self.pre_votes.add(peer['id'])
+            if len(self.pre_votes & self.voters) < self._majority():
+                return
+            self.election_round += 1
+            request = self._campaign_locked()
+            round_id = self.election_round
+            peers_snapshot = self._voter_peers_locked()
+        if request is not None:
+            self._send_vote_requests(peers_snapshot, request, False, round_id)
+
+    def _on_vote_done(self, peer, term, call):
+        try:
+            response = call.result()
+        except Exception as e:
+            print(f"[Raft] RequestVote to {peer['id']} failed: {e}")
+            return
+
+        with self.state_lock:
+            if self._should_step_down(response.term):
+                self._step_down_locked(response.term)
+                return
+
+            if self.role != 'candidate' or term != self.current_term:
+                return
+
+            if response.vote_granted:
+                self.votes_received.add(peer['id'])
+                if len(self.votes_received & self.voters) >= self._majority():
+                    self._become_leader_locked()
+                    print(f"Node {self.node_id} become the new leader")
+
+    def _build_append_request_locked(self, peer_id):
+        next_index = max(self.snapshot_index + 1, self.send_index.get(peer_id, self._last_log_index() + 1))
+        prev_log_index = next_index - 1
+        entries = self._entries_from(next_index, RAFT_MAX_APPEND_ENTRIES)
+        # The next batch goes out behind this one without waiting for its ack
+        self.send_index[peer_id] = next_index + len(entries)
+        if entries:
+            stats = self.replication_stats
+            stats['rounds'] += 1
+            stats['round_entries'] += len(entries)
+            stats['max_round_entries'] = max(stats['max_round_entries'], len(entries))
+        return raft_pb2.AppendEntriesRequest(
+            term=self.current_term,
+            leader_id=self.node_id,
+            prev_log_index=prev_log_index,
+            prev_log_term=self._term_at(prev_log_index),
+            entries=[log_entry_message(e) for e in entries],
+            leader_commit=self.commit_index
+        )
+
+    def _handle_append_response_locked(self, peer_id, request, response):
+        """Update next_index/match_index for one follower. Returns False if we stepped down."""
+        if self._should_step_down(response.term):
+            self._step_down_locked(response.term)
+            return False
+        if self.role != 'leader' or request.term != self.current_term:
+            return False
+
+        if response.success:
+            match = request.prev_log_index + len(request.entries)
+            if match > self.match_index.get(peer_id, 0):
+                self.match_index[peer_id] = match
+            self.next_index[peer_id] = max(self.next_index.get(peer_id, 1), match + 1)
+            self.send_index[peer_id] = max(self.send_index.get(peer_id, 1), self.next_index[peer_id])
+            self.pipelining.add(peer_id)
+            # transfer_leadership() / add_server() wait on this follower's progress
+            if peer_id == self.transfer_target or (self.catching_up and peer_id == self.catching_up['id']):
+                self.read_cond.notify_all()
+            return True
+
+        # Consistency check failed: jump back past the conflicting term in one step
+        next_index = response.conflict_index or request.prev_log_index
+        if response.conflict_term:
+            for index in range(min(request.prev_log_index, self._last_log_index()), self.snapshot_index, -1):
+                term = self._term_at(index)
+                if term == response.conflict_term:
+                    next_index = index + 1
+                    break
+                if term < response.conflict_term:
+                    break
+        # Entries up to match_index are known to be there; a rejection can also
+        # be a pipelined batch that overtook its predecessor on the wire.
+        next_index = max(next_index, self.match_index.get(peer_id, 0) + 1)
+        self.next_index[peer_id] = max(1, min(next_index, self._last_log_index() + 1))
+        self._reset_pipeline_locked(peer_id)
+        return True
+
+    def _reset_pipeline_locked(self, peer_id):
+        # Back to one request at a time, resending from next_index, until an ack
+        # shows where the follower's log really ends
+        self.pipelining.discard(peer_id)
+        self.send_index[peer_id] = self.next_index.get(peer_id, self._last_log_index() + 1)
+
+    def _window_open_locked(self, peer_id):
+        window = RAFT_MAX_INFLIGHT_APPENDS if peer_id in self.pipelining else 1
+        return self.inflight_append.get(peer_id, 0) < window
+
+    def _release_inflight_locked(self, peer_id):
+        self.inflight_append[peer_id] = max(0, self.inflight_append.get(peer_id, 0) - 1)
+
+    def _drop_stub(self, address):
+        self.peer_stubs.pop(address, None)
+        self.peer_channels.pop(address, None)
+
+    def _prepare_replication_locked(self, peer):
+        """Count one more request in flight to ``peer`` and return a sender for it.
+
+        Followers whose next entry was compacted away get the snapshot instead;
+        the pipeline is closed until it lands.
+        """
+        peer_id = peer['id']
+        self.inflight_append[peer_id] = self.inflight_append.get(peer_id, 0) + 1
+        self.last_sent_at[peer_id] = time.monotonic()
+        if self.send_index.get(peer_id, 1) <= self.snapshot_index:
+            self.pipelining.discard(peer_id)
+            snapshot = (self.current_term, self.snapshot_index, self.snapshot_term, self.snapshot_data,
+                        self.snapshot_config)
+            return lambda: self._send_install_snapshot(peer, *snapshot)
+        request = self._build_append_request_locked(peer_id)
+        return lambda: self._send_append_entries(peer, request)
+
+    def _fill_pipeline_locked(self, peer, heartbeat=False):
+        """Senders for every unsent batch the follower's window has room for.
+
+        With ``heartbeat`` an idle follower still gets one (empty) request.
+        """
+        peer_id = peer['id']
+        senders = []
+        while self._window_open_locked(peer_id) and self.send_index.get(peer_id, 1) <= self._last_log_index():
+            senders.append(self._prepare_replication_locked(peer))
+        if not senders and heartbeat and not self.inflight_append.get(peer_id, 0):
+            senders.append(self._prepare_replication_locked(peer))
+        return senders
+
+    def _continue_replication_locked(self, peer):
+        # Entries appended while earlier batches were in flight (or a rejected
+        # probe) go out right away instead of waiting for the next tick; so
+        # does a heartbeat that a pending ReadIndex is waiting on.
+        if self.role != 'leader':
+            return []
+        peer_id = peer['id']
+        read_waiting = (self.peer_ack_at.get(peer_id, 0.0) < self.read_barrier
+                        and self.last_sent_at.get(peer_id, 0.0) < self.read_barrier)
+        return self._fill_pipeline_locked(peer, heartbeat=read_waiting)
+
+    def _record_ack_locked(self, peer_id, sent_at):
+        """A same-term reply proves we were still leader when the request was sent."""
+        if sent_at <= self.peer_ack_at.get(peer_id, 0.0):
+            return
+        self.peer_ack_at[peer_id] = sent_at
+        if RAFT_LEASE_READS and self.transfer_target is None:
+            # No follower that acked at t starts an election before
+            # t + min election timeout, modulo bounded clock drift.
+            acks = sorted(([time.monotonic()] if self.node_id in self.voters else [])
+                          + [self.peer_ack_at.get(p['id'], 0.0) for p in self._voter_peers_locked()], reverse=True)
+            quorum_ack = acks[self._majority() - 1]
+            self.lease_until = quorum_ack + RAFT_ELECTION_TIMEOUT_RANGE[0] * (1 - RAFT_CLOCK_DRIFT_BOUND)
+        self.read_cond.notify_all()
+
+    def _quorum_acked_since_locked(self, started):
+        acks = (self.node_id in self.voters) + sum(
+            1 for p in self._voter_peers_locked() if self.peer_ack_at.get(p['id'], 0.0) >= started
+        )
+        return acks >= self._majority()
+
+    def read_index(self, timeout=RAFT_READ_TIMEOUT):
+        """ReadIndex on the leader: return an index such that reading local state once
+        it is applied is linearizable, or None if this node cannot confirm leadership."""
+        deadline = time.monotonic() + timeout
+        with self.state_lock:
+            if self.role != 'leader':
+                return None
+            term = self.current_term
+            # The commit index is only authoritative once an entry of our term
+            # (the election noop) has committed.
+            if not self.read_cond.wait_for(
+                lambda: self.role != 'leader' or self._term_at(self.commit_index) == term,
+                timeout=max(0.0, deadline - time.monotonic())
+            ) or self.role != 'leader' or self.current_term != term:
+                return None
+            read_index = self.commit_index
+
+            if not (RAFT_LEASE_READS and time.monotonic() < self.lease_until):
+                started = time.monotonic()
+                self.read_barrier = max(self.read_barrier, started)
+                self._signal_replication_locked()
+                if not self.read_cond.wait_for(
+                    lambda: self.role != 'leader' or self._quorum_acked_since_locked(started),
+                    timeout=max(0.0, deadline - time.monotonic())
+                ) or self.role != 'leader' or self.current_term != term:
+                    return None
+
+            if not self.read_cond.wait_for(
+                lambda: self.last_applied >= read_index,
+                timeout=max(0.0, deadline - time.monotonic())
+            ):
+                return None
+            return read_index
+
+    def linearizable_read(self, timeout=RAFT_READ_TIMEOUT):
+        """Block until local state reflects every write committed before this call.
+
+        Followers ask the leader for its ReadIndex and wait to apply up to it.
+        No log entry is written either way.
+        """
+        if self.role == 'leader':
+            return self.read_index(timeout) is not None
+        deadline = time.monotonic() + timeout
+        leader_address = self._get_leader_address()
+        if not leader_address:
+            return False
+        try:
+            self._log_client("ReadIndex", self.leader_id)
+            response = self._get_stub_by_address(leader_address, self.leader_id).ReadIndex(
+                raft_pb2.ReadIndexRequest(source_id=self.node_id), timeout=timeout
+            )
+        except Exception as e:
+            print(f"[Raft] ReadIndex to {self.leader_id} failed: {e}")
+            return False
+        if not response.success:
+            return False
+        with self.state_lock:
+            return self.read_cond.wait_for(
+                lambda: self.last_applied >= response.read_index,
+                timeout=max(0.0, deadline - time.monotonic())
+            )
+
+    def transfer_leadership(self, target_id=None, timeout=RAFT_TRANSFER_TIMEOUT):
+        """Hand leadership to a follower (Raft thesis §3.10), e.g. before shutting down.
 
+        New writes are held while the target (by default the follower with the
+        highest match_index) catches up; it is then sent TimeoutNow and wins an
+        election right away instead of after an election timeout. Returns the
+        new leader's id, or None if we are not leader or it did not happen in time.
+        """
+        deadline = time.monotonic() + timeout
+        with self.state_lock:
+            if self.role != 'leader' or self.transfer_target is not None:
+                return None
+            candidates = [peer for peer in self._voter_peers_locked() if target_id in (None, peer['id'])]
+            if not candidates:
+                return None
+            # Most up to date first; among equals the one that acked most recently
+            peer = max(candidates, key=lambda p: (self.match_index.get(p['id'], 0), self.peer_ack_at.get(p['id'], 0.0)))
+            term = self.current_term
+            self.transfer_target = peer['id']
+            print(f"[Raft] {self.node_id} transferring leadership to {peer['id']} in term {term}")
+        try:
             with self.state_lock:
-                if self.role != 'candidate' or term != self.current_term:
-                    return
+                self._signal_replication_locked()
+                if not self.read_cond.wait_for(
+                    lambda: self.role != 'leader' or self.match_index.get(peer['id'], 0) >= self._last_log_index(),
+                    timeout=max(0.0, deadline - time.monotonic())
+                ) or self.role != 'leader' or self.current_term != term:
+                    print(f"[Raft] {self.node_id} leadership transfer to {peer['id']} timed out catching up")
+                    return None
+                # The target may win before we hear of it: no lease reads from here on
+                self.lease_until = 0.0
 
-                if self._should_step_down(response.term):
-                    self.current_term = response.term
-                    self.role = 'follower'
-                    self.voted_for = None
-                    self._reset_timer()
-                    return
+            try:
+                self._log_client("TimeoutNow", peer['id'])
+                response = self._get_stub(peer).TimeoutNow(
+                    raft_pb2.TimeoutNowRequest(term=term, leader_id=self.node_id),
+                    timeout=max(0.0, min(RAFT_RPC_TIMEOUT, deadline - time.monotonic()))
+                )
+            except Exception as e:
+                print(f"[Raft] TimeoutNow to {peer['id']} failed: {e}")
+                return None
+            if not response.success:
+                return None
 
-                if response.vote_granted:
-                    votes += 1
-                    if votes >= majority:
-                        self.role = 'leader'
-                        self.leader_id = self.node_id
-                        self.last_heartbeat_sent = 0.0
-                        print(f"Node {self.node_id} become the new leader")
-                        return
+            # Its RequestVote makes us step down; wait until the winner's first
+            # AppendEntries so held writes can be forwarded to it
+            with self.state_lock:
+                self.read_cond.wait_for(
+                    lambda: self.leader_id not in (None, self.node_id),
+                    timeout=max(0.0, deadline - time.monotonic())
+                )
+                if self.leader_id in (None, self.node_id):
+                    print(f"[Raft] {self.node_id} leadership transfer to {peer['id']} timed out")
+                    return None
+                print(f"[Raft] {self.node_id} handed leadership to {self.leader_id} in term {self.current_term}")
+                return self.leader_id
+        finally:
+            with self.state_lock:
+                self.transfer_target = None
+                self.read_cond.notify_all()
+
+    def read_staleness(self):
+        """Upper bound in seconds on how far this node's applied state trails the
+        leader's: 0 on the leader, inf while lagging or without a leader."""
+        with self.state_lock:
+            if self.role == 'leader':
+                return 0.0
+            if not self.leader_id or self.last_applied < self.leader_commit_seen or not self.last_leader_contact:
+                return float('inf')
+            return time.monotonic() - self.last_leader_contact
 
     def _broadcast_heartbeats(self):
         with self.state_lock:
             if self.role != 'leader':
                 return
-            term = self.current_term
-            peers_snapshot = list(self.peers)
-            commit_index = self.commit_index
-            entries_proto = [
-                raft_pb2.LogEntry(index=e['index'], term=e['term'], operation=e['operation'])
-                for e in self.log
-            ]
-
-        request = raft_pb2.AppendEntriesRequest(
-            term=term,
-            leader_id=self.node_id,
-            prev_log_index=0,
-            prev_log_term=0,
-            entries=entries_proto,
-            leader_commit=commit_index
-        )
-
-        success_count = 1  # self
+            self._expire_replication_streams_locked()
+            senders = []
+            for peer in self.peers:
+                # New entries go out behind unacked batches up to the window;
+                # a follower with nothing new and nothing in flight gets a
+                # heartbeat. A slow peer never has more than the window queued.
+                senders.extend(self._fill_pipeline_locked(peer, heartbeat=True))
+            self.last_round_index = self._last_log_index()
+
+        for send in senders:
+            send()
+
+        # The leader's own fsync overlaps with the followers' round trips
+        self._sync_log()
+        with self.state_lock:
+            if self.role == 'leader':
+                self._advance_commit_index_locked()
 
-        for peer in peers_snapshot:
-            stub = self._get_stub(peer)
-            peer_id = peer['id']
+    def _send_append_entries(self, peer, request):
+        sent_at = time.monotonic()
+        if RAFT_STREAM_REPLICATION and peer['id'] not in self.unary_only_peers:
             try:
-                self._log_client("AppendEntries", peer_id)
-                response = stub.AppendEntries(request, timeout=RAFT_RPC_TIMEOUT)
+                self._log_client("AppendEntries", peer['id'])
+                if self._replication_stream(peer).send(request, sent_at):
+                    return
             except Exception as e:
-                print(f"[Raft] AppendEntries to {peer_id} failed: {e}")
-                del self.peer_stubs[peer['address']]
-                del self.peer_channels[peer['address']]
-                # stub = self._get_stub(peer)
-                continue
+                print(f"[Raft] Replicate stream to {peer['id']} failed: {e}")
+        try:
+            self._log_client("AppendEntries", peer['id'])
+            call = self._get_stub(peer).AppendEntries.future(request, timeout=RAFT_RPC_TIMEOUT)
+        except Exception as e:
+            print(f"[Raft] AppendEntries to {peer['id']} failed: {e}")
+            self._drop_stub(peer['address'])
+            with self.state_lock:
+                self._release_inflight_locked(peer['id'])
+                self._reset_pipeline_locked(peer['id'])
+            return
+        call.add_done_callback(lambda f: self._on_append_entries_done(peer, request, sent_at, f))
 
+    def _on_append_entries_done(self, peer, request, sent_at, call):
+        try:
+            response = call.result()
+        except Exception as e:
+            print(f"[Raft] AppendEntries to {peer['id']} failed: {e}")
+            self._drop_stub(peer['address'])
             with self.state_lock:
-                if self._should_step_down(response.term):
-                    self.current_term = response.term
-                    self.role = 'follower'
-                    self.voted_for = None
-                    self.leader_id = None
-                    self._reset_timer()
+                self._release_inflight_locked(peer['id'])
+                self._reset_pipeline_locked(peer['id'])
+            return
+        self._on_append_response(peer, request, sent_at, response)
+
+    def _replication_stream(self, peer):
+        with self.state_lock:
+            stream = self.replication_streams.get(peer['id'])
+            if stream is None or stream.closed:
+                stream = self.replication_streams[peer['id']] = ReplicationStream(
+                    self._get_stub(peer),
+                    lambda request, sent_at, response: self._on_append_response(peer, request, sent_at, response),
+                    lambda stream, pending, error: self._on_replication_stream_broken(peer, stream, pending, error),
+                )
+            return stream
+
+    def _on_replication_stream_broken(self, peer, stream, pending, error):
+        peer_id = peer['id']
+        code = error.code() if isinstance(error, grpc.RpcError) else None
+        if code != grpc.StatusCode.CANCELLED:
+            print(f"[Raft] Replicate stream to {peer_id} closed: {error}")
+        if code == grpc.StatusCode.UNAVAILABLE:
+            self._drop_stub(peer['address'])
+        with self.state_lock:
+            if self.replication_streams.get(peer_id) is stream:
+                del self.replication_streams[peer_id]
+            if code == grpc.StatusCode.UNIMPLEMENTED:
+                # Follower predates Replicate; stay on unary calls
+                self.unary_only_peers.add(peer_id)
+            for _ in pending:
+                self._release_inflight_locked(peer_id)
+            if pending:
+                self._reset_pipeline_locked(peer_id)
+
+    def _expire_replication_streams_locked(self):
+        # A stream has no per-message deadline: one whose oldest request went
+        # unanswered for RAFT_RPC_TIMEOUT is torn down like a timed-out call
+        now = time.monotonic()
+        for stream in list(self.replication_streams.values()):
+            oldest = stream.oldest_sent_at()
+            if oldest is not None and now - oldest > RAFT_RPC_TIMEOUT:
+                stream.close()
+
+    def _close_replication_streams_locked(self):
+        for stream in list(self.replication_streams.values()):
+            stream.close()
+
+    def _on_append_response(self, peer, request, sent_at, response):
+        peer_id = peer['id']
+        with self.state_lock:
+            self._release_inflight_locked(peer_id)
+            # Commit is decided as soon as the ack completing a majority lands
+            if not self._handle_append_response_locked(peer_id, request, response):
+                return
+            self._record_ack_locked(peer_id, sent_at)
+            self._advance_commit_index_locked()
+            follow_ups = self._continue_replication_locked(peer)
+
+        for send in follow_ups:
+            send()
+
+    def _send_install_snapshot(self, peer, term, index, snapshot_term, data, config):
+        def chunks():
+            offset = 0
+            while True:
+                chunk = data[offset:offset + RAFT_SNAPSHOT_CHUNK_BYTES]
+                done = offset + len(chunk) >= len(data)
+                yield raft_pb2.InstallSnapshotRequest(
+                    term=term,
+                    leader_id=self.node_id,
+                    last_included_index=index,
+                    last_included_term=snapshot_term,
+                    offset=offset,
+                    data=chunk,
+                    done=done,
+                    config=config_message(config) if offset == 0 else None
+                )
+                if done:
                     return
-                if response.success:
-                    success_count += 1
+                offset += len(chunk)
+
+        sent_at = time.monotonic()
+        try:
+            self._log_client("InstallSnapshot", peer['id'])
+            call = self._get_stub(peer).InstallSnapshot.future(chunks(), timeout=RAFT_SNAPSHOT_RPC_TIMEOUT)
+        except Exception as e:
+            print(f"[Raft] InstallSnapshot to {peer['id']} failed: {e}")
+            self._drop_stub(peer['address'])
+            with self.state_lock:
+                self._release_inflight_locked(peer['id'])
+                self._reset_pipeline_locked(peer['id'])
+            return
+        call.add_done_callback(lambda f: self._on_install_snapshot_done(peer, term, index, sent_at, f))
+
+    def _on_install_snapshot_done(self, peer, term, index, sent_at, call):
+        peer_id = peer['id']
+        try:
+            response = call.result()
+        except Exception as e:
+            print(f"[Raft] InstallSnapshot to {peer_id} failed: {e}")
+            self._drop_stub(peer['address'])
+            with self.state_lock:
+                self._release_inflight_locked(peer_id)
+                self._reset_pipeline_locked(peer_id)
+            return
 
         with self.state_lock:
-            if self.role == 'leader' and success_count >= self._majority():
-                if len(self.log) > self.commit_index:
-                    self.commit_index = len(self.log)
-                    self._apply_commits_locked()
+            self._release_inflight_locked(peer_id)
+            if self._should_step_down(response.term):
+                self._step_down_locked(response.term)
+                return
+            if self.role != 'leader' or term != self.current_term or not response.success:
+                return
+            self._record_ack_locked(peer_id, sent_at)
+            self.match_index[peer_id] = max(self.match_index.get(peer_id, 0), index)
+            self.next_index[peer_id] = max(self.next_index.get(peer_id, 1), index + 1)
+            self._reset_pipeline_locked(peer_id)
+            self._advance_commit_index_locked()
+            follow_ups = self._continue_replication_locked(peer)
+
+        for send in follow_ups:
+            send()
 
     def _run(self):
         # Election/heartbeat loop
         while not self.stop_event.is_set():
-            time.sleep(0.1)
             send_heartbeat = False
             start_election = False
 
             with self.state_lock:
+                # Sleep until the next heartbeat/election deadline, or until
+                # SubmitOperation signals new entries to replicate.
+                delay = self._next_tick_delay_locked(time.time())
+                if delay > 0:
+                    self.wakeup.wait(timeout=delay)
                 now = time.time()
+                if self.role == 'leader' and RAFT_CHECK_QUORUM:
+                    self._check_quorum_locked()
                 if self.role == 'leader':
-                    if now - self.last_heartbeat_sent >= RAFT_HEARTBEAT_INTERVAL:
+                    if now - self.last_p_log_time >= 3:
+                        self.last_p_log_time = now
+                        self._log_replication_stats_locked()
+                    # Due once the batch linger expires / batch fills, or on the heartbeat timer
+                    if self._next_tick_delay_locked(now) <= 0:
+                        self.replication_pending = False
                         self.last_heartbeat_sent = now
                         send_heartbeat = True
                 else:
                     if now - self.last_p_log_time >= 3:
                         self.last_p_log_time = now
-                        print(f"Print current log on node{self.node_id} {self.log}")
+                        print(
+                            f"Print current log on node{self.node_id}: last_index={self._last_log_index()} "
+                            f"last_term={self._term_at(self._last_log_index())} commit={self.commit_index}"
+                        )
                     if now - self.last_heartbeat >= self.election_timeout:
                         start_election = True
 
@@ -367,22 +1766,50 @@ class RaftNode(raft_pb2_grpc.RaftServiceServicer):
         print(f"Node {self.node_id} runs RPC RequestVote called by Node {caller_id}")
 
         with self.state_lock:
+            if self.node_id in self.learners:
+                return raft_pb2.VoteResponse(term=self.current_term, vote_granted=False)
+            up_to_date = self._log_up_to_date(request.last_log_index, request.last_log_term)
+            if request.pre_vote:
+                # Would we vote for this candidate in the next term? Changes no state.
+                vote_granted = (request.term > self.current_term and up_to_date
+                                and not self._leader_alive_locked())
+                return raft_pb2.VoteResponse(term=self.current_term, vote_granted=vote_granted)
+
             if request.term < self.current_term:
                 return raft_pb2.VoteResponse(term=self.current_term, vote_granted=False)
 
+            # Leader stickiness: while we hear from a live leader within the
+            # minimum election timeout, ignore candidates from newer terms
+            # (required for leases, and what makes check-quorum effective).
+            # A campaign the leader itself asked for (TimeoutNow) is exempt.
+            if ((RAFT_CHECK_QUORUM or RAFT_LEASE_READS) and request.term > self.current_term
+                    and not request.leadership_transfer and self._leader_alive_locked()):
+                return raft_pb2.VoteResponse(term=self.current_term, vote_granted=False)
+
             reset_timer = False
+            meta_changed = False
             if request.term > self.current_term:
+                if self.role == 'leader':
+                    self._close_replication_streams_locked()
+                    self.leader_id = None
+                    self.lease_until = 0.0
+                    self.read_cond.notify_all()
                 self.current_term = request.term
                 self.role = 'follower'
                 self.voted_for = None
                 reset_timer = True
+                meta_changed = True
 
             vote_granted = False
-            if self.voted_for in (None, caller_id):
+            if self.voted_for in (None, caller_id) and up_to_date:
                 vote_granted = True
+                meta_changed = meta_changed or self.voted_for != caller_id
                 self.voted_for = caller_id
                 reset_timer = True
 
+            # The vote must be durable before the candidate can count it
+            if meta_changed:
+                self._persist_meta_locked()
             if reset_timer:
                 self._reset_timer()
 
@@ -396,28 +1823,157 @@ class RaftNode(raft_pb2_grpc.RaftServiceServicer):
             if request.term < self.current_term:
                 return raft_pb2.AppendEntriesResponse(term=self.current_term, success=False)
 
-            if request.term >= self.current_term:
-                if request.term > self.current_term:
-                    self.current_term = request.term
-                self.role = 'follower'
-                self.leader_id = caller_id
-                self.voted_for = None
-                self._reset_timer()
+            self._accept_leader_locked(request.term, caller_id)
+
+            # Entries up to snapshot_index are committed and compacted here already
+            entries = request.entries
+            prev_log_index, prev_log_term = request.prev_log_index, request.prev_log_term
+            if prev_log_index < self.snapshot_index:
+                entries = [e for e in entries if e.index > self.snapshot_index]
+                prev_log_index, prev_log_term = self.snapshot_index, self.snapshot_term
 
-            # Replace local log with leader's log (simplified replication of entire log)
-            self.log = [
-                {'index': entry.index, 'term': entry.term, 'operation': entry.operation}
-                for entry in request.entries
-            ]
-            self.commit_index = min(request.leader_commit, len(self.log))
-            self.last_applied = min(self.last_applied, self.commit_index, len(self.log))
+            # Consistency check: our log must contain prev_log_index with prev_log_term
+            last_index = self._last_log_index()
+            if prev_log_index > last_index:
+                return raft_pb2.AppendEntriesResponse(
+                    term=self.current_term, success=False, conflict_index=last_index + 1
+                )
+            if prev_log_index > 0 and self._term_at(prev_log_index) != prev_log_term:
+                conflict_term = self._term_at(prev_log_index)
+                conflict_index = prev_log_index
+                while conflict_index > self.snapshot_index + 1 and self._term_at(conflict_index - 1) == conflict_term:
+                    conflict_index -= 1
+                return raft_pb2.AppendEntriesResponse(
+                    term=self.current_term, success=False,
+                    conflict_index=conflict_index, conflict_term=conflict_term
+                )
+
+            # Append new entries, truncating our suffix only on a real term conflict
+            new_entries = []
+            for entry in entries:
+                if not new_entries and entry.index <= self._last_log_index():
+                    if self._term_at(entry.index) == entry.term:
+                        continue
+                    self._truncate_log_locked(entry.index)
+                new_entries.append(log_entry_dict(entry))
+            self._append_log_locked(new_entries)
+
+            match_index = request.prev_log_index + len(request.entries)
+            if request.leader_commit > self.commit_index:
+                self.commit_index = max(self.commit_index, min(request.leader_commit, match_index))
             self._apply_commits_locked()
+            self.leader_commit_seen = request.leader_commit
+            self.last_leader_contact = time.monotonic()
 
-            return raft_pb2.AppendEntriesResponse(term=self.current_term, success=True)
+            response = raft_pb2.AppendEntriesResponse(
+                term=self.current_term, success=True, match_index=match_index
+            )
+            # Entries this call skipped as already present may still be in
+            # another call's fsync (a resent or pipelined batch)
+            needs_sync = match_index > self.durable_index
+
+        # Acknowledge only once every entry up to match_index is on stable storage
+        if needs_sync:
+            self._sync_log()
+        return response
+
+    def Replicate(self, request_iterator, context):
+        # Requests on one stream are handled strictly in arrival order, so
+        # pipelined batches from the leader can never overtake each other
+        for request in request_iterator:
+            yield self.AppendEntries(request, context)
+
+    def InstallSnapshot(self, request_iterator, context):
+        data = bytearray()
+        header = None
+        for chunk in request_iterator:
+            with self.state_lock:
+                if chunk.term < self.current_term:
+                    return raft_pb2.InstallSnapshotResponse(term=self.current_term, success=False)
+                self._accept_leader_locked(chunk.term, chunk.leader_id)
+            if header is None:
+                header = chunk
+                print(f"Node {self.node_id} runs RPC InstallSnapshot called by Node {chunk.leader_id}")
+            if chunk.offset != len(data):
+                return raft_pb2.InstallSnapshotResponse(term=self.current_term, success=False)
+            data.extend(chunk.data)
+            if chunk.done:
+                break
+        else:
+            return raft_pb2.InstallSnapshotResponse(term=self.current_term, success=False)
+
+        with self.state_lock:
+            if header.term == self.current_term:
+                config = config_servers(header.config) if header.HasField('config') else None
+                self._install_snapshot_locked(header.last_included_index, header.last_included_term, bytes(data), config)
+            return raft_pb2.InstallSnapshotResponse(term=self.current_term, success=True)
+
+    def ReadIndex(self, request, context):
+        print(f"Node {self.node_id} runs RPC ReadIndex called by Node {request.source_id or 'client'}")
+        if request.local:
+            return raft_pb2.ReadIndexResponse(
+                success=self.linearizable_read(), read_index=self.last_applied, leader_id=self.leader_id or ""
+            )
+        read_index = self.read_index()
+        if read_index is None:
+            return raft_pb2.ReadIndexResponse(success=False, leader_id=self.leader_id or "")
+        if RAFT_LEASE_READS:
+            # A lease read sends no heartbeat, so push our commit index to the
+            # asking follower now rather than on the next tick.
+            with self.state_lock:
+                self._signal_replication_locked()
+        return raft_pb2.ReadIndexResponse(success=True, read_index=read_index, leader_id=self.node_id)
+
+    def TransferLeadership(self, request, context):
+        print(f"Node {self.node_id} runs RPC TransferLeadership to {request.target_id or 'most up-to-date follower'}")
+        if self.role != 'leader':
+            return raft_pb2.TransferLeadershipResponse(
+                success=False, leader_id=self.leader_id or "", message="Not the leader"
+            )
+        new_leader = self.transfer_leadership(request.target_id or None)
+        if new_leader is None:
+            return raft_pb2.TransferLeadershipResponse(
+                success=False, leader_id=self.leader_id or "", message="Leadership transfer did not complete"
+            )
+        return raft_pb2.TransferLeadershipResponse(success=True, leader_id=new_leader)
+
+    def TimeoutNow(self, request, context):
+        caller_id = request.leader_id or "unknown"
+        print(f"Node {self.node_id} runs RPC TimeoutNow called by Node {caller_id}")
+        with self.state_lock:
+            # Only honoured from our current leader, by a member
+            if (request.term != self.current_term or self.role != 'follower' or self.leader_id != caller_id
+                    or self.node_id not in self.voters):
+                return raft_pb2.TimeoutNowResponse(term=self.current_term, success=False)
+            # Campaign now, skipping Pre-Vote and the election timeout
+            self.election_round += 1
+            vote_request = self._campaign_locked()
+            if vote_request is not None:
+                vote_request.leadership_transfer = True
+            round_id = self.election_round
+            peers_snapshot = self._voter_peers_locked()
+            term = self.current_term
+        if vote_request is not None:
+            self._send_vote_requests(peers_snapshot, vote_request, False, round_id)
+        return raft_pb2.TimeoutNowResponse(term=term, success=True)
 
     def SubmitOperation(self, request, context):
         caller_id = request.source_id or "client"
         print(f"Node {self.node_id} runs RPC SubmitOperation called by Node {caller_id}")
+        deadline = time.time() + commit_timeout(context)
+
+        # Hold writes during a leadership transfer, and briefly while our own
+        # election (e.g. one started by TimeoutNow) is undecided, so they reach
+        # the new leader instead of failing
+        with self.state_lock:
+            if not self.read_cond.wait_for(lambda: self.transfer_target is None,
+                                           timeout=max(deadline - time.time(), 0)):
+                return raft_pb2.OperationResponse(
+                    success=False, result=RAFT_TRANSFERRING, leader_id=self.transfer_target or self.leader_id or ""
+                )
+            if self.role == 'candidate':
+                self.read_cond.wait_for(lambda: self.role != 'candidate',
+                                        timeout=min(RAFT_RPC_TIMEOUT, max(deadline - time.time(), 0)))
 
         # If not leader, forward to leader if known
         if self.role != 'leader' or (self.leader_id and self.leader_id != self.node_id):
@@ -426,35 +1982,245 @@ class RaftNode(raft_pb2_grpc.RaftServiceServicer):
                 try:
                     stub = self._get_stub_by_address(leader_address, self.leader_id or leader_address)
                     self._log_client("SubmitOperation", self.leader_id or leader_address)
-                    forward_request = raft_pb2.OperationRequest(operation=request.operation, source_id=self.node_id)
-                    response = stub.SubmitOperation(forward_request, timeout=RAFT_RPC_TIMEOUT)
-                    print(f"Node {self.node_id} has forward op:{request.operation} to leader")
+                    forward_request = raft_pb2.OperationRequest(
+                        operation=request.operation, payload=request.payload, source_id=self.node_id
+                    )
+                    # The leader waits for the commit within what is left of our deadline
+                    response = stub.SubmitOperation(forward_request, timeout=max(deadline - time.time(), 0))
+                    print(f"Node {self.node_id} has forward op:{request.operation or 'payload'} to leader")
                     return response
                 except Exception as e:
                     print(f"[Raft] Forward SubmitOperation failed: {e}")
             return raft_pb2.OperationResponse(success=False, result="No known leader", leader_id=self.leader_id or "")
 
         # Leader path
-        with self.state_lock:
-            index = len(self.log) + 1
-            entry = {'index': index, 'term': self.current_term, 'operation': request.operation}
-            self.log.append(entry)
-            event = threading.Event()
-            self.pending_events[index] = event
-            self.pending_results[index] = None
-            # Trigger a near-immediate heartbeat to replicate
-            self.last_heartbeat_sent = 0.0
-            pending_event = event
+        proposal = self._propose(request, deadline)
+        if isinstance(proposal, raft_pb2.OperationResponse):
+            return proposal
+        index, term, pending_commit = proposal
 
         # Wait for commit after replication
-        committed = pending_event.wait(timeout=5.0)
+        status, result = self._wait_applied(index, term, pending_commit, deadline - time.time())
+        return self._commit_response(status, result)
+
+    def _propose(self, request, deadline):
+        """Leader path of SubmitOperation: append the write and return
+        (index, term, future), or an OperationResponse if it is refused.
+
+        The write is shed rather than queued behind a stalled commit, and
+        skipped if the caller has already given up.
+        """
         with self.state_lock:
-            result = self.pending_results.get(index) or ""
-        if not committed:
+            if self.role != 'leader':
+                return raft_pb2.OperationResponse(success=False, result="No known leader", leader_id=self.leader_id or "")
+            if len(self.pending_commits) >= RAFT_MAX_PENDING_COMMITS:
+                self.replication_stats['shed_writes'] += 1
+                return raft_pb2.OperationResponse(success=False, result=RAFT_OVERLOADED, leader_id=self.node_id)
+            if time.time() >= deadline:
+                return raft_pb2.OperationResponse(success=False, result="Commit timeout", leader_id=self.node_id)
+            return self._append_as_leader_locked({'operation': request.operation, 'payload': request.payload})
+
+    def _commit_response(self, status, result):
+        if status == 'timeout':
             return raft_pb2.OperationResponse(success=False, result="Commit timeout", leader_id=self.node_id)
-
+        if status == 'superseded':
+            return raft_pb2.OperationResponse(success=False, result="Entry superseded by new leader", leader_id=self.leader_id or "")
         return raft_pb2.OperationResponse(success=True, result=result or "Committed", leader_id=self.node_id)
 
+    def _append_as_leader_locked(self, fields):
+        """Append a new entry with ``fields`` and register a future for its result.
+
+        Returns (index, term, future); pass them to _wait_applied(). The future
+        resolves to (applied term, result) from the apply loop, so a caller can
+        also wait on it without a thread (asyncio.wrap_future).
+        """
+        index = self._last_log_index() + 1
+        term = self.current_term
+        self._append_log_locked([dict(fields, index=index, term=term)])
+        future = futures.Future()
+        self.pending_commits[index] = future
+        # Wake the replicator to push the new entry immediately
+        self._signal_replication_locked()
+        return index, term, future
+
+    def _wait_applied(self, index, term, future, timeout=RAFT_COMMIT_TIMEOUT):
+        """Returns ('committed', result), ('timeout', None) or ('superseded', None)."""
+        try:
+            outcome = future.result(timeout=max(timeout, 0))
+        except futures.TimeoutError:
+            outcome = self._abandon_commit_wait(index, future)
+        return self._commit_status(term, outcome)
+
+    def _abandon_commit_wait(self, index, future):
+        """Drop the waiter of an entry whose wait timed out; returns its
+        outcome if it was applied in the meantime, else None."""
+        with self.state_lock:
+            self.pending_commits.pop(index, None)
+        return future.result() if future.done() else None
+
+    @staticmethod
+    def _commit_status(term, outcome):
+        if outcome is None:
+            return 'timeout', None
+        applied_term, result = outcome
+        # A new leader may have overwritten our uncommitted entry at this index
+        if applied_term != term:
+            return 'superseded', None
+        return 'committed', result
+
+    def _membership_change_blocked_locked(self):
+        """Why a membership change cannot start now, or None."""
+        # A leader that just took over (e.g. a forwarded RemoveServer right
+        # after a handoff) first commits its no-op, and with it any pending
+        # configuration change
+        self.read_cond.wait_for(
+            lambda: self.role != 'leader' or self._term_at(self.commit_index) == self.current_term,
+            timeout=RAFT_READ_TIMEOUT
+        )
+        if self.role != 'leader':
+            return "Not the leader"
+        if self.catching_up is not None:
+            return f"Already adding {self.catching_up['id']}"
+        if self.config_index > self.commit_index:
+            return "Previous configuration change is not committed yet"
+        # Until an entry of this term commits, a change started by a previous
+        # leader may still be pending in some logs (Raft thesis §4.1, bug fix)
+        if self._term_at(self.commit_index) != self.current_term:
+            return "No entry of the current term committed yet"
+        return None
+
+    def _append_configuration(self, servers):
+        """Append ``servers`` as the new configuration and wait for it to commit."""
+        with self.state_lock:
+            if self.role != 'leader' or self.config_index > self.commit_index:
+                return False, "Leadership or configuration changed"
+            index, term, future = self._append_as_leader_locked({'operation': 'config', 'config': servers})
+            print(f"[Raft] {self.node_id} appended configuration {[server['id'] for server in servers]} at index {index}")
+        status, _ = self._wait_applied(index, term, future)
+        if status != 'committed':
+            return False, f"Configuration entry {status}"
+        return True, "Committed"
+
+    def add_server(self, server_id, address, timeout=RAFT_CATCHUP_TIMEOUT, learner=False):
+        """Add a server to the cluster (leader only, one change at a time).
+
+        The server first receives the log without a vote, in rounds that each
+        replicate what the leader had when the round began (Raft thesis
+        §4.2.1). Once a round finishes within an election timeout it is close
+        enough to join; the configuration with it is then appended.
+
+        Learners (``learner=True``) never count toward the majority, so they
+        join right away and catch up afterwards; a voter can be demoted this
+        way. Adding an existing learner as a voter promotes it.
+        Returns (success, message).
+        """
+        deadline = time.monotonic() + timeout
+        with self.state_lock:
+            blocked = self._membership_change_blocked_locked()
+            if blocked:
+                return False, blocked
+            if server_id in (self.learners if learner else self.voters):
+                return True, f"Already a {'learner' if learner else 'member'}"
+            if learner and server_id == self.node_id:
+                return False, "The leader cannot become a learner; transfer leadership first"
+            self.id_to_address[server_id] = address
+            servers = [server for server in self.config if server['id'] != server_id]
+            servers.append({'id': server_id, 'address': address, 'learner': learner})
+        if learner:
+            return self._append_configuration(servers)
+
+        with self.state_lock:
+            self.catching_up = {'id': server_id, 'address': address}
+            if server_id not in self.learners:
+                self._set_peers_locked(self.peers + [self.catching_up])
+            print(f"[Raft] {self.node_id} catching up {server_id} at {address}")
+        try:
+            for round_number in range(1, RAFT_CATCHUP_ROUNDS + 1):
+                with self.state_lock:
+                    target = self._last_log_index()
+                    started = time.monotonic()
+                    self._signal_replication_locked()
+                    caught_up = self.read_cond.wait_for(
+                        lambda: self.role != 'leader' or self.match_index.get(server_id, 0) >= target,
+                        timeout=max(0.0, deadline - time.monotonic())
+                    )
+                    if self.role != 'leader':
+                        return False, "Lost leadership while catching up"
+                    if not caught_up:
+                        return False, f"{server_id} did not catch up within {timeout:.0f}s"
+                elapsed = time.monotonic() - started
+                print(f"[Raft] {self.node_id} catch-up round {round_number} for {server_id}: "
+                      f"index {target} in {elapsed * 1000:.0f}ms")
+                if elapsed < RAFT_ELECTION_TIMEOUT_RANGE[0]:
+                    break
+            else:
+                return False, f"{server_id} still lagging after {RAFT_CATCHUP_ROUNDS} catch-up rounds"
+            return self._append_configuration(servers)
+        finally:
+            with self.state_lock:
+                self.catching_up = None
+                if server_id not in self.voters and server_id not in self.learners:
+                    self._set_peers_locked([p for p in self.peers if p['id'] != server_id])
+
+    def remove_server(self, server_id):
+        """Remove a member (leader only, one change at a time). Returns (success, message)."""
+        with self.state_lock:
+            blocked = self._membership_change_blocked_locked()
+            if blocked:
+                return False, blocked
+            if server_id not in self.voters and server_id not in self.learners:
+                return True, "Not a member"
+            if server_id == self.node_id:
+                return False, "The leader cannot remove itself; transfer leadership first"
+            servers = [server for server in self.config if server['id'] != server_id]
+        return self._append_configuration(servers)
+
+    def _membership_response(self, success, message):
+        with self.state_lock:
+            servers = config_message(self.config).servers
+            return raft_pb2.MembershipResponse(
+                success=success, leader_id=self.leader_id or "", message=message, servers=servers
+            )
+
+    def _forward_membership_change(self, rpc_name, request):
+        leader_address = self._get_leader_address()
+        if not leader_address or self.leader_id == self.node_id:
+            return self._membership_response(False, "No known leader")
+        try:
+            self._log_client(rpc_name, self.leader_id)
+            stub = self._get_stub_by_address(leader_address, self.leader_id)
+            return getattr(stub, rpc_name)(request, timeout=RAFT_CATCHUP_TIMEOUT + 5)
+        except Exception as e:
+            print(f"[Raft] Forward {rpc_name} failed: {e}")
+            return self._membership_response(False, f"Forward to leader failed: {e}")
+
+    def AddServer(self, request, context):
+        print(f"Node {self.node_id} runs RPC AddServer for {request.server_id} at {request.address}"
+              f"{' as learner' if request.learner else ''}")
+        if not request.server_id or not request.address:
+            return self._membership_response(False, "server_id and address are required")
+        if self.role != 'leader':
+            return self._forward_membership_change('AddServer', request)
+        return self._membership_response(*self.add_server(request.server_id, request.address, learner=request.learner))
+
+    def RemoveServer(self, request, context):
+        print(f"Node {self.node_id} runs RPC RemoveServer for {request.server_id}")
+        if self.role == 'leader' and request.server_id == self.node_id:
+            # A leader cannot drop itself from the majority it leads: hand off
+            # and let the new leader remove us
+            self.transfer_leadership()
+        if self.role != 'leader':
+            return self._forward_membership_change('RemoveServer', request)
+        return self._membership_response(*self.remove_server(request.server_id))
+
+    def Status(self, request, context):
+        with self.state_lock:
+            return raft_pb2.StatusResponse(
+                node_id=self.node_id, role=self.role, term=self.current_term, leader_id=self.leader_id or "",
+                commit_index=self.commit_index, last_applied=self.last_applied,
+                servers=config_message(self.config).servers, transfer_target=self.transfer_target or ""
+            )
+
 class AuthServiceServicer(library_pb2_grpc.AuthServiceServicer):
     def Login(self, request, context):
         try:
@@ -499,18 +2265,13 @@ class AuthServiceServicer(library_pb2_grpc.AuthServiceServicer):
             # Step 1: replicate the intent through Raft before executing
             if RAFT_NODE_INSTANCE is not None:
                 try:
-                    op_payload = {
-                        "type": "Auth.Register",
-                        "student_id": request.student_id,
-                        "name": request.name,
-                    }
                     raft_request = raft_pb2.OperationRequest(
-                        operation=json.dumps(op_payload),
+                        payload=operations.auth_register(request.student_id, request.name),
                         source_id=f"AuthService:{RAFT_NODE_ID}",
                     )
-                    raft_response = RAFT_NODE_INSTANCE.SubmitOperation(raft_request, None)
+                    raft_response = RAFT_NODE_INSTANCE.SubmitOperation(raft_request, context)
                     if not raft_response.success:
-                        context.set_code(grpc.StatusCode.ABORTED)
+                        context.set_code(raft_failure_code(raft_response))
                         context.set_details(f"Raft commit failed: {raft_response.result}")
                         return library_pb2.RegisterResponse()
                 except Exception as e:
@@ -576,6 +2337,15 @@ class OperationServiceServicer(library_pb2_grpc.OperationServiceServicer):
     def SubmitOperation(self, request, context):
         # Forward through Raft service to ensure log replication and proper logging
         operation = request.operation or "noop"
+        if self.raft_node.role == 'leader':
+            # Already at the leader (e.g. routed here by a leader-aware client): no extra hop
+            raft_resp = self.raft_node.SubmitOperation(
+                raft_pb2.OperationRequest(operation=operation, source_id=request.source_id or self.raft_node.node_id),
+                context
+            )
+            return library_pb2.OperationResponse(
+                success=raft_resp.success, result=raft_resp.result, leader_id=raft_resp.leader_id
+            )
         target_address = self.raft_node._get_leader_address() or self.raft_node.self_address
         target_id = self.raft_node.leader_id or self.raft_node.node_id
 
@@ -585,23 +2355,275 @@ class OperationServiceServicer(library_pb2_grpc.OperationServiceServicer):
             )
 
         try:
-            stub = self.raft_node._get_stub_by_address(target_address, target_id)
-            self.raft_node._log_client("SubmitOperation", target_id)
-            raft_resp = stub.SubmitOperation(
-                raft_pb2.OperationRequest(operation=operation, source_id=request.source_id or self.raft_node.node_id),
-                timeout=RAFT_RPC_TIMEOUT,
-            )
-            return library_pb2.OperationResponse(
-                success=raft_resp.success, result=raft_resp.result, leader_id=raft_resp.leader_id
-            )
+            stub = self.raft_node._get_stub_by_address(target_address, target_id)
+            self.raft_node._log_client("SubmitOperation", target_id)
+            raft_resp = stub.SubmitOperation(
+                raft_pb2.OperationRequest(operation=operation, source_id=request.source_id or self.raft_node.node_id),
+                timeout=commit_timeout(context),
+            )
+            return library_pb2.OperationResponse(
+                success=raft_resp.success, result=raft_resp.result, leader_id=raft_resp.leader_id
+            )
+        except Exception as e:
+            print(f"[OperationService] SubmitOperation failed: {e}")
+            return library_pb2.OperationResponse(
+                success=False, result=str(e), leader_id=self.raft_node.leader_id or ""
+            )
+
+
+def seats_cache_key(request, generations):
+    """``generations``: values of SEATS_GENERATION_KEY and the request's
+    seats_cache_tag, as returned by MGET."""
+    parts = [
+        '.'.join(generation or '0' for generation in generations),
+        request.branch or 'any',
+        request.area or 'any',
+        str(request.has_power) if request.HasField('has_power') else 'any',
+        str(request.has_monitor) if request.HasField('has_monitor') else 'any',
+        str(request.available_only),
+        request.start_time or '',
+        request.end_time or ''
+    ]
+    # The entries hold a SEATS_ENTRY_HEADER and serialized GetSeatsResponse
+    # bytes; the pbv2 segment keeps them apart from older entry formats
+    return f"seats:pbv2:{':'.join(parts)}"
+
+
+# Prefix of GetSeats cache entries: when the entry should be refreshed (epoch
+# seconds) and how long its query took
+SEATS_ENTRY_HEADER = struct.Struct('>dd')
+
+
+def pack_seats_entry(payload, load_seconds):
+    return SEATS_ENTRY_HEADER.pack(time.time() + SEATS_CACHE_TTL, load_seconds) + payload
+
+
+def unpack_seats_entry(entry):
+    """-> (payload, refresh_at, load_seconds)"""
+    refresh_at, load_seconds = SEATS_ENTRY_HEADER.unpack_from(entry)
+    return entry[SEATS_ENTRY_HEADER.size:], refresh_at, load_seconds
+
+
+def seats_entry_needs_refresh(refresh_at, load_seconds):
+    """Past its refresh time, or chosen for an early refresh (XFetch: the
+    chance grows as refresh_at approaches, and with the query's cost)."""
+    early = -load_seconds * SEATS_CACHE_BETA * math.log(1.0 - random.random())
+    return time.time() + early >= refresh_at
+
+
+class SingleFlight:
+    """At most one call per key at a time in this process; callers that
+    arrive while it runs share its result (or exception)."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+
+    def do(self, key, fn, timeout=None):
+        with self.lock:
+            future = self.calls.get(key)
+            leader = future is None
+            if leader:
+                future = self.calls[key] = futures.Future()
+        if not leader:
+            return future.result(timeout)
+        try:
+            future.set_result(fn())
         except Exception as e:
-            print(f"[OperationService] SubmitOperation failed: {e}")
-            return library_pb2.OperationResponse(
-                success=False, result=str(e), leader_id=self.raft_node.leader_id or ""
+            future.set_exception(e)
+        finally:
+            self._finish(key, future)
+        return future.result()
+
+    def do_background(self, key, fn, executor):
+        """Start fn() on ``executor`` unless a call for ``key`` is running."""
+        with self.lock:
+            if key in self.calls:
+                return
+            future = self.calls[key] = executor.submit(fn)
+        future.add_done_callback(lambda done: self._finish(key, done))
+
+    def _finish(self, key, future):
+        with self.lock:
+            if self.calls.get(key) is future:
+                del self.calls[key]
+        if future.done() and not future.cancelled() and future.exception() is not None:
+            print(f"[Cache] load of {key} failed: {future.exception()}")
+
+
+SEATS_LOADS = SingleFlight()
+SEATS_REFRESH_EXECUTOR = futures.ThreadPoolExecutor(max_workers=SEATS_REFRESH_WORKERS)
+
+
+def fetch_seats(request, from_memory):
+    """GetSeats seat rows with ``is_available`` set (unless ``from_memory``):
+    the seat list and the seats blocked in the window, two queries on one
+    connection matched in bulk by availability.mark_available."""
+    conn = None
+    cur = None
+    try:
+        with db_semaphore:
+            conn = get_db_connection()
+            cur = conn.cursor(cursor_factory=RealDictCursor)
+            cur.execute(*seats_query(request))
+            seats = cur.fetchall()
+            if from_memory:
+                return seats
+            cur.execute(*availability.blocking_seats_query(request.start_time, request.end_time))
+            blocked = [row['seat_id'] for row in cur.fetchall()]
+    finally:
+        if cur:
+            cur.close()
+        if conn:
+            return_db_connection(conn)
+    return availability.mark_available(seats, blocked)
+
+
+def load_seats(request, cache_key, l1_key, tag, l1_version):
+    """Query a cacheable GetSeats request and store the response in Redis and
+    L1_CACHE; returns the serialized GetSeatsResponse."""
+    started = time.monotonic()
+    from_memory = seats_from_memory(request, False)
+    seats = fetch_seats(request, from_memory)
+    payload = seats_response(seat_infos(request, seats, from_memory)).SerializeToString()
+    redis_bytes_client.setex(
+        cache_key, math.ceil(SEATS_CACHE_TTL + SEATS_CACHE_STALE_TTL),
+        pack_seats_entry(payload, time.monotonic() - started)
+    )
+    L1_CACHE.put(l1_key, tag, payload, l1_version)
+    return payload
+
+
+def seats_from_memory(request, linearizable):
+    """True if GetSeats may take availability from SEAT_STATE instead of SQL."""
+    time_range = request.start_time and request.end_time
+    # After a linearizable barrier the local state is current; otherwise
+    # a follower or learner must be within the staleness bound
+    return (SEAT_STATE is not None and SEAT_STATE.covers(request.start_time if time_range else None)
+            and (linearizable or replicated_state_fresh()))
+
+
+def seats_query(request):
+    """SQL and parameters for the GetSeats seat list (``%s`` placeholders,
+    psycopg2 and psycopg 3); availability is matched in availability.py."""
+    params = []
+    query_filters = []
+
+    if request.branch:
+        query_filters.append('s.branch = %s')
+        params.append(request.branch)
+
+    if request.area:
+        query_filters.append('s.area = %s')
+        params.append(request.area)
+
+    if request.HasField('has_power'):
+        query_filters.append('s.has_power = %s')
+        params.append(request.has_power)
+
+    if request.HasField('has_monitor'):
+        query_filters.append('s.has_monitor = %s')
+        params.append(request.has_monitor)
+
+    query = """
+        SELECT
+            s.id,
+            s.branch,
+            s.area,
+            s.has_power,
+            s.has_monitor,
+            s.status
+        FROM seats s
+    """
+
+    if query_filters:
+        query += ' WHERE ' + ' AND '.join(query_filters)
+
+    query += ' ORDER BY s.id'
+    return query, params
+
+
+def seat_infos(request, seats, from_memory):
+    """GetSeats rows -> the seat dicts that are returned and cached."""
+    result_payload = []
+    now = datetime.utcnow()
+    for seat in seats:
+        if from_memory:
+            is_available = SEAT_STATE.is_available(
+                seat['id'], request.start_time or None, request.end_time or None, now
             )
+        else:
+            is_available = seat['is_available']
+        seat_info = {
+            'id': seat['id'],
+            'branch': seat['branch'],
+            'area': seat['area'] or '',
+            'has_power': seat['has_power'],
+            'has_monitor': seat['has_monitor'],
+            'status': seat['status'],
+            'is_available': is_available
+        }
+
+        if not request.available_only or seat_info['is_available']:
+            result_payload.append(seat_info)
+    return result_payload
+
+
+def seats_response(payload):
+    seat_messages = [
+        library_pb2.Seat(
+            id=seat['id'],
+            branch=seat['branch'],
+            area=seat.get('area', ''),
+            has_power=seat['has_power'],
+            has_monitor=seat['has_monitor'],
+            status=seat['status'],
+            is_available=seat['is_available']
+        )
+        for seat in payload
+    ]
+    return library_pb2.GetSeatsResponse(seats=seat_messages, count=len(seat_messages))
+
+
+def serialize_response(response):
+    """Response serializer that passes pre-serialized bytes through."""
+    return response if isinstance(response, bytes) else response.SerializeToString()
+
+
+def add_seat_service_to_server(servicer, server):
+    """Like ``library_pb2_grpc.add_SeatServiceServicer_to_server``, except that
+    GetSeats and GetBranches may return cached response bytes as they are."""
+    rpc_method_handlers = {
+        'GetSeats': grpc.unary_unary_rpc_method_handler(
+            servicer.GetSeats,
+            request_deserializer=library_pb2.GetSeatsRequest.FromString,
+            response_serializer=serialize_response,
+        ),
+        'GetSeat': grpc.unary_unary_rpc_method_handler(
+            servicer.GetSeat,
+            request_deserializer=library_pb2.GetSeatRequest.FromString,
+            response_serializer=library_pb2.GetSeatResponse.SerializeToString,
+        ),
+        'CheckAvailability': grpc.unary_unary_rpc_method_handler(
+            servicer.CheckAvailability,
+            request_deserializer=library_pb2.CheckAvailabilityRequest.FromString,
+            response_serializer=library_pb2.CheckAvailabilityResponse.SerializeToString,
+        ),
+        'GetBranches': grpc.unary_unary_rpc_method_handler(
+            servicer.GetBranches,
+            request_deserializer=library_pb2.GetBranchesRequest.FromString,
+            response_serializer=serialize_response,
+        ),
+    }
+    server.add_generic_rpc_handlers((grpc.method_handlers_generic_handler('library.SeatService', rpc_method_handlers),))
+
 
 class SeatServiceServicer(library_pb2_grpc.SeatServiceServicer):
     def get_seat_availability(self, seat_id, start_time=None, end_time=None):
+        if (SEAT_STATE is not None and SEAT_STATE.covers(start_time if start_time and end_time else None)
+                and replicated_state_fresh()):
+            return SEAT_STATE.is_available(seat_id, start_time, end_time)
+
         conn = get_db_connection()
         cur = conn.cursor(cursor_factory=RealDictCursor)
 
@@ -637,154 +2659,53 @@ class SeatServiceServicer(library_pb2_grpc.SeatServiceServicer):
 
     def GetSeats(self, request, context):
         try:
-            cache_key_parts = [
-                request.branch or 'any',
-                request.area or 'any',
-                str(request.has_power) if request.HasField('has_power') else 'any',
-                str(request.has_monitor) if request.HasField('has_monitor') else 'any',
-                str(request.available_only),
-                request.start_time or '',
-                request.end_time or ''
-            ]
-            cache_key = f"seats:{':'.join(cache_key_parts)}"
-            lock_key = f"{cache_key}:lock"
-
-            def build_response_from_cache(payload: str):
-                cached_seats = json.loads(payload)
-                seat_messages = [
-                    library_pb2.Seat(
-                        id=seat['id'],
-                        branch=seat['branch'],
-                        area=seat.get('area', ''),
-                        has_power=seat['has_power'],
-                        has_monitor=seat['has_monitor'],
-                        status=seat['status'],
-                        is_available=seat['is_available']
-                    )
-                    for seat in cached_seats
-                ]
-                return library_pb2.GetSeatsResponse(seats=seat_messages, count=len(seat_messages))
-
-            cached_payload = redis_client.get(cache_key)
-            if cached_payload:
-                return build_response_from_cache(cached_payload)
-
-            acquired_lock = redis_client.set(lock_key, "1", nx=True, ex=10)
-            if not acquired_lock:
-                for _ in range(50):
-                    time.sleep(0.1)
-                    cached_payload = redis_client.get(cache_key)
-                    if cached_payload:
-                        return build_response_from_cache(cached_payload)
-                acquired_lock = redis_client.set(lock_key, "1", nx=True, ex=10)
-
-            availability_clause = """
-                CASE
-                    WHEN EXISTS (
-                        SELECT 1 FROM reservations r
-                        WHERE r.seat_id = s.id
-                        AND r.status IN ('CONFIRMED', 'CHECKED_IN')
-                        AND r.start_time <= NOW()
-                        AND r.end_time > NOW()
-                    )
-                    THEN FALSE
-                    ELSE TRUE
-                END AS is_available
-            """
-
-            params = []
-            query_filters = []
-
-            if request.branch:
-                query_filters.append('s.branch = %s')
-                params.append(request.branch)
-
-            if request.area:
-                query_filters.append('s.area = %s')
-                params.append(request.area)
-
-            if request.HasField('has_power'):
-                query_filters.append('s.has_power = %s')
-                params.append(request.has_power)
-
-            if request.HasField('has_monitor'):
-                query_filters.append('s.has_monitor = %s')
-                params.append(request.has_monitor)
-
-            if request.start_time and request.end_time:
-                availability_clause = """
-                    CASE
-                        WHEN EXISTS (
-                            SELECT 1 FROM reservations r
-                            WHERE r.seat_id = s.id
-                            AND r.status NOT IN ('CANCELLED', 'NO_SHOW')
-                            AND tsrange(r.start_time, r.end_time) && tsrange(%s, %s)
-                        )
-                        THEN FALSE
-                        ELSE TRUE
-                    END AS is_available
-                """
-                params.append(request.start_time)
-                params.append(request.end_time)
-
-            query = f"""
-                SELECT
-                    s.id,
-                    s.branch,
-                    s.area,
-                    s.has_power,
-                    s.has_monitor,
-                    s.status,
-                    {availability_clause}
-                FROM seats s
-            """
-
-            if query_filters:
-                query += ' WHERE ' + ' AND '.join(query_filters)
-
-            query += ' ORDER BY s.id'
-
-            conn = None
-            cur = None
-            try:
-                with db_semaphore:
-                    conn = get_db_connection()
-                    cur = conn.cursor(cursor_factory=RealDictCursor)
-                    cur.execute(query, params)
-                    seats = cur.fetchall()
-            except Exception:
-                if acquired_lock:
-                    redis_client.delete(lock_key)
-                raise
-            finally:
-                if cur:
-                    cur.close()
-                if conn:
-                    return_db_connection(conn)
-
-            result_payload = []
-            result_seats = []
-            for seat in seats:
-                seat_info = {
-                    'id': seat['id'],
-                    'branch': seat['branch'],
-                    'area': seat['area'] or '',
-                    'has_power': seat['has_power'],
-                    'has_monitor': seat['has_monitor'],
-                    'status': seat['status'],
-                    'is_available': seat['is_available']
-                }
-
-                if not request.available_only or seat_info['is_available']:
-                    result_payload.append(seat_info)
-                    result_seats.append(library_pb2.Seat(**seat_info))
-
-            if acquired_lock:
-                redis_client.setex(cache_key, 30, json.dumps(result_payload))
-                redis_client.delete(lock_key)
-
-            return library_pb2.GetSeatsResponse(seats=result_seats, count=len(result_seats))
-
+            # A linearizable read must not be served from (possibly stale) cache
+            linearizable = wants_linearizable_read(context)
+            if linearizable and not linearizable_read_barrier(context):
+                return library_pb2.GetSeatsResponse()
+
+            # Cache hits return the stored GetSeatsResponse bytes unparsed
+            # (see add_seat_service_to_server)
+            if not linearizable:
+                # L1 entries are keyed without generations; pub/sub drops them
+                tag = seats_cache_tag(request.branch, request.area)
+                l1_key = seats_cache_key(request, ())
+                l1_version = L1_CACHE.version
+                cached_response = L1_CACHE.get(l1_key)
+                if cached_response is not None:
+                    record_seats_cache('l1_hit')
+                    return cached_response
+
+                cache_key = seats_cache_key(request, redis_client.mget(SEATS_GENERATION_KEY, tag))
+
+                def load():
+                    return load_seats(request, cache_key, l1_key, tag, l1_version)
+
+                entry = redis_bytes_client.get(cache_key)
+                if entry is not None:
+                    # Stale or due for early refresh: answer now, refresh behind
+                    cached_response, refresh_at, load_seconds = unpack_seats_entry(entry)
+                    if seats_entry_needs_refresh(refresh_at, load_seconds):
+                        SEATS_LOADS.do_background(cache_key, load, SEATS_REFRESH_EXECUTOR)
+                        record_seats_cache('refresh')
+                    else:
+                        L1_CACHE.put(l1_key, tag, cached_response, l1_version)
+                    record_seats_cache('hit')
+                    return cached_response
+
+                # One query per key in this process; concurrent misses wait for it
+                record_seats_cache('miss')
+                return SEATS_LOADS.do(cache_key, load, rpc_timeout(context))
+
+            record_seats_cache('bypass')
+            from_memory = seats_from_memory(request, linearizable)
+            seats = fetch_seats(request, from_memory)
+            return seats_response(seat_infos(request, seats, from_memory))
+
+        except futures.TimeoutError:
+            context.set_code(grpc.StatusCode.DEADLINE_EXCEEDED)
+            context.set_details('Deadline exceeded waiting for the seat query')
+            return library_pb2.GetSeatsResponse()
         except Exception as e:
             print(f"[GetSeats] error: {e}")
             context.set_code(grpc.StatusCode.INTERNAL)
@@ -862,6 +2783,13 @@ class SeatServiceServicer(library_pb2_grpc.SeatServiceServicer):
 
     def GetBranches(self, request, context):
         try:
+            # Branch totals only change with the seats table, i.e. on a full
+            # invalidation, so they are kept in L1 only
+            l1_version = L1_CACHE.version
+            cached_response = L1_CACHE.get(BRANCHES_CACHE_KEY)
+            if cached_response is not None:
+                return cached_response
+
             conn = get_db_connection()
             cur = conn.cursor(cursor_factory=RealDictCursor)
 
@@ -885,54 +2813,144 @@ class SeatServiceServicer(library_pb2_grpc.SeatServiceServicer):
                 monitor_seats=b['monitor_seats']
             ) for b in branches]
 
-            return library_pb2.GetBranchesResponse(branches=result)
+            serialized = library_pb2.GetBranchesResponse(branches=result).SerializeToString()
+            L1_CACHE.put(BRANCHES_CACHE_KEY, SEATS_GENERATION_KEY, serialized, l1_version)
+            return serialized
 
         except Exception as e:
             context.set_code(grpc.StatusCode.INTERNAL)
             context.set_details(str(e))
             return library_pb2.GetBranchesResponse()
 
+def release_reservation_key(key):
+    """Undo a committed Reservation.Create whose database insert did not happen."""
+    if key is not None:
+        submit_raft_operation_log(operations.reservation_abort(key))
+
+
+# An active reservation of the seat overlapping [start, end): the rows the
+# reservations_no_overlap constraint compares against
+OVERLAPPING_RESERVATION_SQL = '''
+    SELECT 1 FROM reservations
+    WHERE seat_id = %s AND status NOT IN ('CANCELLED', 'NO_SHOW')
+    AND tsrange(start_time, end_time) && tsrange(%s, %s)
+    LIMIT 1
+'''
+
+
+class SeatStateReconciler:
+    """Brings SEAT_STATE back in line with PostgreSQL, the system of record.
+
+    Writes replicate their intent before their database statement, so a
+    Create or Cancel that commits after its caller gave up (commit timeout,
+    failed forward) or whose process dies before the INSERT/UPDATE leaves the
+    two apart; so do the REST services, which write PostgreSQL directly.
+    plan() only repairs a difference that two passes in a row have seen, so
+    a write between its commit and its database statement is left alone.
+    """
+
+    def __init__(self):
+        self.suspects = set()
+
+    def plan(self, state, rows, now):
+        """Operations that repair ``state`` given the active database ``rows``."""
+        orphans, missing = state.diverged(rows, now)
+        found = {('orphan', seat_id, start, key) for seat_id, start, key in orphans}
+        found.update(
+            ('missing', row['seat_id'], row['start_time'], row['end_time'], row['user_id']) for row in missing
+        )
+        confirmed = found & self.suspects
+        self.suspects = found - confirmed
+        payloads = []
+        for difference in sorted(confirmed, key=repr):
+            if difference[0] == 'orphan':
+                _, seat_id, start, key = difference
+                # Imported reservations have no key: release them by slot
+                payloads.append(operations.reservation_abort(key) if key is not None
+                                else operations.reservation_ref('cancel', 0, seat_id, start))
+            else:
+                _, seat_id, start, end, user_id = difference
+                payloads.append(operations.reservation_create(user_id, seat_id, start, end))
+        return payloads
+
+    def reset(self):
+        self.suspects = set()
+
+
+SEAT_STATE_RECONCILER = SeatStateReconciler()
+
+
 class ReservationServiceServicer(library_pb2_grpc.ReservationServiceServicer):
     def CreateReservation(self, request, context):
         try:
-            # Step 1: replicate the intent through Raft before executing
+            conn = get_db_connection()
+            cur = conn.cursor(cursor_factory=RealDictCursor)
+
+            cur.execute('SELECT id FROM seats WHERE id = %s', (request.seat_id,))
+            seat = cur.fetchone()
+
+            if not seat:
+                cur.close()
+                return_db_connection(conn)
+                context.set_code(grpc.StatusCode.NOT_FOUND)
+                context.set_details('Seat not found')
+                return library_pb2.CreateReservationResponse()
+
+            # Step 1: replicate the intent through Raft; the replicated seat
+            # state machine detects conflicts when the entry is applied
+            reservation_key = None
             if RAFT_NODE_INSTANCE is not None:
                 try:
-                    op_payload = {
-                        "type": "Reservation.Create",
-                        "user_id": request.user_id,
-                        "seat_id": request.seat_id,
-                        "start_time": request.start_time,
-                        "end_time": request.end_time,
-                    }
+                    payload = operations.reservation_create(
+                        request.user_id, request.seat_id, request.start_time, request.end_time
+                    )
+                except ValueError as e:
+                    cur.close()
+                    return_db_connection(conn)
+                    context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+                    context.set_details(f"Invalid reservation: {e}")
+                    return library_pb2.CreateReservationResponse()
+                try:
                     raft_request = raft_pb2.OperationRequest(
-                        operation=json.dumps(op_payload),
+                        payload=payload,
                         source_id=f"ReservationService:{RAFT_NODE_ID}",
                     )
-                    raft_response = RAFT_NODE_INSTANCE.SubmitOperation(raft_request, None)
+                    raft_response = RAFT_NODE_INSTANCE.SubmitOperation(raft_request, context)
                     if not raft_response.success:
-                        context.set_code(grpc.StatusCode.ABORTED)
+                        cur.close()
+                        return_db_connection(conn)
+                        context.set_code(raft_failure_code(raft_response))
                         context.set_details(f"Raft commit failed: {raft_response.result}")
                         return library_pb2.CreateReservationResponse()
                 except Exception as e:
+                    cur.close()
+                    return_db_connection(conn)
                     context.set_code(grpc.StatusCode.UNAVAILABLE)
                     context.set_details(f"Raft submit error: {e}")
                     return library_pb2.CreateReservationResponse()
 
-            # Step 2: execute the actual reservation creation against the database
-            conn = get_db_connection()
-            cur = conn.cursor(cursor_factory=RealDictCursor)
-
-            cur.execute('SELECT id FROM seats WHERE id = %s', (request.seat_id,))
-            seat = cur.fetchone()
-
-            if not seat:
-                cur.close()
-                return_db_connection(conn)
-                context.set_code(grpc.StatusCode.NOT_FOUND)
-                context.set_details('Seat not found')
-                return library_pb2.CreateReservationResponse()
+                outcome = json.loads(raft_response.result) if raft_response.result.startswith('{') else {}
+                if outcome.get('error') == 'conflict':
+                    cur.execute(OVERLAPPING_RESERVATION_SQL,
+                                (request.seat_id, request.start_time, request.end_time))
+                    if cur.fetchone() is None:
+                        # The seat state holds a reservation PostgreSQL does not (see
+                        # SeatStateReconciler): let the exclusion constraint decide
+                        print(f"[SeatState] Conflict on seat {request.seat_id} has no database row")
+                        outcome = {}
+                if outcome.get('ok') is False:
+                    cur.close()
+                    return_db_connection(conn)
+                    if outcome.get('error') == 'conflict':
+                        context.set_code(grpc.StatusCode.ALREADY_EXISTS)
+                        context.set_details('Time slot conflict: seat already reserved for this time period')
+                    else:
+                        context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+                        context.set_details(f"Invalid reservation: {outcome.get('details', outcome.get('error'))}")
+                    return library_pb2.CreateReservationResponse()
+                reservation_key = outcome.get('key')
 
+            # Step 2: execute the actual reservation creation against the database
             try:
                 cur.execute('''
                     INSERT INTO reservations (user_id, seat_id, start_time, end_time, status)
@@ -965,6 +2983,7 @@ class ReservationServiceServicer(library_pb2_grpc.ReservationServiceServicer):
                 conn.rollback()
                 cur.close()
                 return_db_connection(conn)
+                release_reservation_key(reservation_key)
 
                 if 'reservations_no_overlap' in str(e):
                     context.set_code(grpc.StatusCode.ALREADY_EXISTS)
@@ -974,6 +2993,9 @@ class ReservationServiceServicer(library_pb2_grpc.ReservationServiceServicer):
                     context.set_details('Database constraint violation')
 
                 return library_pb2.CreateReservationResponse()
+            except Exception:
+                release_reservation_key(reservation_key)
+                raise
 
         except Exception as e:
             context.set_code(grpc.StatusCode.INTERNAL)
@@ -982,6 +3004,9 @@ class ReservationServiceServicer(library_pb2_grpc.ReservationServiceServicer):
 
     def GetReservation(self, request, context):
         try:
+            if wants_linearizable_read(context) and not linearizable_read_barrier(context):
+                return library_pb2.GetReservationResponse()
+
             conn = get_db_connection()
             cur = conn.cursor(cursor_factory=RealDictCursor)
 
@@ -1029,28 +3054,7 @@ class ReservationServiceServicer(library_pb2_grpc.ReservationServiceServicer):
 
     def CheckIn(self, request, context):
         try:
-            # Step 1: replicate the intent through Raft before executing
-            if RAFT_NODE_INSTANCE is not None:
-                try:
-                    op_payload = {
-                        "type": "Reservation.CheckIn",
-                        "reservation_id": request.reservation_id,
-                    }
-                    raft_request = raft_pb2.OperationRequest(
-                        operation=json.dumps(op_payload),
-                        source_id=f"ReservationService:{RAFT_NODE_ID}",
-                    )
-                    raft_response = RAFT_NODE_INSTANCE.SubmitOperation(raft_request, None)
-                    if not raft_response.success:
-                        context.set_code(grpc.StatusCode.ABORTED)
-                        context.set_details(f"Raft commit failed: {raft_response.result}")
-                        return library_pb2.CheckInResponse()
-                except Exception as e:
-                    context.set_code(grpc.StatusCode.UNAVAILABLE)
-                    context.set_details(f"Raft submit error: {e}")
-                    return library_pb2.CheckInResponse()
-
-            # Step 2: execute the actual check-in against the database
+            # Step 1: validate the reservation against the database
             conn = get_db_connection()
             cur = conn.cursor(cursor_factory=RealDictCursor)
 
@@ -1094,6 +3098,30 @@ class ReservationServiceServicer(library_pb2_grpc.ReservationServiceServicer):
                 context.set_details('Cannot check in after reservation end time')
                 return library_pb2.CheckInResponse()
 
+            # Step 2: replicate the intent through Raft before writing
+            if RAFT_NODE_INSTANCE is not None:
+                try:
+                    raft_request = raft_pb2.OperationRequest(
+                        payload=operations.reservation_ref(
+                            'check_in', request.reservation_id, reservation['seat_id'], reservation['start_time']
+                        ),
+                        source_id=f"ReservationService:{RAFT_NODE_ID}",
+                    )
+                    raft_response = RAFT_NODE_INSTANCE.SubmitOperation(raft_request, context)
+                    if not raft_response.success:
+                        cur.close()
+                        return_db_connection(conn)
+                        context.set_code(raft_failure_code(raft_response))
+                        context.set_details(f"Raft commit failed: {raft_response.result}")
+                        return library_pb2.CheckInResponse()
+                except Exception as e:
+                    cur.close()
+                    return_db_connection(conn)
+                    context.set_code(grpc.StatusCode.UNAVAILABLE)
+                    context.set_details(f"Raft submit error: {e}")
+                    return library_pb2.CheckInResponse()
+
+            # Step 3: execute the actual check-in against the database
             cur.execute('''
                 UPDATE reservations
                 SET status = 'CHECKED_IN', checked_in_at = NOW()
@@ -1129,28 +3157,7 @@ class ReservationServiceServicer(library_pb2_grpc.ReservationServiceServicer):
 
     def CancelReservation(self, request, context):
         try:
-            # Step 1: replicate the intent through Raft before executing
-            if RAFT_NODE_INSTANCE is not None:
-                try:
-                    op_payload = {
-                        "type": "Reservation.Cancel",
-                        "reservation_id": request.reservation_id,
-                    }
-                    raft_request = raft_pb2.OperationRequest(
-                        operation=json.dumps(op_payload),
-                        source_id=f"ReservationService:{RAFT_NODE_ID}",
-                    )
-                    raft_response = RAFT_NODE_INSTANCE.SubmitOperation(raft_request, None)
-                    if not raft_response.success:
-                        context.set_code(grpc.StatusCode.ABORTED)
-                        context.set_details(f"Raft commit failed: {raft_response.result}")
-                        return library_pb2.CancelReservationResponse()
-                except Exception as e:
-                    context.set_code(grpc.StatusCode.UNAVAILABLE)
-                    context.set_details(f"Raft submit error: {e}")
-                    return library_pb2.CancelReservationResponse()
-
-            # Step 2: execute the actual cancellation against the database
+            # Step 1: validate the reservation against the database
             conn = get_db_connection()
             cur = conn.cursor(cursor_factory=RealDictCursor)
 
@@ -1176,6 +3183,30 @@ class ReservationServiceServicer(library_pb2_grpc.ReservationServiceServicer):
                 context.set_details(f'Cannot cancel: reservation status is {reservation["status"]}')
                 return library_pb2.CancelReservationResponse()
 
+            # Step 2: replicate the intent through Raft before writing
+            if RAFT_NODE_INSTANCE is not None:
+                try:
+                    raft_request = raft_pb2.OperationRequest(
+                        payload=operations.reservation_ref(
+                            'cancel', request.reservation_id, reservation['seat_id'], reservation['start_time']
+                        ),
+                        source_id=f"ReservationService:{RAFT_NODE_ID}",
+                    )
+                    raft_response = RAFT_NODE_INSTANCE.SubmitOperation(raft_request, context)
+                    if not raft_response.success:
+                        cur.close()
+                        return_db_connection(conn)
+                        context.set_code(raft_failure_code(raft_response))
+                        context.set_details(f"Raft commit failed: {raft_response.result}")
+                        return library_pb2.CancelReservationResponse()
+                except Exception as e:
+                    cur.close()
+                    return_db_connection(conn)
+                    context.set_code(grpc.StatusCode.UNAVAILABLE)
+                    context.set_details(f"Raft submit error: {e}")
+                    return library_pb2.CancelReservationResponse()
+
+            # Step 3: execute the actual cancellation against the database
             cur.execute('''
                 UPDATE reservations
                 SET status = 'CANCELLED'
@@ -1211,6 +3242,9 @@ class ReservationServiceServicer(library_pb2_grpc.ReservationServiceServicer):
 
     def GetUserReservations(self, request, context):
         try:
+            if wants_linearizable_read(context) and not linearizable_read_barrier(context):
+                return library_pb2.GetUserReservationsResponse()
+
             query = '''
                 SELECT r.*, s.branch, s.area, s.has_power, s.has_monitor
                 FROM reservations r
@@ -1265,20 +3299,22 @@ class NotifyServiceServicer(library_pb2_grpc.NotifyServiceServicer):
             # Step 1: replicate the intent through Raft before executing
             if RAFT_NODE_INSTANCE is not None:
                 try:
-                    op_payload = {
-                        "type": "Waitlist.Add",
-                        "user_id": request.user_id,
-                        "seat_id": request.seat_id if request.HasField('seat_id') else None,
-                        "branch": request.branch,
-                        "desired_time": request.desired_time,
-                    }
+                    payload = operations.waitlist_add(
+                        request.user_id, request.seat_id if request.HasField('seat_id') else None,
+                        request.branch, request.desired_time
+                    )
+                except ValueError as e:
+                    context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+                    context.set_details(f"Invalid desired_time: {e}")
+                    return library_pb2.AddToWaitlistResponse()
+                try:
                     raft_request = raft_pb2.OperationRequest(
-                        operation=json.dumps(op_payload),
+                        payload=payload,
                         source_id=f"NotifyService:{RAFT_NODE_ID}",
                     )
-                    raft_response = RAFT_NODE_INSTANCE.SubmitOperation(raft_request, None)
+                    raft_response = RAFT_NODE_INSTANCE.SubmitOperation(raft_request, context)
                     if not raft_response.success:
-                        context.set_code(grpc.StatusCode.ABORTED)
+                        context.set_code(raft_failure_code(raft_response))
                         context.set_details(f"Raft commit failed: {raft_response.result}")
                         return library_pb2.AddToWaitlistResponse()
                 except Exception as e:
@@ -1357,20 +3393,33 @@ class NotifyServiceServicer(library_pb2_grpc.NotifyServiceServicer):
 
     def RemoveFromWaitlist(self, request, context):
         try:
-            # Step 1: replicate the intent through Raft before executing
+            # Step 1: look up the entry so replicas can identify it
+            conn = get_db_connection()
+            cur = conn.cursor(cursor_factory=RealDictCursor)
+            cur.execute('SELECT user_id, seat_id, branch, desired_time FROM waitlist WHERE id = %s',
+                        (request.waitlist_id,))
+            entry = cur.fetchone()
+            cur.close()
+            return_db_connection(conn)
+
+            if not entry:
+                context.set_code(grpc.StatusCode.NOT_FOUND)
+                context.set_details('Waitlist entry not found')
+                return library_pb2.RemoveFromWaitlistResponse()
+
+            # Step 2: replicate the intent through Raft before executing
             if RAFT_NODE_INSTANCE is not None:
                 try:
-                    op_payload = {
-                        "type": "Waitlist.Remove",
-                        "waitlist_id": request.waitlist_id,
-                    }
                     raft_request = raft_pb2.OperationRequest(
-                        operation=json.dumps(op_payload),
+                        payload=operations.waitlist_remove(
+                            request.waitlist_id, entry['user_id'], entry['seat_id'],
+                            entry['branch'], entry['desired_time']
+                        ),
                         source_id=f"NotifyService:{RAFT_NODE_ID}",
                     )
-                    raft_response = RAFT_NODE_INSTANCE.SubmitOperation(raft_request, None)
+                    raft_response = RAFT_NODE_INSTANCE.SubmitOperation(raft_request, context)
                     if not raft_response.success:
-                        context.set_code(grpc.StatusCode.ABORTED)
+                        context.set_code(raft_failure_code(raft_response))
                         context.set_details(f"Raft commit failed: {raft_response.result}")
                         return library_pb2.RemoveFromWaitlistResponse()
                 except Exception as e:
@@ -1378,7 +3427,7 @@ class NotifyServiceServicer(library_pb2_grpc.NotifyServiceServicer):
                     context.set_details(f"Raft submit error: {e}")
                     return library_pb2.RemoveFromWaitlistResponse()
 
-            # Step 2: execute the actual removal against the database
+            # Step 3: execute the actual removal against the database
             conn = get_db_connection()
             cur = conn.cursor(cursor_factory=RealDictCursor)
 
@@ -1408,29 +3457,7 @@ class NotifyServiceServicer(library_pb2_grpc.NotifyServiceServicer):
 
     def NotifyUsers(self, request, context):
         try:
-            # Step 1: replicate the intent through Raft before executing
-            if RAFT_NODE_INSTANCE is not None:
-                try:
-                    op_payload = {
-                        "type": "Waitlist.Notify",
-                        "seat_id": request.seat_id,
-                        "message": request.message,
-                    }
-                    raft_request = raft_pb2.OperationRequest(
-                        operation=json.dumps(op_payload),
-                        source_id=f"NotifyService:{RAFT_NODE_ID}",
-                    )
-                    raft_response = RAFT_NODE_INSTANCE.SubmitOperation(raft_request, None)
-                    if not raft_response.success:
-                        context.set_code(grpc.StatusCode.ABORTED)
-                        context.set_details(f"Raft commit failed: {raft_response.result}")
-                        return library_pb2.NotifyUsersResponse()
-                except Exception as e:
-                    context.set_code(grpc.StatusCode.UNAVAILABLE)
-                    context.set_details(f"Raft submit error: {e}")
-                    return library_pb2.NotifyUsersResponse()
-
-            # Step 2: execute the actual notification bookkeeping against the database
+            # Step 1: pick the next waiting user from the database
             conn = get_db_connection()
             cur = conn.cursor(cursor_factory=RealDictCursor)
 
@@ -1458,6 +3485,32 @@ class NotifyServiceServicer(library_pb2_grpc.NotifyServiceServicer):
 
                 waitlist_entry = cur.fetchone()
 
+            # Step 2: replicate the intent through Raft before writing
+            if RAFT_NODE_INSTANCE is not None:
+                try:
+                    waiter = operations.waitlist_entry(
+                        waitlist_entry['user_id'], waitlist_entry['seat_id'],
+                        waitlist_entry['branch'], waitlist_entry['desired_time']
+                    ) if waitlist_entry else None
+                    raft_request = raft_pb2.OperationRequest(
+                        payload=operations.waitlist_notify(request.seat_id, request.message, waiter),
+                        source_id=f"NotifyService:{RAFT_NODE_ID}",
+                    )
+                    raft_response = RAFT_NODE_INSTANCE.SubmitOperation(raft_request, context)
+                    if not raft_response.success:
+                        cur.close()
+                        return_db_connection(conn)
+                        context.set_code(raft_failure_code(raft_response))
+                        context.set_details(f"Raft commit failed: {raft_response.result}")
+                        return library_pb2.NotifyUsersResponse()
+                except Exception as e:
+                    cur.close()
+                    return_db_connection(conn)
+                    context.set_code(grpc.StatusCode.UNAVAILABLE)
+                    context.set_details(f"Raft submit error: {e}")
+                    return library_pb2.NotifyUsersResponse()
+
+            # Step 3: record the notification in the database
             if waitlist_entry:
                 cur.execute('''
                     UPDATE waitlist
@@ -1495,15 +3548,6 @@ class NotifyServiceServicer(library_pb2_grpc.NotifyServiceServicer):
 def background_worker():
     print(f"Background worker started with grace period of {GRACE_MINUTES} minutes")
 
-    def invalidate_cache(seat_id):
-        try:
-            redis_client.delete(f"seat:{seat_id}")
-            keys = redis_client.keys(f"seats:*")
-            for key in keys:
-                redis_client.delete(key)
-        except Exception as e:
-            print(f"Cache invalidation error: {e}")
-
     def process_no_shows():
         try:
             conn = get_db_connection()
@@ -1529,14 +3573,23 @@ def background_worker():
                         cur.execute('''
                             UPDATE reservations
                             SET status = 'NO_SHOW'
-                            WHERE id = %s
+                            WHERE id = %s AND status = 'CONFIRMED'
                         ''', (reservation['id'],))
+                        updated = cur.rowcount
 
                         conn.commit()
 
+                        if not updated:
+                            # Another instance's worker got there first
+                            continue
+
                         print(f"Marked reservation {reservation['id']} as NO_SHOW")
 
-                        invalidate_cache(reservation['seat_id'])
+                        submit_raft_operation_log(operations.reservation_ref(
+                            'no_show', reservation['id'], reservation['seat_id'], reservation['start_time']
+                        ))
+
+                        invalidate_seat_cache(reservation['seat_id'])
 
                     except Exception as e:
                         print(f"Error processing reservation {reservation['id']}: {e}")
@@ -1580,7 +3633,7 @@ def background_worker():
 
                         print(f"Marked reservation {reservation['id']} as COMPLETED")
 
-                        invalidate_cache(reservation['seat_id'])
+                        invalidate_seat_cache(reservation['seat_id'])
 
                     except Exception as e:
                         print(f"Error completing reservation {reservation['id']}: {e}")
@@ -1595,53 +3648,222 @@ def background_worker():
             print(f"Error in complete_past_reservations: {e}")
             return 0
 
+    def import_seat_state():
+        """Seed the replicated seat state with what PostgreSQL held before the log did."""
+        node = RAFT_NODE_INSTANCE
+        if SEAT_STATE is None or SEAT_STATE.imported or node is None or node.role != 'leader':
+            return
+        try:
+            conn = get_db_connection()
+            cur = conn.cursor(cursor_factory=RealDictCursor)
+            cur.execute('SELECT NOW()::timestamp AS horizon')
+            horizon = cur.fetchone()['horizon']
+            cur.execute('''
+                SELECT user_id, seat_id, start_time, end_time, status
+                FROM reservations
+                WHERE status NOT IN ('CANCELLED', 'NO_SHOW')
+                AND end_time > %s
+            ''', (horizon,))
+            reservations = cur.fetchall()
+            cur.execute('SELECT user_id, seat_id, branch, desired_time, notified_at FROM waitlist ORDER BY created_at')
+            waitlist = cur.fetchall()
+            cur.close()
+            return_db_connection(conn)
+
+            submit_raft_operation_log(operations.reservation_import(horizon, reservations, waitlist))
+            print(f"Imported {len(reservations)} reservations into the replicated seat state")
+        except Exception as e:
+            print(f"Error importing seat state: {e}")
+
+    def expire_seat_state():
+        """Replicate a retention horizon so ended reservations leave the seat state."""
+        node = RAFT_NODE_INSTANCE
+        if SEAT_STATE is None or node is None or node.role != 'leader':
+            return 0
+        # The horizon travels in the entry, so every node drops the same items
+        before = datetime.utcnow() - timedelta(seconds=SEAT_STATE_RETENTION)
+        expired = SEAT_STATE.expirable(before)
+        if expired:
+            submit_raft_operation_log(operations.reservation_expire(before))
+        return expired
+
+    def reconcile_seat_state():
+        """Repair the seat state where it disagrees with PostgreSQL (see SeatStateReconciler)."""
+        node = RAFT_NODE_INSTANCE
+        if SEAT_STATE is None or node is None or node.role != 'leader' or not SEAT_STATE.covers():
+            SEAT_STATE_RECONCILER.reset()
+            return 0
+        try:
+            conn = get_db_connection()
+            cur = conn.cursor(cursor_factory=RealDictCursor)
+            cur.execute('SELECT NOW()::timestamp AS now')
+            now = cur.fetchone()['now']
+            cur.execute('''
+                SELECT user_id, seat_id, start_time, end_time
+                FROM reservations
+                WHERE status NOT IN ('CANCELLED', 'NO_SHOW')
+                AND end_time > %s
+            ''', (now,))
+            rows = cur.fetchall()
+            cur.close()
+            return_db_connection(conn)
+
+            payloads = SEAT_STATE_RECONCILER.plan(SEAT_STATE, rows, now)
+            for payload in payloads:
+                submit_raft_operation_log(payload)
+            return len(payloads)
+        except Exception as e:
+            print(f"Error reconciling seat state: {e}")
+            return 0
+
     time.sleep(10)
 
     while True:
         try:
             print(f"\n[{datetime.utcnow().isoformat()}] Running background check...")
 
+            import_seat_state()
+
             no_shows = process_no_shows()
             completed = complete_past_reservations()
+            expired = expire_seat_state()
+            repaired = reconcile_seat_state()
 
-            print(f"Processed {no_shows} no-shows and {completed} completions")
+            print(f"Processed {no_shows} no-shows and {completed} completions, "
+                  f"expired {expired} and repaired {repaired} seat state items")
 
         except Exception as e:
             print(f"Error in background worker loop: {e}")
 
         time.sleep(60)
 
+def create_raft_node():
+    """Build this process's RaftNode and replicated seat state from the environment."""
+    raft_storage = None
+    if RAFT_DATA_DIR:
+        raft_storage = RaftStorage(
+            os.path.join(RAFT_DATA_DIR, RAFT_NODE_ID),
+            segment_bytes=RAFT_SEGMENT_BYTES,
+            fsync_mode=RAFT_FSYNC_MODE
+        )
+    global RAFT_NODE_INSTANCE, SEAT_STATE
+    SEAT_STATE = SeatStateMachine()
+    raft_servicer = RaftNode(
+        node_id=RAFT_NODE_ID,
+        peers=parse_peer_config(RAFT_PEERS_RAW, RAFT_NODE_ID, RAFT_SELF_ADDRESS),
+        self_address=RAFT_SELF_ADDRESS,
+        storage=raft_storage,
+        state_machine=SEAT_STATE,
+        join=RAFT_JOIN
+    )
+    RAFT_NODE_INSTANCE = raft_servicer
+    return raft_servicer
+
+
 def serve():
-    # Initialize connection pool BEFORE starting server
+    # Initialize connection pool BEFORE starting server; with GRPC_PROCESSES > 1
+    # the 10-100 connections are split across the processes
     print("Initializing database connection pool...")
-    init_connection_pool()
+    init_connection_pool(max(1, 10 // GRPC_PROCESSES), max(2, 100 // GRPC_PROCESSES))
+    raft_servicer = create_raft_node()
 
     # Increase max_workers to match connection pool size
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=100))
+    server = grpc.server(
+        futures.ThreadPoolExecutor(max_workers=GRPC_MAX_WORKERS),
+        interceptors=[RaftLeaderInterceptor(raft_servicer)],
+        options=[('grpc.so_reuseport', 1)]
+    )
 
     library_pb2_grpc.add_AuthServiceServicer_to_server(AuthServiceServicer(), server)
-    library_pb2_grpc.add_SeatServiceServicer_to_server(SeatServiceServicer(), server)
+    add_seat_service_to_server(SeatServiceServicer(), server)
     library_pb2_grpc.add_ReservationServiceServicer_to_server(ReservationServiceServicer(), server)
     library_pb2_grpc.add_NotifyServiceServicer_to_server(NotifyServiceServicer(), server)
-    raft_servicer = RaftNode(
-        node_id=RAFT_NODE_ID,
-        peers=parse_peer_config(RAFT_PEERS_RAW, RAFT_NODE_ID, RAFT_SELF_ADDRESS),
-        self_address=RAFT_SELF_ADDRESS
-    )
-    global RAFT_NODE_INSTANCE
-    RAFT_NODE_INSTANCE = raft_servicer
     library_pb2_grpc.add_OperationServiceServicer_to_server(OperationServiceServicer(raft_servicer), server)
     raft_pb2_grpc.add_RaftServiceServicer_to_server(raft_servicer, server)
 
     server.add_insecure_port('[::]:9090')
 
+    # Worker processes share port 9090 through SO_REUSEPORT and reach the
+    # RaftNode over a unix socket
+    workers = []
+    if GRPC_PROCESSES > 1:
+        server.add_insecure_port(f"unix:{RAFT_LOCAL_SOCKET}")
+        spawn = multiprocessing.get_context('spawn')
+        for index in range(1, GRPC_PROCESSES):
+            worker = spawn.Process(target=serve_worker, args=(index,), daemon=True)
+            worker.start()
+            workers.append(worker)
+
     worker_thread = threading.Thread(target=background_worker, daemon=True)
     worker_thread.start()
-
-    print('gRPC server started on port 9090 with 100-connection pool (10-100 per instance)')
+    start_seats_cache_subscriber()
+
+    def shutdown(signum, frame):
+        # Deploys stop containers with SIGTERM. Handing leadership off first
+        # pauses writes for about one round trip instead of an election timeout.
+        print(f"[Raft] {RAFT_NODE_ID} received signal {signum}, shutting down")
+        for worker in workers:
+            worker.terminate()
+        if raft_servicer.role == 'leader':
+            raft_servicer.transfer_leadership()
+        raft_servicer.stop()
+        server.stop(GRPC_SHUTDOWN_GRACE)
+        for worker in workers:
+            worker.join(GRPC_SHUTDOWN_GRACE)
+
+    signal.signal(signal.SIGTERM, shutdown)
+
+    print(f'gRPC server started on port 9090 with {GRPC_PROCESSES} process(es) x {GRPC_MAX_WORKERS} workers')
     server.start()
     raft_servicer.start()
     server.wait_for_termination()
 
+
+def serve_worker(index):
+    """Entry point of worker process ``index`` (GRPC_PROCESSES > 1).
+
+    Serves the client APIs on the shared port; Raft and operation RPCs that
+    land here are relayed to the Raft process. Without the replicated seat
+    state, availability is read from PostgreSQL.
+    """
+    global RAFT_NODE_INSTANCE
+    init_connection_pool(max(1, 10 // GRPC_PROCESSES), max(2, 100 // GRPC_PROCESSES))
+    channel = grpc.insecure_channel(f"unix:{RAFT_LOCAL_SOCKET}")
+    RAFT_NODE_INSTANCE = RaftProcessClient(channel)
+
+    server = grpc.server(
+        futures.ThreadPoolExecutor(max_workers=GRPC_MAX_WORKERS),
+        interceptors=[RaftLeaderInterceptor(RAFT_NODE_INSTANCE)],
+        options=[('grpc.so_reuseport', 1)]
+    )
+    library_pb2_grpc.add_AuthServiceServicer_to_server(AuthServiceServicer(), server)
+    add_seat_service_to_server(SeatServiceServicer(), server)
+    library_pb2_grpc.add_ReservationServiceServicer_to_server(ReservationServiceServicer(), server)
+    library_pb2_grpc.add_NotifyServiceServicer_to_server(NotifyServiceServicer(), server)
+    server.add_generic_rpc_handlers((LocalRaftProxy(channel, [
+        raft_pb2.DESCRIPTOR.services_by_name['RaftService'],
+        library_pb2.DESCRIPTOR.services_by_name['OperationService'],
+    ]),))
+    server.add_insecure_port('[::]:9090')
+    start_seats_cache_subscriber()
+
+    def shutdown(signum, frame):
+        server.stop(GRPC_SHUTDOWN_GRACE)
+
+    signal.signal(signal.SIGTERM, shutdown)
+
+    print(f"[Worker {index}] gRPC worker process {os.getpid()} started on port 9090")
+    server.start()
+    server.wait_for_termination()
+
 if __name__ == '__main__':
-    serve()
+    if GRPC_SERVER_MODE == 'aio':
+        if GRPC_PROCESSES > 1:
+            print("GRPC_PROCESSES is ignored in aio mode; running a single process")
+        # aio_server imports this module by name; register it so that import
+        # does not load a second copy with its own globals
+        sys.modules['server'] = sys.modules[__name__]
+        import aio_server
+        aio_server.serve()
+    else:
+        serve()
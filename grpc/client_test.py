@@ -1,16 +1,30 @@
 #!/usr/bin/env python3
+import os
 import grpc
 import library_pb2
 import library_pb2_grpc
 from datetime import datetime, timedelta
+from raft_client import LeaderAwareClient
+
+
+def connect():
+    """Go through the load balancer, or route writes to the Raft leader and
+    reads to followers when GRPC_TARGETS lists the individual nodes."""
+    targets = os.getenv('GRPC_TARGETS')
+    if targets:
+        client = LeaderAwareClient(targets.split(','))
+        return client, client.stub
+    channel = grpc.insecure_channel(os.getenv('GRPC_TARGET', 'localhost:9090'))
+    return channel, lambda service: getattr(library_pb2_grpc, f'{service}Stub')(channel)
+
 
 def run_tests():
-    channel = grpc.insecure_channel('localhost:9090')
+    channel, make_stub = connect()
 
-    auth_stub = library_pb2_grpc.AuthServiceStub(channel)
-    seat_stub = library_pb2_grpc.SeatServiceStub(channel)
-    reservation_stub = library_pb2_grpc.ReservationServiceStub(channel)
-    notify_stub = library_pb2_grpc.NotifyServiceStub(channel)
+    auth_stub = make_stub('AuthService')
+    seat_stub = make_stub('SeatService')
+    reservation_stub = make_stub('ReservationService')
+    notify_stub = make_stub('NotifyService')
 
     print("=" * 50)
     print("Testing gRPC Library Management System")
@@ -220,12 +234,12 @@ def run_tests():
 
 
 def test_raft():
-    channel = grpc.insecure_channel('localhost:9090')
+    channel, make_stub = connect()
 
-    auth_stub = library_pb2_grpc.AuthServiceStub(channel)
-    seat_stub = library_pb2_grpc.SeatServiceStub(channel)
-    reservation_stub = library_pb2_grpc.ReservationServiceStub(channel)
-    notify_stub = library_pb2_grpc.NotifyServiceStub(channel)
+    auth_stub = make_stub('AuthService')
+    seat_stub = make_stub('SeatService')
+    reservation_stub = make_stub('ReservationService')
+    notify_stub = make_stub('NotifyService')
     print("\n1. Testing Authentication - Login")
     try:
         login_response = auth_stub.Login(library_pb2.LoginRequest(
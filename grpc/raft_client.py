@@ -0,0 +1,147 @@
+"""
+Leader-aware client for the gRPC cluster.
+
+Every unary response carries the current Raft leader in its trailing metadata
+(``x-raft-leader-id`` / ``x-raft-leader-address``). ``LeaderAwareClient``
+keeps one channel per node, sends writes straight to the leader (skipping the
+follower -> leader forwarding hop) and spreads reads round-robin across the
+followers.
+
+    client = LeaderAwareClient(["grpc-app1:9090", "grpc-app2:9090", "grpc-app3:9090"])
+    seats = client.stub("SeatService").GetSeats(library_pb2.GetSeatsRequest())
+
+Targets may be given as ``node_id@host:port`` when the node id differs from
+the host name (the default compose setup uses the service name for both).
+"""
+
+import itertools
+import threading
+
+import grpc
+
+import library_pb2_grpc
+import raft_pb2_grpc
+
+LEADER_ID_HEADER = 'x-raft-leader-id'
+LEADER_ADDRESS_HEADER = 'x-raft-leader-address'
+
+# Methods that change state; everything else is treated as a read
+WRITE_METHODS = {
+    'Register',
+    'CreateReservation',
+    'CheckIn',
+    'CancelReservation',
+    'AddToWaitlist',
+    'RemoveFromWaitlist',
+    'NotifyUsers',
+    'SubmitOperation',
+}
+
+STUB_CLASSES = {
+    'AuthService': library_pb2_grpc.AuthServiceStub,
+    'SeatService': library_pb2_grpc.SeatServiceStub,
+    'ReservationService': library_pb2_grpc.ReservationServiceStub,
+    'NotifyService': library_pb2_grpc.NotifyServiceStub,
+    'OperationService': library_pb2_grpc.OperationServiceStub,
+    'RaftService': raft_pb2_grpc.RaftServiceStub,
+}
+
+
+def parse_targets(targets):
+    nodes = []
+    for raw in targets:
+        entry = raw.strip()
+        if not entry:
+            continue
+        if '@' in entry:
+            node_id, address = entry.split('@', 1)
+        else:
+            node_id, address = entry.split(':', 1)[0], entry
+        nodes.append((node_id, address))
+    return nodes
+
+
+class LeaderAwareClient:
+    def __init__(self, targets, routed_reads=True):
+        self.nodes = parse_targets(targets)
+        if not self.nodes:
+            raise ValueError('LeaderAwareClient needs at least one target')
+        self.routed_reads = routed_reads
+        self.channels = {node_id: grpc.insecure_channel(address) for node_id, address in self.nodes}
+        self.address_to_id = {address: node_id for node_id, address in self.nodes}
+        self.stubs = {}
+        self.leader_id = None
+        self.lock = threading.Lock()
+        self.read_cycle = itertools.count()
+        self.stats = {'writes': 0, 'writes_to_leader': 0, 'reads': 0, 'retries': 0}
+
+    def close(self):
+        for channel in self.channels.values():
+            channel.close()
+
+    def stub(self, service):
+        """Drop-in replacement for ``library_pb2_grpc.<service>Stub(channel)``."""
+        return _RoutedStub(self, service)
+
+    def _stub_for(self, node_id, service):
+        key = (node_id, service)
+        stub = self.stubs.get(key)
+        if stub is None:
+            stub = self.stubs[key] = STUB_CLASSES[service](self.channels[node_id])
+        return stub
+
+    def _observe(self, metadata):
+        values = dict(metadata or ())
+        leader = values.get(LEADER_ID_HEADER)
+        if leader not in self.channels:
+            leader = self.address_to_id.get(values.get(LEADER_ADDRESS_HEADER))
+        if leader:
+            self.leader_id = leader
+
+    def _candidates(self, write):
+        node_ids = [node_id for node_id, _ in self.nodes]
+        leader = self.leader_id
+        if write or not self.routed_reads:
+            # Leader first (if known), then everyone else as a fallback
+            return ([leader] if leader else []) + [n for n in node_ids if n != leader]
+        followers = [n for n in node_ids if n != leader] or node_ids
+        start = next(self.read_cycle) % len(followers)
+        ordered = followers[start:] + followers[:start]
+        return ordered + ([leader] if leader and leader not in ordered else [])
+
+    def invoke(self, service, method, request, timeout=None, metadata=None):
+        write = method in WRITE_METHODS
+        with self.lock:
+            self.stats['writes' if write else 'reads'] += 1
+            if write and self.leader_id:
+                self.stats['writes_to_leader'] += 1
+        last_error = None
+        for node_id in self._candidates(write):
+            rpc = getattr(self._stub_for(node_id, service), method)
+            try:
+                response, call = rpc.with_call(request, timeout=timeout, metadata=metadata)
+            except grpc.RpcError as e:
+                self._observe(e.trailing_metadata())
+                # Only retry when the request never reached a server;
+                # anything else may already have been applied.
+                if e.code() != grpc.StatusCode.UNAVAILABLE:
+                    raise
+                if node_id == self.leader_id:
+                    self.leader_id = None
+                self.stats['retries'] += 1
+                last_error = e
+                continue
+            self._observe(call.trailing_metadata())
+            return response
+        raise last_error
+
+
+class _RoutedStub:
+    def __init__(self, client, service):
+        self._client = client
+        self._service = service
+
+    def __getattr__(self, method):
+        def call(request, timeout=None, metadata=None):
+            return self._client.invoke(self._service, method, request, timeout=timeout, metadata=metadata)
+        return call
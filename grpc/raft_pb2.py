@@ -2,7 +2,7 @@
 # Generated by the protocol buffer compiler.  DO NOT EDIT!
 # NO CHECKED-IN PROTOBUF GENCODE
 # source: raft.proto
-# Protobuf Python Version: 5.29.3
+# Protobuf Python Version: 5.29.0
 """Generated protocol buffer code."""
 from google.protobuf import descriptor as _descriptor
 from google.protobuf import descriptor_pool as _descriptor_pool
@@ -13,7 +13,7 @@ _runtime_version.ValidateProtobufRuntimeVersion(
     _runtime_version.Domain.PUBLIC,
     5,
     29,
-    3,
+    0,
     '',
     'raft.proto'
 )
@@ -24,31 +24,81 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\nraft.proto\x12\x04raft\"`\n\x0bVoteRequest\x12\x0c\n\x04term\x18\x01 \x01(\x05\x12\x14\n\x0c\x63\x61ndidate_id\x18\x02 \x01(\t\x12\x16\n\x0elast_log_index\x18\x03 \x01(\x05\x12\x15\n\rlast_log_term\x18\x04 \x01(\x05\"2\n\x0cVoteResponse\x12\x0c\n\x04term\x18\x01 \x01(\x05\x12\x14\n\x0cvote_granted\x18\x02 \x01(\x08\":\n\x08LogEntry\x12\r\n\x05index\x18\x01 \x01(\x05\x12\x0c\n\x04term\x18\x02 \x01(\x05\x12\x11\n\toperation\x18\x03 \x01(\t\"\x9e\x01\n\x14\x41ppendEntriesRequest\x12\x0c\n\x04term\x18\x01 \x01(\x05\x12\x11\n\tleader_id\x18\x02 \x01(\t\x12\x16\n\x0eprev_log_index\x18\x03 \x01(\x05\x12\x15\n\rprev_log_term\x18\x04 \x01(\x05\x12\x1f\n\x07\x65ntries\x18\x05 \x03(\x0b\x32\x0e.raft.LogEntry\x12\x15\n\rleader_commit\x18\x06 \x01(\x05\"6\n\x15\x41ppendEntriesResponse\x12\x0c\n\x04term\x18\x01 \x01(\x05\x12\x0f\n\x07success\x18\x02 \x01(\x08\"8\n\x10OperationRequest\x12\x11\n\toperation\x18\x01 \x01(\t\x12\x11\n\tsource_id\x18\x02 \x01(\t\"G\n\x11OperationResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0e\n\x06result\x18\x02 \x01(\t\x12\x11\n\tleader_id\x18\x03 \x01(\t\"!\n\x0eGetLogsRequest\x12\x0f\n\x07node_id\x18\x01 \x01(\t\"\x8d\x01\n\x0fGetLogsResponse\x12\x1f\n\x07\x65ntries\x18\x01 \x03(\x0b\x32\x0e.raft.LogEntry\x12\x14\n\x0c\x63ommit_index\x18\x02 \x01(\x05\x12\x14\n\x0clast_applied\x18\x03 \x01(\x05\x12\x0c\n\x04role\x18\x04 \x01(\t\x12\x0c\n\x04term\x18\x05 \x01(\x05\x12\x11\n\tleader_id\x18\x06 \x01(\t2\x89\x02\n\x0bRaftService\x12\x34\n\x0bRequestVote\x12\x11.raft.VoteRequest\x1a\x12.raft.VoteResponse\x12H\n\rAppendEntries\x12\x1a.raft.AppendEntriesRequest\x1a\x1b.raft.AppendEntriesResponse\x12\x42\n\x0fSubmitOperation\x12\x16.raft.OperationRequest\x1a\x17.raft.OperationResponse\x12\x36\n\x07GetLogs\x12\x14.raft.GetLogsRequest\x1a\x15.raft.GetLogsResponseb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\nraft.proto\x12\x04raft\"\x8f\x01\n\x0bVoteRequest\x12\x0c\n\x04term\x18\x01 \x01(\x05\x12\x14\n\x0c\x63\x61ndidate_id\x18\x02 \x01(\t\x12\x16\n\x0elast_log_index\x18\x03 \x01(\x05\x12\x15\n\rlast_log_term\x18\x04 \x01(\x05\x12\x10\n\x08pre_vote\x18\x05 \x01(\x08\x12\x1b\n\x13leadership_transfer\x18\x06 \x01(\x08\"2\n\x0cVoteResponse\x12\x0c\n\x04term\x18\x01 \x01(\x05\x12\x14\n\x0cvote_granted\x18\x02 \x01(\x08\"p\n\x08LogEntry\x12\r\n\x05index\x18\x01 \x01(\x05\x12\x0c\n\x04term\x18\x02 \x01(\x05\x12\x11\n\toperation\x18\x03 \x01(\t\x12\x0f\n\x07payload\x18\x04 \x01(\x0c\x12#\n\x06\x63onfig\x18\x05 \x01(\x0b\x32\x13.raft.ClusterConfig\":\n\nServerInfo\x12\n\n\x02id\x18\x01 \x01(\t\x12\x0f\n\x07\x61\x64\x64ress\x18\x02 \x01(\t\x12\x0f\n\x07learner\x18\x03 \x01(\x08\"2\n\rClusterConfig\x12!\n\x07servers\x18\x01 \x03(\x0b\x32\x10.raft.ServerInfo\"\x9e\x01\n\x14\x41ppendEntriesRequest\x12\x0c\n\x04term\x18\x01 \x01(\x05\x12\x11\n\tleader_id\x18\x02 \x01(\t\x12\x16\n\x0eprev_log_index\x18\x03 \x01(\x05\x12\x15\n\rprev_log_term\x18\x04 \x01(\x05\x12\x1f\n\x07\x65ntries\x18\x05 \x03(\x0b\x32\x0e.raft.LogEntry\x12\x15\n\rleader_commit\x18\x06 \x01(\x05\"z\n\x15\x41ppendEntriesResponse\x12\x0c\n\x04term\x18\x01 \x01(\x05\x12\x0f\n\x07success\x18\x02 \x01(\x08\x12\x13\n\x0bmatch_index\x18\x03 \x01(\x05\x12\x16\n\x0e\x63onflict_index\x18\x04 \x01(\x05\x12\x15\n\rconflict_term\x18\x05 \x01(\x05\"\xc3\x01\n\x16InstallSnapshotRequest\x12\x0c\n\x04term\x18\x01 \x01(\x05\x12\x11\n\tleader_id\x18\x02 \x01(\t\x12\x1b\n\x13last_included_index\x18\x03 \x01(\x05\x12\x1a\n\x12last_included_term\x18\x04 \x01(\x05\x12\x0e\n\x06offset\x18\x05 \x01(\x03\x12\x0c\n\x04\x64\x61ta\x18\x06 \x01(\x0c\x12\x0c\n\x04\x64one\x18\x07 \x01(\x08\x12#\n\x06\x63onfig\x18\x08 \x01(\x0b\x32\x13.raft.ClusterConfig\"8\n\x17InstallSnapshotResponse\x12\x0c\n\x04term\x18\x01 \x01(\x05\x12\x0f\n\x07success\x18\x02 \x01(\x08\".\n\x19TransferLeadershipRequest\x12\x11\n\ttarget_id\x18\x01 \x01(\t\"Q\n\x1aTransferLeadershipResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x11\n\tleader_id\x18\x02 \x01(\t\x12\x0f\n\x07message\x18\x03 \x01(\t\"4\n\x11TimeoutNowRequest\x12\x0c\n\x04term\x18\x01 \x01(\x05\x12\x11\n\tleader_id\x18\x02 \x01(\t\"3\n\x12TimeoutNowResponse\x12\x0c\n\x04term\x18\x01 \x01(\x05\x12\x0f\n\x07success\x18\x02 \x01(\x08\"G\n\x10\x41\x64\x64ServerRequest\x12\x11\n\tserver_id\x18\x01 \x01(\t\x12\x0f\n\x07\x61\x64\x64ress\x18\x02 \x01(\t\x12\x0f\n\x07learner\x18\x03 \x01(\x08\"(\n\x13RemoveServerRequest\x12\x11\n\tserver_id\x18\x01 \x01(\t\"l\n\x12MembershipResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x11\n\tleader_id\x18\x02 \x01(\t\x12\x0f\n\x07message\x18\x03 \x01(\t\x12!\n\x07servers\x18\x04 \x03(\x0b\x32\x10.raft.ServerInfo\"4\n\x10ReadIndexRequest\x12\x11\n\tsource_id\x18\x01 \x01(\t\x12\r\n\x05local\x18\x02 \x01(\x08\"K\n\x11ReadIndexResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x12\n\nread_index\x18\x02 \x01(\x05\x12\x11\n\tleader_id\x18\x03 \x01(\t\"I\n\x10OperationRequest\x12\x11\n\toperation\x18\x01 \x01(\t\x12\x11\n\tsource_id\x18\x02 \x01(\t\x12\x0f\n\x07payload\x18\x03 \x01(\x0c\"0\n\x0c\x41uthRegister\x12\x12\n\nstudent_id\x18\x01 \x01(\t\x12\x0c\n\x04name\x18\x02 \x01(\t\"[\n\x11ReservationCreate\x12\x0f\n\x07user_id\x18\x01 \x01(\x03\x12\x0f\n\x07seat_id\x18\x02 \x01(\x03\x12\x12\n\nstart_time\x18\x03 \x01(\x03\x12\x10\n\x08\x65nd_time\x18\x04 \x01(\x03\"M\n\x0eReservationRef\x12\x16\n\x0ereservation_id\x18\x01 \x01(\x03\x12\x0f\n\x07seat_id\x18\x02 \x01(\x03\x12\x12\n\nstart_time\x18\x03 \x01(\x03\"\x1f\n\x10ReservationAbort\x12\x0b\n\x03key\x18\x01 \x01(\x03\"#\n\x11ReservationExpire\x12\x0e\n\x06\x62\x65\x66ore\x18\x01 \x01(\x03\"\x86\x01\n\x13ImportedReservation\x12\x0f\n\x07user_id\x18\x01 \x01(\x03\x12\x0f\n\x07seat_id\x18\x02 \x01(\x03\x12\x12\n\nstart_time\x18\x03 \x01(\x03\x12\x10\n\x08\x65nd_time\x18\x04 \x01(\x03\x12\'\n\x06status\x18\x05 \x01(\x0e\x32\x17.raft.ReservationStatus\"i\n\rWaitlistEntry\x12\x0f\n\x07user_id\x18\x01 \x01(\x03\x12\x0f\n\x07seat_id\x18\x02 \x01(\x03\x12\x0e\n\x06\x62ranch\x18\x03 \x01(\t\x12\x14\n\x0c\x64\x65sired_time\x18\x04 \x01(\x03\x12\x10\n\x08notified\x18\x05 \x01(\x08\"|\n\x11ReservationImport\x12\x0f\n\x07horizon\x18\x01 \x01(\x03\x12/\n\x0creservations\x18\x02 \x03(\x0b\x32\x19.raft.ImportedReservation\x12%\n\x08waitlist\x18\x03 \x03(\x0b\x32\x13.raft.WaitlistEntry\"I\n\x0eWaitlistRemove\x12\x13\n\x0bwaitlist_id\x18\x01 \x01(\x03\x12\"\n\x05\x65ntry\x18\x02 \x01(\x0b\x32\x13.raft.WaitlistEntry\"V\n\x0eWaitlistNotify\x12\x0f\n\x07seat_id\x18\x01 \x01(\x03\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\"\n\x05\x65ntry\x18\x03 \x01(\x0b\x32\x13.raft.WaitlistEntry\"\xc6\x04\n\tOperation\x12+\n\rauth_register\x18\x01 \x01(\x0b\x32\x12.raft.AuthRegisterH\x00\x12\x35\n\x12reservation_create\x18\x02 \x01(\x0b\x32\x17.raft.ReservationCreateH\x00\x12\x34\n\x14reservation_check_in\x18\x03 \x01(\x0b\x32\x14.raft.ReservationRefH\x00\x12\x32\n\x12reservation_cancel\x18\x04 \x01(\x0b\x32\x14.raft.ReservationRefH\x00\x12\x33\n\x13reservation_no_show\x18\x05 \x01(\x0b\x32\x14.raft.ReservationRefH\x00\x12\x33\n\x11reservation_abort\x18\x06 \x01(\x0b\x32\x16.raft.ReservationAbortH\x00\x12\x35\n\x12reservation_import\x18\x07 \x01(\x0b\x32\x17.raft.ReservationImportH\x00\x12+\n\x0cwaitlist_add\x18\x08 \x01(\x0b\x32\x13.raft.WaitlistEntryH\x00\x12/\n\x0fwaitlist_remove\x18\t \x01(\x0b\x32\x14.raft.WaitlistRemoveH\x00\x12/\n\x0fwaitlist_notify\x18\n \x01(\x0b\x32\x14.raft.WaitlistNotifyH\x00\x12\x35\n\x12reservation_expire\x18\x0b \x01(\x0b\x32\x17.raft.ReservationExpireH\x00\x42\x04\n\x02op\"G\n\x11OperationResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0e\n\x06result\x18\x02 \x01(\t\x12\x11\n\tleader_id\x18\x03 \x01(\t\"\x0f\n\rStatusRequest\"\xb8\x01\n\x0eStatusResponse\x12\x0f\n\x07node_id\x18\x01 \x01(\t\x12\x0c\n\x04role\x18\x02 \x01(\t\x12\x0c\n\x04term\x18\x03 \x01(\x05\x12\x11\n\tleader_id\x18\x04 \x01(\t\x12\x14\n\x0c\x63ommit_index\x18\x05 \x01(\x05\x12\x14\n\x0clast_applied\x18\x06 \x01(\x05\x12!\n\x07servers\x18\x07 \x03(\x0b\x32\x10.raft.ServerInfo\x12\x17\n\x0ftransfer_target\x18\x08 \x01(\t*2\n\x11ReservationStatus\x12\r\n\tCONFIRMED\x10\x00\x12\x0e\n\nCHECKED_IN\x10\x01\x32\xfe\x05\n\x0bRaftService\x12\x34\n\x0bRequestVote\x12\x11.raft.VoteRequest\x1a\x12.raft.VoteResponse\x12H\n\rAppendEntries\x12\x1a.raft.AppendEntriesRequest\x1a\x1b.raft.AppendEntriesResponse\x12\x42\n\x0fSubmitOperation\x12\x16.raft.OperationRequest\x1a\x17.raft.OperationResponse\x12P\n\x0fInstallSnapshot\x12\x1c.raft.InstallSnapshotRequest\x1a\x1d.raft.InstallSnapshotResponse(\x01\x12<\n\tReadIndex\x12\x16.raft.ReadIndexRequest\x1a\x17.raft.ReadIndexResponse\x12H\n\tReplicate\x12\x1a.raft.AppendEntriesRequest\x1a\x1b.raft.AppendEntriesResponse(\x01\x30\x01\x12W\n\x12TransferLeadership\x12\x1f.raft.TransferLeadershipRequest\x1a .raft.TransferLeadershipResponse\x12?\n\nTimeoutNow\x12\x17.raft.TimeoutNowRequest\x1a\x18.raft.TimeoutNowResponse\x12=\n\tAddServer\x12\x16.raft.AddServerRequest\x1a\x18.raft.MembershipResponse\x12\x43\n\x0cRemoveServer\x12\x19.raft.RemoveServerRequest\x1a\x18.raft.MembershipResponse\x12\x33\n\x06Status\x12\x13.raft.StatusRequest\x1a\x14.raft.StatusResponseb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
 _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'raft_pb2', _globals)
 if not _descriptor._USE_C_DESCRIPTORS:
   DESCRIPTOR._loaded_options = None
-  _globals['_VOTEREQUEST']._serialized_start=20
-  _globals['_VOTEREQUEST']._serialized_end=116
-  _globals['_VOTERESPONSE']._serialized_start=118
-  _globals['_VOTERESPONSE']._serialized_end=168
-  _globals['_LOGENTRY']._serialized_start=170
-  _globals['_LOGENTRY']._serialized_end=228
-  _globals['_APPENDENTRIESREQUEST']._serialized_start=231
-  _globals['_APPENDENTRIESREQUEST']._serialized_end=389
-  _globals['_APPENDENTRIESRESPONSE']._serialized_start=391
-  _globals['_APPENDENTRIESRESPONSE']._serialized_end=445
-  _globals['_OPERATIONREQUEST']._serialized_start=447
-  _globals['_OPERATIONREQUEST']._serialized_end=503
-  _globals['_OPERATIONRESPONSE']._serialized_start=505
-  _globals['_OPERATIONRESPONSE']._serialized_end=576
-  _globals['_GETLOGSREQUEST']._serialized_start=578
-  _globals['_GETLOGSREQUEST']._serialized_end=611
-  _globals['_GETLOGSRESPONSE']._serialized_start=614
-  _globals['_GETLOGSRESPONSE']._serialized_end=755
-  _globals['_RAFTSERVICE']._serialized_start=758
-  _globals['_RAFTSERVICE']._serialized_end=1023
+  _globals['_RESERVATIONSTATUS']._serialized_start=3341
+  _globals['_RESERVATIONSTATUS']._serialized_end=3391
+  _globals['_VOTEREQUEST']._serialized_start=21
+  _globals['_VOTEREQUEST']._serialized_end=164
+  _globals['_VOTERESPONSE']._serialized_start=166
+  _globals['_VOTERESPONSE']._serialized_end=216
+  _globals['_LOGENTRY']._serialized_start=218
+  _globals['_LOGENTRY']._serialized_end=330
+  _globals['_SERVERINFO']._serialized_start=332
+  _globals['_SERVERINFO']._serialized_end=390
+  _globals['_CLUSTERCONFIG']._serialized_start=392
+  _globals['_CLUSTERCONFIG']._serialized_end=442
+  _globals['_APPENDENTRIESREQUEST']._serialized_start=445
+  _globals['_APPENDENTRIESREQUEST']._serialized_end=603
+  _globals['_APPENDENTRIESRESPONSE']._serialized_start=605
+  _globals['_APPENDENTRIESRESPONSE']._serialized_end=727
+  _globals['_INSTALLSNAPSHOTREQUEST']._serialized_start=730
+  _globals['_INSTALLSNAPSHOTREQUEST']._serialized_end=925
+  _globals['_INSTALLSNAPSHOTRESPONSE']._serialized_start=927
+  _globals['_INSTALLSNAPSHOTRESPONSE']._serialized_end=983
+  _globals['_TRANSFERLEADERSHIPREQUEST']._serialized_start=985
+  _globals['_TRANSFERLEADERSHIPREQUEST']._serialized_end=1031
+  _globals['_TRANSFERLEADERSHIPRESPONSE']._serialized_start=1033
+  _globals['_TRANSFERLEADERSHIPRESPONSE']._serialized_end=1114
+  _globals['_TIMEOUTNOWREQUEST']._serialized_start=1116
+  _globals['_TIMEOUTNOWREQUEST']._serialized_end=1168
+  _globals['_TIMEOUTNOWRESPONSE']._serialized_start=1170
+  _globals['_TIMEOUTNOWRESPONSE']._serialized_end=1221
+  _globals['_ADDSERVERREQUEST']._serialized_start=1223
+  _globals['_ADDSERVERREQUEST']._serialized_end=1294
+  _globals['_REMOVESERVERREQUEST']._serialized_start=1296
+  _globals['_REMOVESERVERREQUEST']._serialized_end=1336
+  _globals['_MEMBERSHIPRESPONSE']._serialized_start=1338
+  _globals['_MEMBERSHIPRESPONSE']._serialized_end=1446
+  _globals['_READINDEXREQUEST']._serialized_start=1448
+  _globals['_READINDEXREQUEST']._serialized_end=1500
+  _globals['_READINDEXRESPONSE']._serialized_start=1502
+  _globals['_READINDEXRESPONSE']._serialized_end=1577
+  _globals['_OPERATIONREQUEST']._serialized_start=1579
+  _globals['_OPERATIONREQUEST']._serialized_end=1652
+  _globals['_AUTHREGISTER']._serialized_start=1654
+  _globals['_AUTHREGISTER']._serialized_end=1702
+  _globals['_RESERVATIONCREATE']._serialized_start=1704
+  _globals['_RESERVATIONCREATE']._serialized_end=1795
+  _globals['_RESERVATIONREF']._serialized_start=1797
+  _globals['_RESERVATIONREF']._serialized_end=1874
+  _globals['_RESERVATIONABORT']._serialized_start=1876
+  _globals['_RESERVATIONABORT']._serialized_end=1907
+  _globals['_RESERVATIONEXPIRE']._serialized_start=1909
+  _globals['_RESERVATIONEXPIRE']._serialized_end=1944
+  _globals['_IMPORTEDRESERVATION']._serialized_start=1947
+  _globals['_IMPORTEDRESERVATION']._serialized_end=2081
+  _globals['_WAITLISTENTRY']._serialized_start=2083
+  _globals['_WAITLISTENTRY']._serialized_end=2188
+  _globals['_RESERVATIONIMPORT']._serialized_start=2190
+  _globals['_RESERVATIONIMPORT']._serialized_end=2314
+  _globals['_WAITLISTREMOVE']._serialized_start=2316
+  _globals['_WAITLISTREMOVE']._serialized_end=2389
+  _globals['_WAITLISTNOTIFY']._serialized_start=2391
+  _globals['_WAITLISTNOTIFY']._serialized_end=2477
+  _globals['_OPERATION']._serialized_start=2480
+  _globals['_OPERATION']._serialized_end=3062
+  _globals['_OPERATIONRESPONSE']._serialized_start=3064
+  _globals['_OPERATIONRESPONSE']._serialized_end=3135
+  _globals['_STATUSREQUEST']._serialized_start=3137
+  _globals['_STATUSREQUEST']._serialized_end=3152
+  _globals['_STATUSRESPONSE']._serialized_start=3155
+  _globals['_STATUSRESPONSE']._serialized_end=3339
+  _globals['_RAFTSERVICE']._serialized_start=3394
+  _globals['_RAFTSERVICE']._serialized_end=4160
 # @@protoc_insertion_point(module_scope)
@@ -29,10 +29,45 @@ class RaftServiceStub(object):
                 request_serializer=raft__pb2.OperationRequest.SerializeToString,
                 response_deserializer=raft__pb2.OperationResponse.FromString,
                 _registered_method=True)
-        self.GetLogs = channel.unary_unary(
-                '/raft.RaftService/GetLogs',
-                request_serializer=raft__pb2.GetLogsRequest.SerializeToString,
-                response_deserializer=raft__pb2.GetLogsResponse.FromString,
+        self.InstallSnapshot = channel.stream_unary(
+                '/raft.RaftService/InstallSnapshot',
+                request_serializer=raft__pb2.InstallSnapshotRequest.SerializeToString,
+                response_deserializer=raft__pb2.InstallSnapshotResponse.FromString,
+                _registered_method=True)
+        self.ReadIndex = channel.unary_unary(
+                '/raft.RaftService/ReadIndex',
+                request_serializer=raft__pb2.ReadIndexRequest.SerializeToString,
+                response_deserializer=raft__pb2.ReadIndexResponse.FromString,
+                _registered_method=True)
+        self.Replicate = channel.stream_stream(
+                '/raft.RaftService/Replicate',
+                request_serializer=raft__pb2.AppendEntriesRequest.SerializeToString,
+                response_deserializer=raft__pb2.AppendEntriesResponse.FromString,
+                _registered_method=True)
+        self.TransferLeadership = channel.unary_unary(
+                '/raft.RaftService/TransferLeadership',
+                request_serializer=raft__pb2.TransferLeadershipRequest.SerializeToString,
+                response_deserializer=raft__pb2.TransferLeadershipResponse.FromString,
+                _registered_method=True)
+        self.TimeoutNow = channel.unary_unary(
+                '/raft.RaftService/TimeoutNow',
+                request_serializer=raft__pb2.TimeoutNowRequest.SerializeToString,
+                response_deserializer=raft__pb2.TimeoutNowResponse.FromString,
+                _registered_method=True)
+        self.AddServer = channel.unary_unary(
+                '/raft.RaftService/AddServer',
+                request_serializer=raft__pb2.AddServerRequest.SerializeToString,
+                response_deserializer=raft__pb2.MembershipResponse.FromString,
+                _registered_method=True)
+        self.RemoveServer = channel.unary_unary(
+                '/raft.RaftService/RemoveServer',
+                request_serializer=raft__pb2.RemoveServerRequest.SerializeToString,
+                response_deserializer=raft__pb2.MembershipResponse.FromString,
+                _registered_method=True)
+        self.Status = channel.unary_unary(
+                '/raft.RaftService/Status',
+                request_serializer=raft__pb2.StatusRequest.SerializeToString,
+                response_deserializer=raft__pb2.StatusResponse.FromString,
                 _registered_method=True)
 
 
@@ -57,12 +92,62 @@ class RaftServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
-    def GetLogs(self, request, context):
+    def InstallSnapshot(self, request_iterator, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def ReadIndex(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def Replicate(self, request_iterator, context):
+        """Long-lived leader -> follower channel for heartbeats and entries;
+        responses come back in request order
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def TransferLeadership(self, request, context):
+        """Leadership transfer: ask the leader to hand off to a follower, and the
+        leader's signal to that follower to start an election immediately
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def TimeoutNow(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def AddServer(self, request, context):
+        """Single-server membership changes; a new server is caught up before it
+        joins the configuration and counts toward the majority
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def RemoveServer(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def Status(self, request, context):
+        """This node's view of the cluster; worker processes (GRPC_PROCESSES)
+        poll it for the leader they report to clients
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_RaftServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -81,10 +166,45 @@ def add_RaftServiceServicer_to_server(servicer, server):
                     request_deserializer=raft__pb2.OperationRequest.FromString,
                     response_serializer=raft__pb2.OperationResponse.SerializeToString,
             ),
-            'GetLogs': grpc.unary_unary_rpc_method_handler(
-                    servicer.GetLogs,
-                    request_deserializer=raft__pb2.GetLogsRequest.FromString,
-                    response_serializer=raft__pb2.GetLogsResponse.SerializeToString,
+            'InstallSnapshot': grpc.stream_unary_rpc_method_handler(
+                    servicer.InstallSnapshot,
+                    request_deserializer=raft__pb2.InstallSnapshotRequest.FromString,
+                    response_serializer=raft__pb2.InstallSnapshotResponse.SerializeToString,
+            ),
+            'ReadIndex': grpc.unary_unary_rpc_method_handler(
+                    servicer.ReadIndex,
+                    request_deserializer=raft__pb2.ReadIndexRequest.FromString,
+                    response_serializer=raft__pb2.ReadIndexResponse.SerializeToString,
+            ),
+            'Replicate': grpc.stream_stream_rpc_method_handler(
+                    servicer.Replicate,
+                    request_deserializer=raft__pb2.AppendEntriesRequest.FromString,
+                    response_serializer=raft__pb2.AppendEntriesResponse.SerializeToString,
+            ),
+            'TransferLeadership': grpc.unary_unary_rpc_method_handler(
+                    servicer.TransferLeadership,
+                    request_deserializer=raft__pb2.TransferLeadershipRequest.FromString,
+                    response_serializer=raft__pb2.TransferLeadershipResponse.SerializeToString,
+            ),
+            'TimeoutNow': grpc.unary_unary_rpc_method_handler(
+                    servicer.TimeoutNow,
+                    request_deserializer=raft__pb2.TimeoutNowRequest.FromString,
+                    response_serializer=raft__pb2.TimeoutNowResponse.SerializeToString,
+            ),
+            'AddServer': grpc.unary_unary_rpc_method_handler(
+                    servicer.AddServer,
+                    request_deserializer=raft__pb2.AddServerRequest.FromString,
+                    response_serializer=raft__pb2.MembershipResponse.SerializeToString,
+            ),
+            'RemoveServer': grpc.unary_unary_rpc_method_handler(
+                    servicer.RemoveServer,
+                    request_deserializer=raft__pb2.RemoveServerRequest.FromString,
+                    response_serializer=raft__pb2.MembershipResponse.SerializeToString,
+            ),
+            'Status': grpc.unary_unary_rpc_method_handler(
+                    servicer.Status,
+                    request_deserializer=raft__pb2.StatusRequest.FromString,
+                    response_serializer=raft__pb2.StatusResponse.SerializeToString,
             ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
@@ -179,7 +299,196 @@ class RaftService(object):
             _registered_method=True)
 
     @staticmethod
-    def GetLogs(request,
+    def InstallSnapshot(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_unary(
+            request_iterator,
+            target,
+            '/raft.RaftService/InstallSnapshot',
+            raft__pb2.InstallSnapshotRequest.SerializeToString,
+            raft__pb2.InstallSnapshotResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ReadIndex(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/raft.RaftService/ReadIndex',
+            raft__pb2.ReadIndexRequest.SerializeToString,
+            raft__pb2.ReadIndexResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def Replicate(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(
+            request_iterator,
+            target,
+            '/raft.RaftService/Replicate',
+            raft__pb2.AppendEntriesRequest.SerializeToString,
+            raft__pb2.AppendEntriesResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def TransferLeadership(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/raft.RaftService/TransferLeadership',
+            raft__pb2.TransferLeadershipRequest.SerializeToString,
+            raft__pb2.TransferLeadershipResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def TimeoutNow(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/raft.RaftService/TimeoutNow',
+            raft__pb2.TimeoutNowRequest.SerializeToString,
+            raft__pb2.TimeoutNowResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def AddServer(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/raft.RaftService/AddServer',
+            raft__pb2.AddServerRequest.SerializeToString,
+            raft__pb2.MembershipResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def RemoveServer(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/raft.RaftService/RemoveServer',
+            raft__pb2.RemoveServerRequest.SerializeToString,
+            raft__pb2.MembershipResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def Status(request,
             target,
             options=(),
             channel_credentials=None,
@@ -192,9 +501,9 @@ class RaftService(object):
         return grpc.experimental.unary_unary(
             request,
             target,
-            '/raft.RaftService/GetLogs',
-            raft__pb2.GetLogsRequest.SerializeToString,
-            raft__pb2.GetLogsResponse.FromString,
+            '/raft.RaftService/Status',
+            raft__pb2.StatusRequest.SerializeToString,
+            raft__pb2.StatusResponse.FromString,
             options,
             channel_credentials,
             insecure,
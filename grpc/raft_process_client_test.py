@@ -0,0 +1,85 @@
+"""
+Unit tests for RaftProcessClient in app/server.py, the RAFT_NODE_INSTANCE of
+worker processes (GRPC_PROCESSES > 1). Runs without the cluster:
+
+    python grpc/raft_process_client_test.py
+"""
+
+import os
+import sys
+import time
+import unittest
+from concurrent import futures
+
+import grpc
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "app")))
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379/0")
+
+import raft_pb2  # noqa: E402
+import raft_pb2_grpc  # noqa: E402
+import server  # noqa: E402
+
+
+class StatusOnlyRaft(raft_pb2_grpc.RaftServiceServicer):
+    """Stands in for the Raft process: answers Status only."""
+
+    def __init__(self):
+        self.status = raft_pb2.StatusResponse(
+            node_id="grpc-app1", role="leader", term=3, leader_id="grpc-app1",
+            servers=[raft_pb2.ServerInfo(id="grpc-app1", address="grpc-app1:9090"),
+                     raft_pb2.ServerInfo(id="grpc-app2", address="grpc-app2:9090")],
+        )
+
+    def Status(self, request, context):
+        return self.status
+
+
+class RaftProcessClientTest(unittest.TestCase):
+    def setUp(self):
+        self.raft = StatusOnlyRaft()
+        self.server = grpc.server(futures.ThreadPoolExecutor(max_workers=2))
+        raft_pb2_grpc.add_RaftServiceServicer_to_server(self.raft, self.server)
+        port = self.server.add_insecure_port("127.0.0.1:0")
+        self.server.start()
+        self.channel = grpc.insecure_channel(f"127.0.0.1:{port}")
+        self.poll_interval = server.RAFT_STATUS_POLL_INTERVAL
+        server.RAFT_STATUS_POLL_INTERVAL = 0.05
+
+    def tearDown(self):
+        server.RAFT_STATUS_POLL_INTERVAL = self.poll_interval
+        self.channel.close()
+        self.server.stop(0)
+
+    def wait_until(self, predicate, timeout=5.0):
+        deadline = time.time() + timeout
+        while time.time() < deadline and not predicate():
+            time.sleep(0.02)
+        self.assertTrue(predicate())
+
+    def test_leader_metadata_before_first_status(self):
+        client = server.RaftProcessClient(grpc.insecure_channel("127.0.0.1:1"))
+        self.assertEqual(dict(server.raft_leader_metadata(client)), {server.NODE_ID_HEADER: client.node_id})
+
+    def test_leader_metadata_follows_polled_status(self):
+        client = server.RaftProcessClient(self.channel)
+        self.wait_until(lambda: client.leader_id == "grpc-app1")
+        metadata = dict(server.raft_leader_metadata(client))
+        self.assertEqual(metadata[server.LEADER_ID_HEADER], "grpc-app1")
+        self.assertEqual(metadata[server.LEADER_ADDRESS_HEADER], "grpc-app1:9090")
+
+        # A transfer in the Raft process points workers' clients at the target
+        self.raft.status.transfer_target = "grpc-app2"
+        self.wait_until(lambda: client.transfer_target == "grpc-app2")
+        metadata = dict(server.raft_leader_metadata(client))
+        self.assertEqual(metadata[server.LEADER_ID_HEADER], "grpc-app2")
+        self.assertEqual(metadata[server.LEADER_ADDRESS_HEADER], "grpc-app2:9090")
+
+        self.raft.status.transfer_target = ""
+        self.wait_until(lambda: client.transfer_target is None)
+        self.assertEqual(dict(server.raft_leader_metadata(client))[server.LEADER_ID_HEADER], "grpc-app1")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
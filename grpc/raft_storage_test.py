@@ -0,0 +1,208 @@
+"""
+Unit tests for the Raft write-ahead log in app/raft_storage.py: torn-tail
+recovery, truncate_from, concurrent sync() and a follower acknowledging only
+durable entries (server.RaftNode.AppendEntries). Runs without the cluster:
+
+    python grpc/raft_storage_test.py
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "app")))
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379/0")
+
+import raft_pb2  # noqa: E402
+import raft_storage  # noqa: E402
+import server  # noqa: E402
+from raft_storage import RaftStorage  # noqa: E402
+
+
+def entries(first, last, term=1):
+    return [{"index": i, "term": term, "operation": f"op-{i}", "payload": b""} for i in range(first, last + 1)]
+
+
+class RaftStorageTest(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp(prefix="raft-storage-test-")
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir, ignore_errors=True)
+
+    def reopen(self, storage, **kwargs):
+        storage.close()
+        storage = RaftStorage(self.data_dir, **kwargs)
+        return storage, storage.load()[3]
+
+    def segment_paths(self, storage):
+        return [storage._segment_path(first) for first in storage._list_segments()]
+
+    def test_torn_tail_is_dropped_on_load(self):
+        storage = RaftStorage(self.data_dir)
+        storage.load()
+        storage.append(entries(1, 3))
+        storage.sync()
+        path = self.segment_paths(storage)[-1]
+        intact_size = os.path.getsize(path)
+        # A record header and half a payload, as a crash mid-write leaves it
+        with open(path, "ab") as f:
+            f.write(raft_storage.encode_record(entries(4, 4)[0])[:-3])
+
+        storage, loaded = self.reopen(storage)
+        self.assertEqual([entry["index"] for entry in loaded], [1, 2, 3])
+        self.assertEqual(os.path.getsize(path), intact_size)
+
+        storage.append(entries(4, 5))
+        storage.sync()
+        storage, loaded = self.reopen(storage)
+        self.assertEqual([entry["index"] for entry in loaded], [1, 2, 3, 4, 5])
+        storage.close()
+
+    def test_corrupt_record_drops_it_and_later_segments(self):
+        storage = RaftStorage(self.data_dir, segment_bytes=64)
+        storage.load()
+        storage.append(entries(1, 12))
+        storage.sync()
+        paths = self.segment_paths(storage)
+        self.assertGreater(len(paths), 2)
+        # Flip a payload byte of the first record of the second segment
+        with open(paths[1], "r+b") as f:
+            f.seek(raft_storage.RECORD_HEADER.size)
+            byte = f.read(1)
+            f.seek(raft_storage.RECORD_HEADER.size)
+            f.write(bytes([byte[0] ^ 0xFF]))
+        first_lost = storage._list_segments()[1]
+
+        storage, loaded = self.reopen(storage, segment_bytes=64)
+        self.assertEqual([entry["index"] for entry in loaded], list(range(1, first_lost)))
+        self.assertEqual(len(self.segment_paths(storage)), 2)
+        storage.close()
+
+    def test_truncate_from_drops_suffix_across_segments(self):
+        storage = RaftStorage(self.data_dir, segment_bytes=64)
+        storage.load()
+        storage.append(entries(1, 10))
+        storage.sync()
+        storage.truncate_from(5)
+        self.assertTrue(all(first < 5 for first in storage._list_segments()))
+        # The deposed leader's suffix is replaced by the new leader's entries
+        storage.append(entries(5, 6, term=2))
+        storage.sync()
+
+        storage, loaded = self.reopen(storage, segment_bytes=64)
+        self.assertEqual([(entry["index"], entry["term"]) for entry in loaded],
+                         [(1, 1), (2, 1), (3, 1), (4, 1), (5, 2), (6, 2)])
+        storage.truncate_from(1)
+        storage, loaded = self.reopen(storage, segment_bytes=64)
+        self.assertEqual(loaded, [])
+        storage.close()
+
+    def test_concurrent_sync_waits_for_running_fsync(self):
+        storage = RaftStorage(self.data_dir)
+        storage.load()
+        storage.append(entries(1, 1))
+        in_fsync, release = threading.Event(), threading.Event()
+        fsyncs = []
+        real_fsync = os.fsync
+
+        def slow_fsync(fd):
+            fsyncs.append(fd)
+            if len(fsyncs) == 1:
+                in_fsync.set()
+                release.wait(5)
+            real_fsync(fd)
+
+        finished = []
+
+        def sync(name):
+            storage.sync()
+            finished.append(name)
+
+        with mock.patch.object(raft_storage.os, "fsync", slow_fsync):
+            first = threading.Thread(target=sync, args=("first",))
+            first.start()
+            self.assertTrue(in_fsync.wait(5))
+            # Entry 1 is covered by the running fsync: the second caller must
+            # not return before it completes, and needs no fsync of its own
+            second = threading.Thread(target=sync, args=("second",))
+            second.start()
+            time.sleep(0.2)
+            self.assertEqual(finished, [])
+            release.set()
+            first.join(5)
+            second.join(5)
+            self.assertEqual(sorted(finished), ["first", "second"])
+            self.assertEqual(len(fsyncs), 1)
+
+            # Appended while an fsync runs: the waiter fsyncs again afterwards
+            in_fsync.clear()
+            release.clear()
+            fsyncs.clear()
+            storage.append(entries(2, 2))
+            first = threading.Thread(target=sync, args=("third",))
+            first.start()
+            self.assertTrue(in_fsync.wait(5))
+            storage.append(entries(3, 3))
+            second = threading.Thread(target=sync, args=("fourth",))
+            second.start()
+            time.sleep(0.2)
+            release.set()
+            first.join(5)
+            second.join(5)
+            self.assertEqual(len(fsyncs), 2)
+            self.assertEqual(storage.synced_seq, storage.appended_seq)
+        storage.close()
+
+    def test_duplicate_append_entries_waits_for_running_fsync(self):
+        storage = RaftStorage(self.data_dir)
+        peers = server.parse_peer_config("n0@127.0.0.1:1,n1@127.0.0.1:2", "n1", "127.0.0.1:2")
+        node = server.RaftNode("n1", peers, "127.0.0.1:2", storage=storage)
+
+        def request(first, last):
+            return raft_pb2.AppendEntriesRequest(
+                term=1, leader_id="n0", prev_log_index=first - 1, prev_log_term=1 if first > 1 else 0,
+                entries=[raft_pb2.LogEntry(index=i, term=1, operation=f"op-{i}") for i in range(first, last + 1)],
+            )
+
+        # Take term 1 and open the first segment, so the only fsync left is sync()'s
+        node.AppendEntries(request(1, 1), None)
+        in_fsync, release = threading.Event(), threading.Event()
+        real_fsync = os.fsync
+
+        def slow_fsync(fd):
+            in_fsync.set()
+            release.wait(5)
+            real_fsync(fd)
+
+        responses = {}
+
+        def append(name):
+            responses[name] = node.AppendEntries(request(2, 3), None)
+
+        with mock.patch.object(raft_storage.os, "fsync", slow_fsync):
+            first = threading.Thread(target=append, args=("first",))
+            first.start()
+            self.assertTrue(in_fsync.wait(5))
+            # A resent (or pipelined) copy finds the entries already in the log:
+            # it must not acknowledge them while the first call is fsyncing
+            second = threading.Thread(target=append, args=("second",))
+            second.start()
+            time.sleep(0.2)
+            self.assertEqual(responses, {})
+            release.set()
+            first.join(5)
+            second.join(5)
+        self.assertEqual([(r.success, r.match_index) for r in responses.values()], [(True, 3), (True, 3)])
+        self.assertEqual(node.durable_index, 3)
+        storage.close()
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -6,10 +6,22 @@ Default target is the load balancer at localhost:9090. To hit individual nodes
 inside the Docker network, set RAFT_TARGETS to a comma-separated list such as
 "grpc-app1:9090,grpc-app2:9090,grpc-app3:9090" and run this script from a
 container attached to the same network (e.g. docker-compose --profile grpc run).
+Tests that change the cluster itself are opt-in: RAFT_TRANSFER=1 moves the
+leadership, RAFT_MEMBERSHIP=1 removes and re-adds a member.
+
+The chaos tests either freeze one node with `docker compose pause` (a stand-in
+for a long GC pause) or cut it off the compose network while it keeps running
+(a partition), while a writer keeps submitting, and report write availability.
+They need RAFT_TARGETS covering every node and only run with RAFT_CHAOS=1;
+override RAFT_CHAOS_PAUSE_CMD / RAFT_CHAOS_UNPAUSE_CMD, RAFT_CHAOS_ISOLATE_CMD /
+RAFT_CHAOS_HEAL_CMD and RAFT_CHAOS_STATUS_CMD (with a {node} placeholder) when
+the docker CLI or network name differ.
 """
 
 import os
+import subprocess
 import sys
+import threading
 import time
 import unittest
 from typing import List
@@ -147,8 +159,197 @@ class RaftDockerTest(unittest.TestCase):
             self.assertTrue(resp.success, f"User op {op} via {target} failed: {resp.result}")
             self.assertEqual(resp.leader_id, leader_id)
 
-    
+    @unittest.skipUnless(os.getenv("RAFT_TRANSFER") == "1", "set RAFT_TRANSFER=1 to move the cluster's leadership")
+    def test_transfer_leadership(self):
+        leader_id = self._wait_for_leader()
+        stubs = {target.split(":")[0]: stub for target, stub in self.raft_stubs}
+        if leader_id not in stubs or len(stubs) < 2:
+            self.skipTest("RAFT_TARGETS must list the individual nodes")
+
+        # Keep writing through the followers while the leader hands off
+        followers = [stub for node, stub in stubs.items() if node != leader_id]
+        successes = []
+        stop = threading.Event()
+
+        def writer():
+            attempt = 0
+            while not stop.is_set():
+                attempt += 1
+                try:
+                    resp = followers[attempt % len(followers)].SubmitOperation(
+                        raft_pb2.OperationRequest(operation=f"transfer-{attempt}", source_id="test-client"),
+                        timeout=1.0,
+                    )
+                    if resp.success:
+                        successes.append(time.time())
+                except grpc.RpcError:
+                    pass
+
+        thread = threading.Thread(target=writer, daemon=True)
+        thread.start()
+        time.sleep(1.0)
+        print(f"Node test-client sends RPC TransferLeadership to Node {leader_id}")
+        resp = stubs[leader_id].TransferLeadership(raft_pb2.TransferLeadershipRequest(), timeout=5.0)
+        time.sleep(1.0)
+        stop.set()
+        thread.join()
+
+        self.assertTrue(resp.success, f"Leadership transfer failed: {resp.message}")
+        self.assertNotEqual(resp.leader_id, leader_id)
+        gaps = [b - a for a, b in zip(successes, successes[1:])]
+        longest_gap = max(gaps) if gaps else 0.0
+        print(f"[transfer] {leader_id} -> {resp.leader_id}, longest write gap {longest_gap:.3f}s")
+        # One round trip plus an election round, nowhere near an election timeout
+        self.assertLess(longest_gap, 0.5, "Writes stalled during the leadership transfer")
+
+    @unittest.skipUnless(os.getenv("RAFT_MEMBERSHIP") == "1", "set RAFT_MEMBERSHIP=1 to change cluster membership")
+    def test_membership_remove_and_add_back(self):
+        leader_id = self._wait_for_leader()
+        followers = [t for t, _ in self.raft_stubs if t.split(":")[0] != leader_id]
+        self.assertTrue(followers, "RAFT_TARGETS must list the individual nodes")
+        node_target = followers[-1]
+        node_id = node_target.split(":")[0]
+        _, stub = self.raft_stubs[0]
+
+        print(f"Node test-client sends RPC RemoveServer({node_id})")
+        resp = stub.RemoveServer(raft_pb2.RemoveServerRequest(server_id=node_id), timeout=30.0)
+        self.assertTrue(resp.success, f"RemoveServer failed: {resp.message}")
+        self.assertNotIn(node_id, [server.id for server in resp.servers])
+        self._wait_for_leader()
+
+        # The removed node is still running: it is caught up again and rejoins
+        print(f"Node test-client sends RPC AddServer({node_id})")
+        resp = stub.AddServer(raft_pb2.AddServerRequest(server_id=node_id, address=node_target), timeout=60.0)
+        self.assertTrue(resp.success, f"AddServer failed: {resp.message}")
+        self.assertIn(node_id, [server.id for server in resp.servers])
+        self.assertTrue(self._wait_for_leader())
+
+    def _run_chaos(self, node, fault_seconds, isolate=False, during=None, settle_seconds=3.0):
+        """Pause ``node`` (or cut it off the network with ``isolate``) while
+        writing through the other targets. ``during`` runs just before the fault
+        is healed.
+
+        Returns (success ratio, longest gap between successful writes, leaders seen).
+        """
+        if isolate:
+            start_cmd = os.getenv("RAFT_CHAOS_ISOLATE_CMD",
+                                  "docker network disconnect dlsms_default $(docker compose ps -q {node})")
+            stop_cmd = os.getenv("RAFT_CHAOS_HEAL_CMD",
+                                 "docker network connect --alias {node} dlsms_default $(docker compose ps -q {node})")
+        else:
+            start_cmd = os.getenv("RAFT_CHAOS_PAUSE_CMD", "docker compose pause {node}")
+            stop_cmd = os.getenv("RAFT_CHAOS_UNPAUSE_CMD", "docker compose unpause {node}")
+        stubs = [stub for target, stub in self.raft_stubs if target.split(":")[0] != node]
+        results = []
+        leaders = set()
+        stop = threading.Event()
+
+        def writer():
+            attempt = 0
+            while not stop.is_set():
+                attempt += 1
+                stub = stubs[attempt % len(stubs)]
+                started = time.time()
+                try:
+                    resp = stub.SubmitOperation(
+                        raft_pb2.OperationRequest(operation=f"chaos-{attempt}", source_id="test-client"),
+                        timeout=1.0,
+                    )
+                    ok = resp.success
+                    if ok:
+                        leaders.add(resp.leader_id)
+                except grpc.RpcError:
+                    ok = False
+                results.append((started, ok))
+
+        thread = threading.Thread(target=writer, daemon=True)
+        thread.start()
+        time.sleep(1.0)
+        subprocess.run(start_cmd.format(node=node), shell=True, check=True)
+        try:
+            time.sleep(fault_seconds)
+            if during:
+                during()
+        finally:
+            subprocess.run(stop_cmd.format(node=node), shell=True, check=True)
+        time.sleep(settle_seconds)
+        stop.set()
+        thread.join()
+
+        successes = [t for t, ok in results if ok]
+        self.assertTrue(successes, "No write succeeded during the chaos run")
+        gaps = [b - a for a, b in zip(successes, successes[1:])]
+        ratio = len(successes) / len(results)
+        longest_gap = max(gaps) if gaps else 0.0
+        fault = "isolated" if isolate else "paused"
+        print(f"[chaos] {fault} {node} for {fault_seconds}s: {len(results)} writes, "
+              f"availability {ratio:.3f}, longest write gap {longest_gap:.2f}s, leaders {sorted(leaders)}")
+        return ratio, longest_gap, leaders
+
+    def _node_status(self, node):
+        """(role, term) of ``node``, asked from inside its container so it also
+        works while the node is cut off the network."""
+        status_cmd = os.getenv(
+            "RAFT_CHAOS_STATUS_CMD",
+            "docker compose exec -T {node} python -c \"import grpc, raft_pb2, raft_pb2_grpc; "
+            "s = raft_pb2_grpc.RaftServiceStub(grpc.insecure_channel('localhost:9090'))"
+            ".Status(raft_pb2.StatusRequest(), timeout=2.0); print(s.role, s.term)\"",
+        )
+        out = subprocess.run(status_cmd.format(node=node), shell=True, check=True,
+                             capture_output=True, text=True).stdout.split()
+        return out[-2], int(out[-1])
+
+    @unittest.skipUnless(os.getenv("RAFT_CHAOS") == "1", "set RAFT_CHAOS=1 to pause containers")
+    def test_chaos_follower_pause_keeps_leader(self):
+        leader_id = self._wait_for_leader()
+        followers = [t.split(":")[0] for t, _ in self.raft_stubs if t.split(":")[0] != leader_id]
+        self.assertTrue(followers, "RAFT_TARGETS must list the individual nodes")
+
+        _, longest_gap, leaders = self._run_chaos(followers[0], fault_seconds=5.0)
+        self.assertEqual(leaders, {leader_id}, "A paused follower must not cause a leader change")
+        self.assertLess(longest_gap, 1.5, "Writes stalled while only a follower was paused")
+
+    @unittest.skipUnless(os.getenv("RAFT_CHAOS") == "1", "set RAFT_CHAOS=1 to pause containers")
+    def test_chaos_follower_partition_keeps_leader_and_term(self):
+        leader_id = self._wait_for_leader()
+        followers = [t.split(":")[0] for t, _ in self.raft_stubs if t.split(":")[0] != leader_id]
+        self.assertTrue(followers, "RAFT_TARGETS must list the individual nodes")
+        _, term_before = self._node_status(leader_id)
+
+        # Longer than the election timeout and the node keeps running: without
+        # Pre-Vote it keeps bumping its term and deposes the healthy leader
+        # once it is reachable again.
+        _, longest_gap, leaders = self._run_chaos(followers[0], fault_seconds=4.0, isolate=True)
+        self.assertEqual(leaders, {leader_id}, "A partitioned follower must not cause a leader change")
+        self.assertLess(longest_gap, 1.5, "Writes stalled while only a follower was partitioned")
+        self.assertEqual(self._node_status(leader_id), ("leader", term_before))
+
+    @unittest.skipUnless(os.getenv("RAFT_CHAOS") == "1", "set RAFT_CHAOS=1 to pause containers")
+    def test_chaos_leader_pause_fails_over(self):
+        leader_id = self._wait_for_leader()
+        _, longest_gap, leaders = self._run_chaos(leader_id, fault_seconds=5.0)
+        self.assertTrue(leaders - {leader_id}, "A new leader should be elected while the old one is paused")
+        # One election timeout to notice, one round of Pre-Vote + vote
+        self.assertLess(longest_gap, 4.5, "Failover took longer than expected")
+
+    @unittest.skipUnless(os.getenv("RAFT_CHAOS") == "1", "set RAFT_CHAOS=1 to pause containers")
+    def test_chaos_leader_partition_steps_down(self):
+        leader_id = self._wait_for_leader()
+        _, term_before = self._node_status(leader_id)
+        seen = {}
+
+        def check_old_leader():
+            seen["status"] = self._node_status(leader_id)
 
+        # 4s exceeds the max election timeout (3s): the cut-off leader is still
+        # running and must step down by itself through check-quorum, without
+        # hearing of the new term. With Pre-Vote it does not bump its own term.
+        _, longest_gap, leaders = self._run_chaos(leader_id, fault_seconds=4.0, isolate=True,
+                                                  during=check_old_leader)
+        self.assertEqual(seen["status"], ("follower", term_before),
+                         "The partitioned leader did not step down through check-quorum")
+        self.assertTrue(leaders - {leader_id}, "A new leader should be elected while the old one is partitioned")
+        self.assertLess(longest_gap, 4.5, "Failover took longer than expected")
 
 if __name__ == "__main__":
     unittest.main()
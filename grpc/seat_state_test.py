@@ -0,0 +1,273 @@
+"""
+Unit tests for the replicated seat state in app/seat_state.py: the retention
+horizon (reservation_expire entries) and repairing the state against
+PostgreSQL (server.SeatStateReconciler). Runs without the cluster:
+
+    python grpc/seat_state_test.py
+"""
+
+import json
+import os
+import sys
+import unittest
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "app")))
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379/0")
+
+import operations  # noqa: E402
+import server  # noqa: E402
+from seat_state import SeatStateMachine  # noqa: E402
+
+DAY = datetime(2025, 3, 1)
+
+
+def hours(n):
+    return DAY + timedelta(hours=n)
+
+
+class SeatStateTestCase(unittest.TestCase):
+    def setUp(self):
+        self.index = 0
+        self.entries = []
+        self.state = SeatStateMachine()
+        self.apply(operations.reservation_import(hours(0), [], []))
+
+    def apply(self, payload, state=None):
+        self.index += 1
+        entry = {"index": self.index, "term": 1, "operation": "", "payload": payload}
+        self.entries.append(entry)
+        return json.loads((state or self.state).apply(entry))
+
+    def book(self, seat_id, start, end, user_id=1):
+        return self.apply(operations.reservation_create(user_id, seat_id, hours(start), hours(end)))
+
+    def populate(self):
+        # Seat 1 and 2: four past reservations each; seat 2 also has a future one
+        for seat_id in (1, 2):
+            for start in range(0, 8, 2):
+                self.assertTrue(self.book(seat_id, start, start + 1)["ok"])
+        self.assertTrue(self.book(2, 20, 22)["ok"])
+        self.apply(operations.waitlist_add(7, seat_id=1))
+        self.apply(operations.waitlist_add(8, branch="Main Library"))
+        self.apply(operations.waitlist_notify(1, "free", operations.waitlist_entry(7, seat_id=1)))
+
+
+class SeatStateExpiryTest(SeatStateTestCase):
+    def test_expire_drops_ended_reservations_and_notified_waiters(self):
+        self.populate()
+        before = len(self.state.snapshot())
+        self.assertEqual(self.state.stats()["reservations"], 9)
+        self.assertEqual(self.state.expirable(hours(10)), 9)
+
+        result = self.apply(operations.reservation_expire(hours(10)))
+        self.assertEqual((result["reservations"], result["waitlist"]), (8, 1))
+        self.assertNotIn(1, self.state.seats)
+        self.assertEqual([item[0] for item in self.state.seats[2].items], [hours(20)])
+        self.assertEqual(len(self.state.by_key), 1)
+        self.assertEqual([item[1] for item in self.state.waitlist], [8])
+        self.assertEqual(self.state.stats()["reservations"], 1)
+        self.assertLess(len(self.state.snapshot()), before / 2)
+
+    def test_expire_keeps_reservations_still_running(self):
+        self.book(1, 9, 12)
+        self.apply(operations.reservation_expire(hours(10)))
+        self.assertEqual(len(self.state.seats[1]), 1)
+        self.assertFalse(self.state.is_available(1, hours(11).isoformat(), hours(11.5).isoformat()))
+
+    def test_covers_excludes_ranges_before_retention_horizon(self):
+        self.populate()
+        self.assertTrue(self.state.covers(hours(2).isoformat()))
+        self.apply(operations.reservation_expire(hours(10)))
+        self.assertFalse(self.state.covers(hours(2).isoformat()))
+        self.assertTrue(self.state.covers(hours(10).isoformat()))
+        self.assertTrue(self.state.covers(None))
+
+    def test_older_horizon_is_a_no_op(self):
+        self.populate()
+        self.apply(operations.reservation_expire(hours(5)))
+        remaining = self.state.stats()["reservations"]
+        result = self.apply(operations.reservation_expire(hours(3)))
+        self.assertEqual(result["reservations"], 0)
+        self.assertEqual(self.state.stats()["reservations"], remaining)
+        self.assertEqual(self.state.retention_horizon, hours(5))
+
+    def test_replicas_and_restored_snapshots_agree(self):
+        self.populate()
+        self.apply(operations.reservation_expire(hours(10)))
+        replica = SeatStateMachine()
+        for entry in self.entries:
+            replica.apply(entry)
+        self.assertEqual(replica.snapshot(), self.state.snapshot())
+
+        restored = SeatStateMachine()
+        restored.restore(self.state.snapshot())
+        self.assertEqual(restored.retention_horizon, hours(10))
+        self.assertEqual(restored.snapshot(), self.state.snapshot())
+        self.assertFalse(restored.covers(hours(2).isoformat()))
+
+
+def row(seat_id, start, end, user_id=1):
+    return {"user_id": user_id, "seat_id": seat_id, "start_time": hours(start), "end_time": hours(end)}
+
+
+class SeatStateReconcileTest(SeatStateTestCase):
+    def setUp(self):
+        super().setUp()
+        self.reconciler = server.SeatStateReconciler()
+
+    def reconcile(self, rows, now=hours(1)):
+        payloads = self.reconciler.plan(self.state, rows, now)
+        return [self.apply(payload) for payload in payloads]
+
+    def test_commit_timeout_without_insert_is_released(self):
+        # The client saw "Commit timeout" and never inserted, but the entry
+        # committed: the slot is held with no row behind it
+        self.assertTrue(self.book(1, 2, 4)["ok"])
+        self.assertEqual(self.book(1, 3, 5, user_id=2), {"error": "conflict", "ok": False})
+        self.assertEqual([orphan[:2] for orphan in self.state.diverged([], hours(1))[0]], [(1, hours(2))])
+
+        self.assertEqual(self.reconcile([]), [], "a single pass must not act")
+        self.assertEqual(self.reconcile([]), [{"ok": True}])
+        self.assertEqual(self.state.diverged([], hours(1)), ([], []))
+        self.assertTrue(self.book(1, 3, 5, user_id=2)["ok"])
+
+    def test_write_between_commit_and_insert_is_left_alone(self):
+        self.assertTrue(self.book(1, 2, 4)["ok"])
+        self.assertEqual(self.reconcile([]), [])
+        # The INSERT lands before the next pass
+        self.assertEqual(self.reconcile([row(1, 2, 4)]), [])
+        self.assertEqual(self.reconcile([row(1, 2, 4)]), [])
+        self.assertEqual(len(self.state.seats[1]), 1)
+
+    def test_row_missing_from_state_is_added(self):
+        # e.g. a Cancel that committed while its UPDATE failed, or a REST write
+        rows = [row(3, 2, 4, user_id=9)]
+        self.assertEqual(self.reconcile(rows), [])
+        self.assertTrue(self.reconcile(rows)[0]["ok"])
+        self.assertFalse(self.state.is_available(3, hours(3).isoformat(), hours(5).isoformat()))
+        self.assertEqual(self.state.diverged(rows, hours(1)), ([], []))
+
+    def test_ended_reservations_are_not_compared(self):
+        self.assertTrue(self.book(1, 2, 4)["ok"])
+        self.reconcile([], now=hours(5))
+        self.assertEqual(self.reconcile([], now=hours(5)), [])
+        self.assertEqual(len(self.state.seats[1]), 1)
+
+
+class FakeCursor:
+    """psycopg2 cursor answering SELECTs from ``rows`` (SQL prefix -> row)."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.statements = []
+        self.result = None
+
+    def execute(self, sql, params=()):
+        sql = " ".join(sql.split())
+        self.statements.append(sql)
+        self.result = next((row for prefix, row in self.rows.items() if sql.startswith(prefix)), None)
+
+    def fetchone(self):
+        return self.result
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, cursor):
+        self.cursor_ = cursor
+
+    def cursor(self, cursor_factory=None):
+        return self.cursor_
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+class FakeContext:
+    def __init__(self):
+        self.code = None
+
+    def set_code(self, code):
+        self.code = code
+
+    def set_details(self, details):
+        pass
+
+    def invocation_metadata(self):
+        return ()
+
+    def time_remaining(self):
+        return 5.0
+
+
+class CreateReservationTimeoutTest(SeatStateTestCase):
+    """A Create whose commit outlived its caller must not block the slot."""
+
+    def setUp(self):
+        super().setUp()
+        test = self
+
+        class LateCommitNode:
+            # Applies every entry, but reports the first as timed out
+            timed_out = False
+
+            def SubmitOperation(self, request, context):
+                result = json.dumps(test.apply(request.payload), sort_keys=True)
+                if not self.timed_out:
+                    self.timed_out = True
+                    return server.raft_pb2.OperationResponse(success=False, result="Commit timeout")
+                return server.raft_pb2.OperationResponse(success=True, result=result)
+
+        self.saved = server.RAFT_NODE_INSTANCE, server.get_db_connection, server.return_db_connection, \
+            server.invalidate_seat_cache
+        server.RAFT_NODE_INSTANCE = LateCommitNode()
+        server.return_db_connection = lambda conn: None
+        server.invalidate_seat_cache = lambda seat_id: None
+
+    def tearDown(self):
+        server.RAFT_NODE_INSTANCE, server.get_db_connection, server.return_db_connection, \
+            server.invalidate_seat_cache = self.saved
+
+    def create(self, user_id, start, end, rows):
+        cursor = FakeCursor(rows)
+        server.get_db_connection = lambda: FakeConnection(cursor)
+        context = FakeContext()
+        request = server.library_pb2.CreateReservationRequest(
+            user_id=user_id, seat_id=1, start_time=hours(start).isoformat(), end_time=hours(end).isoformat()
+        )
+        response = server.ReservationServiceServicer().CreateReservation(request, context)
+        return response, context.code, cursor.statements
+
+    def test_slot_of_timed_out_create_goes_to_the_database(self):
+        seat = {"SELECT id FROM seats": {"id": 1}}
+        _, code, statements = self.create(1, 2, 4, seat)
+        self.assertEqual(code, server.grpc.StatusCode.DEADLINE_EXCEEDED)
+        self.assertFalse(any(sql.startswith("INSERT") for sql in statements))
+        self.assertFalse(self.state.is_available(1, hours(3).isoformat(), hours(5).isoformat()))
+
+        inserted = {
+            "id": 7, "user_id": 2, "seat_id": 1, "start_time": hours(3), "end_time": hours(5),
+            "status": "CONFIRMED", "created_at": hours(0), "checked_in_at": None,
+        }
+        response, code, statements = self.create(2, 3, 5, dict(seat, INSERT=inserted))
+        self.assertIsNone(code)
+        self.assertEqual(response.reservation.id, 7)
+        self.assertTrue(any(sql.startswith("SELECT 1 FROM reservations") for sql in statements))
+
+    def test_conflict_backed_by_a_row_is_rejected(self):
+        seat = {"SELECT id FROM seats": {"id": 1}}
+        self.create(1, 2, 4, seat)
+        _, code, statements = self.create(2, 3, 5, dict(seat, **{"SELECT 1 FROM reservations": {"?column?": 1}}))
+        self.assertEqual(code, server.grpc.StatusCode.ALREADY_EXISTS)
+        self.assertFalse(any(sql.startswith("INSERT") for sql in statements))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -1,4 +1,5 @@
 import os
+import json
 import time
 import psycopg2
 import redis
@@ -10,6 +11,11 @@ REDIS_URL = os.getenv('REDIS_URL')
 GRACE_MINUTES = int(os.getenv('GRACE_MINUTES', '15'))
 CHECK_INTERVAL = 60
 
+# Bumped on every seat change; seat list cache keys embed it. The gRPC
+# servers' in-process caches drop their entries on the published message.
+SEATS_GENERATION_KEY = 'seats:generation'
+SEATS_INVALIDATION_CHANNEL = 'seats:invalidations'
+
 redis_client = redis.from_url(REDIS_URL, decode_responses=True)
 
 def get_db_connection():
@@ -17,10 +23,11 @@ def get_db_connection():
 
 def invalidate_seat_cache(seat_id):
     try:
-        redis_client.delete(f"seat:{seat_id}")
-        keys = redis_client.keys(f"seats:*")
-        for key in keys:
-            redis_client.delete(key)
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.delete(f"seat:{seat_id}")
+        pipe.incr(SEATS_GENERATION_KEY)
+        pipe.publish(SEATS_INVALIDATION_CHANNEL, json.dumps([SEATS_GENERATION_KEY]))
+        pipe.execute()
     except Exception as e:
         print(f"Cache invalidation error: {e}")
 
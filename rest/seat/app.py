@@ -1,6 +1,7 @@
 import os
 import json
 import psycopg2
+import numpy as np
 import redis
 from datetime import datetime
 from flask import Flask, request, jsonify
@@ -11,6 +12,12 @@ app = Flask(__name__)
 DATABASE_URL = os.getenv('DATABASE_URL')
 REDIS_URL = os.getenv('REDIS_URL')
 
+# Bumped on every seat change by the reservation service and check-in worker;
+# the gRPC servers bump only the branch/area counters of the changed seat and
+# the :all counter. Seat list cache keys embed both of these.
+SEATS_GENERATION_KEY = 'seats:generation'
+SEATS_ALL_GENERATION_KEY = 'seats:generation:all'
+
 redis_client = redis.from_url(REDIS_URL, decode_responses=True)
 
 def get_db_connection():
@@ -50,6 +57,36 @@ def get_seat_availability(seat_id, start_time=None, end_time=None):
 
         return result['active_count'] == 0
 
+def blocked_seat_ids(cur, start_time=None, end_time=None):
+    """Ids of seats with a reservation overlapping the window (or in progress
+    now without one), in one range query."""
+    if start_time and end_time:
+        cur.execute('''
+            SELECT DISTINCT seat_id
+            FROM reservations
+            WHERE status NOT IN ('CANCELLED', 'NO_SHOW')
+            AND tsrange(start_time, end_time) && tsrange(%s, %s)
+        ''', (start_time, end_time))
+    else:
+        cur.execute('''
+            SELECT DISTINCT seat_id
+            FROM reservations
+            WHERE status IN ('CONFIRMED', 'CHECKED_IN')
+            AND start_time <= NOW()
+            AND end_time > NOW()
+        ''')
+    return [row['seat_id'] for row in cur.fetchall()]
+
+def available_mask(seat_ids, blocked):
+    """True where seat_ids[i] is not blocked, via a bitmap indexed by seat id."""
+    seat_ids = np.asarray(seat_ids, dtype=np.int64)
+    blocked = np.asarray(blocked, dtype=np.int64)
+    if not seat_ids.size:
+        return np.ones(0, dtype=bool)
+    bitmap = np.zeros(int(seat_ids.max()) + 1, dtype=bool)
+    bitmap[blocked[blocked < bitmap.size]] = True
+    return ~bitmap[seat_ids]
+
 @app.route('/healthz', methods=['GET'])
 def health():
     try:
@@ -71,7 +108,8 @@ def get_seats():
         start_time = request.args.get('start_time')
         end_time = request.args.get('end_time')
 
-        cache_key = f"seats:{branch}:{area}:{has_power}:{has_monitor}:{available_only}:{start_time}:{end_time}"
+        generation = '.'.join(g or '0' for g in redis_client.mget(SEATS_GENERATION_KEY, SEATS_ALL_GENERATION_KEY))
+        cache_key = f"seats:{generation}:{branch}:{area}:{has_power}:{has_monitor}:{available_only}:{start_time}:{end_time}"
         cached_result = redis_client.get(cache_key)
 
         if cached_result:
@@ -102,18 +140,14 @@ def get_seats():
         cur = conn.cursor(cursor_factory=RealDictCursor)
         cur.execute(query, params)
         seats = cur.fetchall()
+        blocked = blocked_seat_ids(cur, start_time, end_time)
         cur.close()
         conn.close()
 
+        mask = available_mask([seat['id'] for seat in seats], blocked)
         result_seats = []
-        for seat in seats:
+        for seat, is_available in zip(seats, mask.tolist()):
             seat_dict = dict(seat)
-
-            if start_time and end_time:
-                is_available = get_seat_availability(seat['id'], start_time, end_time)
-            else:
-                is_available = get_seat_availability(seat['id'])
-
             seat_dict['is_available'] = is_available
 
             if not available_only or is_available:
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Benchmark write routing: round-robin (what grpc/nginx.conf does, followers
+forward to the leader) vs. the leader-aware client (grpc/raft_client.py),
+which sends writes straight to the leader using the x-raft-leader-id
+trailing metadata.
+
+Writes are OperationService.SubmitOperation calls, i.e. the Raft commit path
+without database work.
+
+Against the compose cluster (run inside the Docker network, node ports are
+not published):
+    python scripts/bench_grpc_routing.py --targets grpc-app1:9090,grpc-app2:9090,grpc-app3:9090
+Self-contained, with an in-process 3-node cluster on localhost:
+    python scripts/bench_grpc_routing.py --local 3
+"""
+
+import argparse
+import itertools
+import os
+import statistics
+import sys
+import threading
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(ROOT, 'grpc'))
+sys.path.insert(0, os.path.join(ROOT, 'grpc', 'app'))
+
+import grpc  # noqa: E402
+
+import library_pb2  # noqa: E402
+import library_pb2_grpc  # noqa: E402
+from raft_client import LeaderAwareClient  # noqa: E402
+
+
+def start_local_cluster(size, base_port):
+    os.environ.setdefault('REDIS_URL', 'redis://localhost:6379/0')
+    os.environ['RAFT_DATA_DIR'] = ''
+    from concurrent import futures
+    import raft_pb2_grpc
+    import server
+
+    ids = [f"node{i + 1}" for i in range(size)]
+    addresses = {node_id: f"127.0.0.1:{base_port + i}" for i, node_id in enumerate(ids)}
+    raw_peers = ','.join(f"{node_id}@{addresses[node_id]}" for node_id in ids)
+    nodes, servers = [], []
+    for node_id in ids:
+        node = server.RaftNode(node_id, server.parse_peer_config(raw_peers, node_id, addresses[node_id]),
+                               addresses[node_id])
+        srv = grpc.server(futures.ThreadPoolExecutor(max_workers=100),
+                          interceptors=[server.RaftLeaderInterceptor(node)])
+        raft_pb2_grpc.add_RaftServiceServicer_to_server(node, srv)
+        library_pb2_grpc.add_OperationServiceServicer_to_server(server.OperationServiceServicer(node), srv)
+        srv.add_insecure_port(addresses[node_id])
+        srv.start()
+        nodes.append(node)
+        servers.append(srv)
+    for node in nodes:
+        node.start()
+    deadline = time.time() + 15
+    while not any(node.role == 'leader' for node in nodes):
+        if time.time() > deadline:
+            raise RuntimeError('no leader elected')
+        time.sleep(0.05)
+    return [f"{node_id}@{addresses[node_id]}" for node_id in ids], servers
+
+
+class RoundRobin:
+    """One channel per target, cycling per request like the nginx upstream."""
+
+    def __init__(self, targets):
+        addresses = [t.split('@', 1)[-1] for t in targets]
+        self.stubs = [library_pb2_grpc.OperationServiceStub(grpc.insecure_channel(a)) for a in addresses]
+        self.cycle = itertools.cycle(range(len(self.stubs)))
+        self.lock = threading.Lock()
+
+    def submit(self, request):
+        with self.lock:
+            stub = self.stubs[next(self.cycle)]
+        return stub.SubmitOperation(request, timeout=5.0)
+
+
+class LeaderRouted:
+    def __init__(self, targets):
+        self.client = LeaderAwareClient(targets)
+        self.stub = self.client.stub('OperationService')
+
+    def submit(self, request):
+        return self.stub.SubmitOperation(request, timeout=5.0)
+
+
+def run(router, requests, concurrency):
+    latencies = []
+    failures = [0]
+    counter = itertools.count()
+    lock = threading.Lock()
+
+    def worker():
+        while True:
+            i = next(counter)
+            if i >= requests:
+                return
+            request = library_pb2.OperationRequest(operation=f"bench-{i}", source_id='bench')
+            start = time.perf_counter()
+            try:
+                ok = router.submit(request).success
+            except grpc.RpcError:
+                ok = False
+            elapsed = time.perf_counter() - start
+            with lock:
+                if ok:
+                    latencies.append(elapsed)
+                else:
+                    failures[0] += 1
+
+    # Warm up channels and learn the leader
+    for i in range(10):
+        router.submit(library_pb2.OperationRequest(operation=f"warmup-{i}", source_id='bench'))
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+    latencies.sort()
+    pick = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000  # noqa: E731
+    return {
+        'ops_per_sec': len(latencies) / wall,
+        'p50': statistics.median(latencies) * 1000,
+        'p95': pick(0.95),
+        'p99': pick(0.99),
+        'failures': failures[0],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--targets', help='comma-separated node list (id@host:port or host:port)')
+    parser.add_argument('--local', type=int, default=0, help='start an in-process cluster of this size')
+    parser.add_argument('--base-port', type=int, default=51000)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 16])
+    args = parser.parse_args()
+
+    report = sys.stdout
+    if args.local:
+        # Keep the in-process nodes' per-RPC logging out of the results
+        sys.stdout = open(os.devnull, 'w')
+        targets, _servers = start_local_cluster(args.local, args.base_port)
+    elif args.targets:
+        targets = [t for t in args.targets.split(',') if t.strip()]
+    else:
+        parser.error('pass --targets or --local')
+
+    print(f"Write routing benchmark: {args.requests} SubmitOperation calls, {len(targets)} nodes", file=report)
+    print(f"{'router':<14} {'conc':>5} {'ops/sec':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'fail':>5}",
+          file=report)
+    for concurrency in args.concurrency:
+        for label, router in (('round-robin', RoundRobin(targets)), ('leader-aware', LeaderRouted(targets))):
+            result = run(router, args.requests, concurrency)
+            print(f"{label:<14} {concurrency:>5} {result['ops_per_sec']:>9.0f} {result['p50']:>8.2f} "
+                  f"{result['p95']:>8.2f} {result['p99']:>8.2f} {result['failures']:>5}", file=report, flush=True)
+    # The in-process cluster's threads are not daemonic
+    os._exit(0)
+
+
+if __name__ == '__main__':
+    main()
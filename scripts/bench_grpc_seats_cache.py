@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+GetSeats cache-hit cost: the old JSON cache entry (``json.loads`` plus one
+``library_pb2.Seat`` per row and serialization on every hit) vs. the cached
+GetSeatsResponse bytes returned as they are (``add_seat_service_to_server``).
+
+Both variants read the entry from a dict instead of Redis, so the numbers are
+the handler CPU the change removes; the Redis round trip is the same for both.
+Reported per hit (no gRPC) and through a localhost gRPC server with client
+threads at each concurrency.
+
+Usage: python scripts/bench_grpc_seats_cache.py [--seats 60] [--requests 20000] [--concurrency 1 16 64]
+"""
+
+import argparse
+import itertools
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent import futures
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(ROOT, 'grpc'))
+sys.path.insert(0, os.path.join(ROOT, 'grpc', 'app'))
+# server.py builds its (lazily connecting) Redis clients at import
+os.environ.setdefault('REDIS_URL', 'redis://localhost:6379/0')
+
+import grpc  # noqa: E402
+
+import library_pb2  # noqa: E402
+import library_pb2_grpc  # noqa: E402
+import server  # noqa: E402
+
+AREAS = ['Silent Study Zone', 'Group Study Zone', 'Computer Area', 'Quiet Corner']
+
+
+def make_payload(count):
+    """The seat dicts GetSeats caches, shaped like db/seed.sql."""
+    return [{
+        'id': i,
+        'branch': 'Main Library' if i % 3 else 'Science Library',
+        'area': AREAS[i % len(AREAS)],
+        'has_power': i % 2 == 0,
+        'has_monitor': i % 5 == 0,
+        'status': 'AVAILABLE',
+        'is_available': True,
+    } for i in range(1, count + 1)]
+
+
+class JsonCacheSeats(library_pb2_grpc.SeatServiceServicer):
+    def __init__(self, payload):
+        self.entry = json.dumps(payload)
+
+    def GetSeats(self, request, context):
+        return server.seats_response(json.loads(self.entry))
+
+
+class BytesCacheSeats(library_pb2_grpc.SeatServiceServicer):
+    def __init__(self, payload):
+        self.entry = server.seats_response(payload).SerializeToString()
+
+    def GetSeats(self, request, context):
+        return self.entry
+
+
+def per_hit_us(hit, serializer, iterations):
+    started = time.perf_counter()
+    for _ in range(iterations):
+        serializer(hit())
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def run(stub, requests, concurrency):
+    latencies = []
+    counter = itertools.count()
+    lock = threading.Lock()
+    request = library_pb2.GetSeatsRequest(available_only=True)
+
+    def worker():
+        while next(counter) < requests:
+            start = time.perf_counter()
+            stub.GetSeats(request, timeout=5.0)
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+
+    for _ in range(50):
+        stub.GetSeats(request, timeout=5.0)
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+    latencies.sort()
+    return {
+        'rps': len(latencies) / wall,
+        'p50': statistics.median(latencies) * 1000,
+        'p99': latencies[min(len(latencies) - 1, int(0.99 * len(latencies)))] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--seats', type=int, default=60)
+    parser.add_argument('--requests', type=int, default=20000)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 16, 64])
+    parser.add_argument('--base-port', type=int, default=51200)
+    args = parser.parse_args()
+
+    payload = make_payload(args.seats)
+    json_servicer, bytes_servicer = JsonCacheSeats(payload), BytesCacheSeats(payload)
+    print(f"GetSeats cache hit benchmark: {args.seats} seats, "
+          f"{len(json_servicer.entry)} B JSON entry, {len(bytes_servicer.entry)} B protobuf entry")
+
+    hits = {
+        'json': per_hit_us(lambda: json_servicer.GetSeats(None, None),
+                           library_pb2.GetSeatsResponse.SerializeToString, args.requests),
+        'bytes': per_hit_us(lambda: bytes_servicer.GetSeats(None, None),
+                            server.serialize_response, args.requests),
+    }
+    print(f"{'cache':<6} {'handler+serialize us/hit':>25}")
+    for label, micros in hits.items():
+        print(f"{label:<6} {micros:>25.2f}")
+
+    stubs, servers = {}, []
+    for offset, (label, servicer, register) in enumerate((
+        ('json', json_servicer, library_pb2_grpc.add_SeatServiceServicer_to_server),
+        ('bytes', bytes_servicer, server.add_seat_service_to_server),
+    )):
+        grpc_server = grpc.server(futures.ThreadPoolExecutor(max_workers=server.GRPC_MAX_WORKERS))
+        register(servicer, grpc_server)
+        address = f"127.0.0.1:{args.base_port + offset}"
+        grpc_server.add_insecure_port(address)
+        grpc_server.start()
+        servers.append(grpc_server)
+        stubs[label] = library_pb2_grpc.SeatServiceStub(grpc.insecure_channel(address))
+        # Same response either way
+        response = stubs[label].GetSeats(library_pb2.GetSeatsRequest(), timeout=5.0)
+        assert response.count == args.seats
+
+    print(f"{'cache':<6} {'conc':>5} {'req/sec':>9} {'p50 ms':>8} {'p99 ms':>8}")
+    for concurrency in args.concurrency:
+        for label, stub in stubs.items():
+            result = run(stub, args.requests, concurrency)
+            print(f"{label:<6} {concurrency:>5} {result['rps']:>9.0f} {result['p50']:>8.2f} {result['p99']:>8.2f}",
+                  flush=True)
+    os._exit(0)
+
+
+if __name__ == '__main__':
+    main()
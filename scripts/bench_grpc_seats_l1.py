@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+GetSeats hits from Redis vs. from the process-local L1 cache (L1_CACHE).
+
+Starts the real SeatService on localhost against REDIS_URL, seeds the Redis
+entry for the benchmarked request (so no PostgreSQL is needed) and measures
+client throughput and latency with L1 off and on. Then publishes
+invalidations the way another node's write path does, and reports how long
+they take to drop the L1 entry. Use a scratch Redis database.
+
+Usage: REDIS_URL=redis://localhost:6379/15 python scripts/bench_grpc_seats_l1.py [--requests 20000] [--concurrency 1 16 64]
+"""
+
+import argparse
+import itertools
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent import futures
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(ROOT, 'grpc'))
+sys.path.insert(0, os.path.join(ROOT, 'grpc', 'app'))
+os.environ.setdefault('REDIS_URL', 'redis://localhost:6379/15')
+os.environ.setdefault('SEATS_CACHE_STATS_INTERVAL', '3600')
+
+import grpc  # noqa: E402
+
+import library_pb2  # noqa: E402
+import library_pb2_grpc  # noqa: E402
+import server  # noqa: E402
+
+REQUEST = library_pb2.GetSeatsRequest(branch='Main Library', available_only=True)
+
+
+def seed_redis(seats):
+    payload = [{
+        'id': i, 'branch': 'Main Library', 'area': 'Silent Study Zone', 'has_power': i % 2 == 0,
+        'has_monitor': i % 5 == 0, 'status': 'AVAILABLE', 'is_available': True,
+    } for i in range(1, seats + 1)]
+    tag = server.seats_cache_tag(REQUEST.branch, REQUEST.area)
+    cache_key = server.seats_cache_key(REQUEST, server.redis_client.mget(server.SEATS_GENERATION_KEY, tag))
+    server.redis_bytes_client.set(cache_key, server.seats_response(payload).SerializeToString(), ex=600)
+
+
+def run(stub, requests, concurrency):
+    latencies = []
+    counter = itertools.count()
+    lock = threading.Lock()
+
+    def worker():
+        while next(counter) < requests:
+            start = time.perf_counter()
+            stub.GetSeats(REQUEST, timeout=5.0)
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+
+    for _ in range(50):
+        stub.GetSeats(REQUEST, timeout=5.0)
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+    latencies.sort()
+    return {
+        'rps': len(latencies) / wall,
+        'p50': statistics.median(latencies) * 1000,
+        'p99': latencies[min(len(latencies) - 1, int(0.99 * len(latencies)))] * 1000,
+    }
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise RuntimeError('timed out')
+        time.sleep(0.0002)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--seats', type=int, default=60)
+    parser.add_argument('--requests', type=int, default=20000)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 16, 64])
+    parser.add_argument('--port', type=int, default=51300)
+    parser.add_argument('--invalidations', type=int, default=200)
+    args = parser.parse_args()
+
+    seed_redis(args.seats)
+    grpc_server = grpc.server(futures.ThreadPoolExecutor(max_workers=server.GRPC_MAX_WORKERS))
+    server.add_seat_service_to_server(server.SeatServiceServicer(), grpc_server)
+    grpc_server.add_insecure_port(f"127.0.0.1:{args.port}")
+    grpc_server.start()
+    stub = library_pb2_grpc.SeatServiceStub(grpc.insecure_channel(f"127.0.0.1:{args.port}"))
+
+    print(f"GetSeats cache hits, Redis vs. in-process L1: {args.seats} seats, {args.requests} requests")
+    print(f"{'cache':<6} {'conc':>5} {'req/sec':>9} {'p50 ms':>8} {'p99 ms':>8}")
+    results = {}
+    for concurrency in args.concurrency:
+        results['redis', concurrency] = run(stub, args.requests, concurrency)
+    server.start_seats_cache_subscriber()
+    wait_for(lambda: server.L1_CACHE.coherent)
+    for concurrency in args.concurrency:
+        results['l1', concurrency] = run(stub, args.requests, concurrency)
+    for concurrency in args.concurrency:
+        for label in ('redis', 'l1'):
+            result = results[label, concurrency]
+            print(f"{label:<6} {concurrency:>5} {result['rps']:>9.0f} {result['p50']:>8.2f} {result['p99']:>8.2f}")
+
+    # Invalidations published by "another node": time until the entry is gone
+    l1_key = server.seats_cache_key(REQUEST, ())
+    tag = server.seats_cache_tag(REQUEST.branch, REQUEST.area)
+    publisher = server.redis.from_url(server.REDIS_URL)
+    delays = []
+    for _ in range(args.invalidations):
+        stub.GetSeats(REQUEST, timeout=5.0)
+        wait_for(lambda: server.L1_CACHE.get(l1_key) is not None)
+        started = time.perf_counter()
+        publisher.publish(server.SEATS_INVALIDATION_CHANNEL, json.dumps([tag]))
+        wait_for(lambda: server.L1_CACHE.get(l1_key) is None)
+        delays.append(time.perf_counter() - started)
+    delays.sort()
+    print(f"pub/sub invalidation to L1 eviction: p50 {statistics.median(delays) * 1000:.2f} ms, "
+          f"p99 {delays[min(len(delays) - 1, int(0.99 * len(delays)))] * 1000:.2f} ms, "
+          f"max {delays[-1] * 1000:.2f} ms ({args.invalidations} invalidations)")
+    os._exit(0)
+
+
+if __name__ == '__main__':
+    main()
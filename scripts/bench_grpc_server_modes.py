@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Compare GRPC_SERVER_MODE=threads with GRPC_SERVER_MODE=aio on the write path:
+Raft SubmitOperation against the leader of a 3-node cluster, at concurrency
+50/100/200/1000 (the levels of scripts/run_grpc_server_modes.sh).
+
+Each node (in-memory log) runs in a child process, served the way the mode
+serves it: a grpc.server thread pool of GRPC_MAX_WORKERS, or grpc.aio with
+AioRaftService. The load comes from a
+grpc.aio client in this process. No PostgreSQL, Redis or docker needed:
+    python scripts/bench_grpc_server_modes.py [--duration 10] [--concurrency 50 100 200 1000]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(ROOT, 'grpc'))
+sys.path.insert(0, os.path.join(ROOT, 'grpc', 'app'))
+
+import grpc  # noqa: E402
+
+import raft_pb2  # noqa: E402
+import raft_pb2_grpc  # noqa: E402
+
+OPERATION = '{"type":"Reservation.Create","user_id":1024,"seat_id":57,' \
+            '"start_time":"2025-01-01T10:00:00","end_time":"2025-01-01T12:00:00"}'
+
+
+def cluster_addresses(base):
+    return {f"node{i + 1}": f"127.0.0.1:{base + i}" for i in range(3)}
+
+
+def serve_node(mode, base, node_id):
+    os.environ.setdefault('REDIS_URL', 'redis://localhost:6379/0')
+    os.environ['RAFT_DATA_DIR'] = ''
+    from concurrent import futures
+    import server
+
+    sys.stdout = open(os.devnull, 'w')
+    addresses = cluster_addresses(base)
+    address = addresses[node_id]
+    raw = ','.join(f"{peer_id}@{peer_address}" for peer_id, peer_address in addresses.items())
+    node = server.RaftNode(node_id, server.parse_peer_config(raw, node_id, address), address)
+
+    if mode == 'threads':
+        srv = grpc.server(futures.ThreadPoolExecutor(max_workers=server.GRPC_MAX_WORKERS))
+        raft_pb2_grpc.add_RaftServiceServicer_to_server(node, srv)
+        srv.add_insecure_port(address)
+        srv.start()
+        node.start()
+        srv.wait_for_termination()
+        return
+
+    import aio_server
+
+    async def serve():
+        srv = grpc.aio.server(
+            migration_thread_pool=futures.ThreadPoolExecutor(max_workers=aio_server.AIO_RAFT_WORKERS),
+            maximum_concurrent_rpcs=aio_server.AIO_MAX_CONCURRENT_RPCS
+        )
+        raft_pb2_grpc.add_RaftServiceServicer_to_server(aio_server.AioRaftService(node), srv)
+        srv.add_insecure_port(address)
+        await srv.start()
+        node.start()
+        await srv.wait_for_termination()
+
+    asyncio.run(serve())
+
+
+async def find_leader(addresses, timeout=20.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        for address in addresses.values():
+            async with grpc.aio.insecure_channel(address) as channel:
+                try:
+                    status = await raft_pb2_grpc.RaftServiceStub(channel).Status(raft_pb2.StatusRequest(), timeout=1.0)
+                except grpc.RpcError:
+                    continue
+                if status.role == 'leader':
+                    return address
+        await asyncio.sleep(0.2)
+    raise RuntimeError('no leader elected')
+
+
+async def run_load(address, concurrency, duration):
+    latencies, errors = [], [0]
+    async with grpc.aio.insecure_channel(address) as channel:
+        stub = raft_pb2_grpc.RaftServiceStub(channel)
+        request = raft_pb2.OperationRequest(operation=OPERATION, source_id='bench')
+        stop_at = time.perf_counter() + duration
+
+        async def client():
+            while time.perf_counter() < stop_at:
+                sent_at = time.perf_counter()
+                try:
+                    response = await stub.SubmitOperation(request, timeout=5.0)
+                    ok = response.success
+                except grpc.RpcError:
+                    ok = False
+                latencies.append(time.perf_counter() - sent_at)
+                if not ok:
+                    errors[0] += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*[client() for _ in range(concurrency)])
+        wall = time.perf_counter() - started
+    return wall, latencies, errors[0]
+
+
+async def bench_mode(mode, args):
+    addresses = cluster_addresses(args.base)
+    leader = await find_leader(addresses)
+    # Warm up connections and the leader's replication streams
+    await run_load(leader, 10, 1.0)
+    rows = []
+    for concurrency in args.concurrency:
+        wall, latencies, errors = await run_load(leader, concurrency, args.duration)
+        latencies.sort()
+        p99 = latencies[min(len(latencies) - 1, int(0.99 * len(latencies)))]
+        rows.append((mode, concurrency, len(latencies) / wall, statistics.mean(latencies) * 1e3,
+                     statistics.median(latencies) * 1e3, p99 * 1e3, errors))
+        print(f"{mode:<8} {concurrency:>6} {rows[-1][2]:>9.0f} {rows[-1][3]:>8.1f} {rows[-1][4]:>8.1f} "
+              f"{rows[-1][5]:>8.1f} {errors:>7}", flush=True)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--modes', nargs='+', default=['threads', 'aio'])
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[50, 100, 200, 1000])
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds per concurrency level')
+    parser.add_argument('--max-pending', type=int, default=4096,
+                        help='RAFT_MAX_PENDING_COMMITS for the cluster, so load is not shed at c=1000')
+    parser.add_argument('--base', type=int, default=51200)
+    parser.add_argument('--serve', nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve_node(args.serve[0], args.base, args.serve[1])
+        return
+
+    env = dict(os.environ, RAFT_MAX_PENDING_COMMITS=str(args.max_pending))
+    print(f"Raft SubmitOperation through the leader, {args.duration:.0f}s per level, "
+          f"RAFT_MAX_PENDING_COMMITS={args.max_pending}")
+    print(f"{'mode':<8} {'conc':>6} {'req/sec':>9} {'avg ms':>8} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for mode in args.modes:
+        cluster = [
+            subprocess.Popen([sys.executable, __file__, '--serve', mode, node_id, '--base', str(args.base)], env=env)
+            for node_id in cluster_addresses(args.base)
+        ]
+        try:
+            asyncio.run(bench_mode(mode, args))
+        finally:
+            for process in cluster:
+                process.terminate()
+                process.wait()
+        # The next cluster reuses the ports
+        time.sleep(1.0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Compare the JSON operation encoding with the typed ``raft.Operation``
+encoding (grpc/app/operations.py): bytes per log entry / AppendEntries batch,
+and CPU per operation for encoding on the service side, the protobuf round
+trip every replica pays, and decode + apply in the seat state machine.
+
+Usage: python scripts/bench_raft_ops.py [--ops 20000] [--repeat 3]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(ROOT, 'grpc'))
+sys.path.insert(0, os.path.join(ROOT, 'grpc', 'app'))
+
+import operations  # noqa: E402
+import raft_pb2  # noqa: E402
+from seat_state import SeatStateMachine  # noqa: E402
+
+BASE = datetime(2030, 1, 1, 8)
+
+
+def make_requests(count):
+    """(user_id, seat_id, start, end) with a few overlaps, like real traffic."""
+    requests = []
+    for i in range(count):
+        start = BASE + timedelta(hours=(i // 400) % 2000)
+        requests.append((1000 + i % 5000, 1 + i % 400, start.isoformat(), (start + timedelta(hours=2)).isoformat()))
+    return requests
+
+
+def encode_json(kind, args):
+    if kind == 'create':
+        user_id, seat_id, start, end = args
+        return json.dumps({"type": "Reservation.Create", "user_id": user_id, "seat_id": seat_id,
+                           "start_time": start, "end_time": end})
+    reservation_id, seat_id, start = args
+    return json.dumps({"type": "Reservation.CheckIn", "reservation_id": reservation_id, "seat_id": seat_id,
+                       "start_time": start})
+
+
+def encode_typed(kind, args):
+    if kind == 'create':
+        return operations.reservation_create(*args)
+    return operations.reservation_ref('check_in', *args)
+
+
+def entry_for(index, encoded):
+    if isinstance(encoded, bytes):
+        return {'index': index, 'term': 1, 'operation': '', 'payload': encoded}
+    return {'index': index, 'term': 1, 'operation': encoded}
+
+
+def log_entry(entry):
+    return raft_pb2.LogEntry(index=entry['index'], term=1, operation=entry['operation'],
+                             payload=entry.get('payload', b''))
+
+
+def measure(label, encoder, workload):
+    started = time.perf_counter()
+    encoded = [encoder(kind, args) for kind, args in workload]
+    encode_time = time.perf_counter() - started
+    entries = [entry_for(i + 1, op) for i, op in enumerate(encoded)]
+
+    sizes = [log_entry(e).ByteSize() for e in entries]
+    batches = [entries[i:i + 512] for i in range(0, len(entries), 512)]
+    started = time.perf_counter()
+    batch_bytes = 0
+    for batch in batches:
+        wire = raft_pb2.AppendEntriesRequest(term=1, entries=[log_entry(e) for e in batch]).SerializeToString()
+        batch_bytes = max(batch_bytes, len(wire))
+        decoded = raft_pb2.AppendEntriesRequest.FromString(wire)
+        [{'index': e.index, 'term': e.term, 'operation': e.operation, 'payload': e.payload} for e in decoded.entries]
+    wire_time = time.perf_counter() - started
+
+    machine = SeatStateMachine()
+    started = time.perf_counter()
+    for entry in entries:
+        machine.apply(entry)
+    apply_time = time.perf_counter() - started
+
+    count = len(entries)
+    return {
+        'label': label,
+        'entry_bytes': sum(sizes) / count,
+        'batch_bytes': batch_bytes,
+        'encode_us': encode_time / count * 1e6,
+        'wire_us': wire_time / count * 1e6,
+        'apply_us': apply_time / count * 1e6,
+        'snapshot': machine.snapshot(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--ops', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    requests = make_requests(args.ops)
+    # Mostly creates, then check-ins for a slice of them
+    workload = [('create', r) for r in requests]
+    workload += [('check_in', (i + 1, seat_id, start)) for i, (_, seat_id, start, _) in enumerate(requests[::4])]
+
+    print(f"Raft operation encoding benchmark: {len(workload)} operations "
+          f"({len(requests)} Reservation.Create, {len(workload) - len(requests)} Reservation.CheckIn)")
+    print(f"{'encoding':<8} {'bytes/entry':>12} {'512-batch bytes':>16} {'encode us':>10} "
+          f"{'wire us':>8} {'apply us':>9} {'total us':>9}")
+    results = []
+    for label, encoder in (('json', encode_json), ('typed', encode_typed)):
+        # Best of --repeat runs per phase; shared machines are noisy
+        runs = [measure(label, encoder, workload) for _ in range(args.repeat)]
+        best = dict(runs[0])
+        for key in ('encode_us', 'wire_us', 'apply_us'):
+            best[key] = min(run[key] for run in runs)
+        results.append(best)
+    for r in results:
+        total = r['encode_us'] + r['wire_us'] + r['apply_us']
+        print(f"{r['label']:<8} {r['entry_bytes']:>12.1f} {r['batch_bytes']:>16} {r['encode_us']:>10.2f} "
+              f"{r['wire_us']:>8.2f} {r['apply_us']:>9.2f} {total:>9.2f}")
+    print(f"same state machine contents: {results[0]['snapshot'] == results[1]['snapshot']}")
+
+
+if __name__ == '__main__':
+    main()
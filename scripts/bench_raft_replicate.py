@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark the Raft replication transport: unary AppendEntries calls vs.
+the long-lived Replicate bidi stream (grpc/app/raft.proto), for empty
+heartbeats and for small entry batches, one request at a time and with a
+window of outstanding requests.
+
+A follower RaftNode (in-memory log, no election loop) runs in a child process
+so client and server do not share a GIL:
+    python scripts/bench_raft_replicate.py [--messages 5000] [--window 8]
+"""
+
+import argparse
+import collections
+import os
+import queue
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(ROOT, 'grpc'))
+sys.path.insert(0, os.path.join(ROOT, 'grpc', 'app'))
+
+import grpc  # noqa: E402
+
+import raft_pb2  # noqa: E402
+import raft_pb2_grpc  # noqa: E402
+
+
+def serve_follower(port):
+    os.environ.setdefault('REDIS_URL', 'redis://localhost:6379/0')
+    os.environ['RAFT_DATA_DIR'] = ''
+    from concurrent import futures
+    import server
+
+    sys.stdout = open(os.devnull, 'w')
+    node = server.RaftNode('follower', [], f"127.0.0.1:{port}")
+    srv = grpc.server(futures.ThreadPoolExecutor(max_workers=32))
+    raft_pb2_grpc.add_RaftServiceServicer_to_server(node, srv)
+    srv.add_insecure_port(f"127.0.0.1:{port}")
+    srv.start()
+    srv.wait_for_termination()
+
+
+OPERATION = '{"type":"Reservation.Create","user_id":1024,"seat_id":57,' \
+            '"start_time":"2025-01-01T10:00:00","end_time":"2025-01-01T12:00:00"}'
+
+
+class LeaderLog:
+    """AppendEntries requests for term 1.
+
+    Entry batches always cover indexes 1..batch: the follower matches them
+    against its log and answers without appending, so requests that arrive
+    out of order (unary calls with a window) are never rejected and the
+    cases measure transport and decoding cost only.
+    """
+
+    def __init__(self):
+        self.requests = {}
+
+    def next_request(self, batch):
+        request = self.requests.get(batch)
+        if request is None:
+            request = self.requests[batch] = raft_pb2.AppendEntriesRequest(
+                term=1,
+                leader_id='bench',
+                prev_log_index=0,
+                prev_log_term=0,
+                entries=[raft_pb2.LogEntry(index=i + 1, term=1, operation=OPERATION) for i in range(batch)],
+                leader_commit=0,
+            )
+        return request
+
+
+def run_unary(stub, log, messages, batch, window):
+    slots = threading.BoundedSemaphore(window)
+    latencies, rejected = [], [0]
+    done = threading.Event()
+    remaining = [messages]
+    lock = threading.Lock()
+
+    def finished(sent_at, call):
+        elapsed = time.perf_counter() - sent_at
+        slots.release()
+        with lock:
+            try:
+                if not call.result().success:
+                    rejected[0] += 1
+            except grpc.RpcError:
+                rejected[0] += 1
+            latencies.append(elapsed)
+            remaining[0] -= 1
+            if remaining[0] == 0:
+                done.set()
+
+    started = time.perf_counter()
+    for _ in range(messages):
+        slots.acquire()
+        request = log.next_request(batch)
+        sent_at = time.perf_counter()
+        call = stub.AppendEntries.future(request, timeout=5.0)
+        call.add_done_callback(lambda f, sent_at=sent_at: finished(sent_at, f))
+    done.wait()
+    return time.perf_counter() - started, latencies, rejected[0]
+
+
+def run_stream(stub, log, messages, batch, window):
+    slots = threading.BoundedSemaphore(window)
+    requests = queue.Queue()
+    sent = collections.deque()
+    latencies, rejected = [], [0]
+
+    def request_iterator():
+        while True:
+            request = requests.get()
+            if request is None:
+                return
+            yield request
+
+    call = stub.Replicate(request_iterator())
+
+    def read():
+        for response in call:
+            latencies.append(time.perf_counter() - sent.popleft())
+            if not response.success:
+                rejected[0] += 1
+            slots.release()
+            if len(latencies) == messages:
+                requests.put(None)
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    started = time.perf_counter()
+    for _ in range(messages):
+        slots.acquire()
+        request = log.next_request(batch)
+        sent.append(time.perf_counter())
+        requests.put(request)
+    reader.join()
+    return time.perf_counter() - started, latencies, rejected[0]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--messages', type=int, default=5000)
+    parser.add_argument('--window', type=int, default=8)
+    parser.add_argument('--batch', type=int, default=16, help='entries per request in the entries cases')
+    parser.add_argument('--port', type=int, default=51100)
+    parser.add_argument('--serve', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve_follower(args.port)
+        return
+
+    follower = subprocess.Popen([sys.executable, __file__, '--serve', '--port', str(args.port)])
+    try:
+        channel = grpc.insecure_channel(f"127.0.0.1:{args.port}")
+        grpc.channel_ready_future(channel).result(timeout=15)
+        stub = raft_pb2_grpc.RaftServiceStub(channel)
+        log = LeaderLog()
+        # Warm up both paths
+        run_unary(stub, log, 200, 0, 1)
+        run_stream(stub, log, 200, 0, 1)
+
+        print(f"Replication transport benchmark: {args.messages} requests per case, "
+              f"entries cases carry {args.batch} entries")
+        print(f"{'payload':<11} {'transport':<10} {'window':>6} {'req/sec':>9} {'p50 us':>8} {'p99 us':>8} {'rejected':>9}")
+        for payload, batch in (('heartbeat', 0), ('entries', args.batch)):
+            for window in (1, args.window):
+                for transport, runner in (('unary', run_unary), ('stream', run_stream)):
+                    wall, latencies, rejected = runner(stub, log, args.messages, batch, window)
+                    latencies.sort()
+                    p99 = latencies[min(len(latencies) - 1, int(0.99 * len(latencies)))]
+                    print(f"{payload:<11} {transport:<10} {window:>6} {args.messages / wall:>9.0f} "
+                          f"{statistics.median(latencies) * 1e6:>8.0f} {p99 * 1e6:>8.0f} {rejected:>9}", flush=True)
+        channel.close()
+    finally:
+        follower.terminate()
+        follower.wait()
+
+
+if __name__ == '__main__':
+    main()
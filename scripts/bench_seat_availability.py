@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Seat availability over a time window for every seat: a correlated EXISTS per
+seat (the old GetSeats query), one query per seat (the old REST get_seats),
+and the bulk engine in grpc/app/availability.py (one range query for the
+blocked seat ids, then a NumPy bitmap pass).
+
+PostgreSQL is replaced by an in-memory SQLite database with the same tables
+and B-tree indexes, plus an R*Tree over the reservation intervals in place of
+the GiST exclusion index (tsrange overlap written as start < end AND
+end > start). The numbers compare the three access patterns rather than predict PostgreSQL
+timings. The old REST path also opened a new connection per seat; that cost
+is not included. Reports the median wall time of --rounds runs per strategy
+(with the seat list query alone as the floor) and checks that all three
+agree.
+
+Usage: python scripts/bench_seat_availability.py [--seats 10000] [--reservations 100000]
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(ROOT, 'grpc', 'app'))
+
+import availability  # noqa: E402
+
+BRANCHES = ['Main Library', 'Science Library', 'Engineering Library']
+STATUSES = ['CONFIRMED'] * 6 + ['CHECKED_IN', 'COMPLETED', 'CANCELLED', 'NO_SHOW']
+EPOCH = datetime(2025, 3, 1)
+
+SEATS_QUERY = 'SELECT id, branch, area, has_power, has_monitor, status FROM seats ORDER BY id'
+# Candidates from the R*Tree (hours since EPOCH), rechecked on the row
+BLOCKED_QUERY = """
+    SELECT DISTINCT seat_id FROM reservations
+    WHERE id IN (SELECT id FROM reservation_ranges WHERE start_hour < ? AND end_hour > ?)
+    AND status NOT IN ('CANCELLED', 'NO_SHOW')
+    AND start_time < ? AND end_time > ?
+"""
+
+
+def hours(value):
+    return (datetime.fromisoformat(value) - EPOCH).total_seconds() / 3600
+
+
+def build(seats, reservations, days, seed):
+    rng = random.Random(seed)
+    db = sqlite3.connect(':memory:')
+    db.row_factory = sqlite3.Row
+    db.executescript("""
+        CREATE TABLE seats (id INTEGER PRIMARY KEY, branch TEXT, area TEXT,
+                            has_power BOOLEAN, has_monitor BOOLEAN, status TEXT);
+        CREATE TABLE reservations (id INTEGER PRIMARY KEY, seat_id INTEGER, start_time TEXT,
+                                   end_time TEXT, status TEXT);
+    """)
+    db.executemany('INSERT INTO seats VALUES (?, ?, ?, ?, ?, ?)', [
+        (i, BRANCHES[i % 3], f"Area {i % 40}", i % 2 == 0, i % 5 == 0, 'AVAILABLE')
+        for i in range(1, seats + 1)
+    ])
+    # Non-overlapping reservations per seat, 1-3 h each, spread over --days
+    rows, per_seat = [], reservations // seats
+    span = days * 24
+    for seat_id in range(1, seats + 1):
+        slots = sorted(rng.sample(range(0, span - 3, 3), per_seat))
+        for slot in slots:
+            start = EPOCH + timedelta(hours=slot)
+            rows.append((seat_id, start.isoformat(' '), (start + timedelta(hours=rng.randint(1, 3))).isoformat(' '),
+                         rng.choice(STATUSES)))
+    db.executemany('INSERT INTO reservations (seat_id, start_time, end_time, status) VALUES (?, ?, ?, ?)', rows)
+    db.executescript("""
+        CREATE INDEX idx_reservations_seat ON reservations(seat_id);
+        CREATE INDEX idx_reservations_time ON reservations(start_time, end_time);
+        CREATE VIRTUAL TABLE reservation_ranges USING rtree(id, start_hour, end_hour);
+        ANALYZE;
+    """)
+    db.executemany('INSERT INTO reservation_ranges VALUES (?, ?, ?)', [
+        (row['id'], hours(row['start_time']), hours(row['end_time']))
+        for row in db.execute('SELECT id, start_time, end_time FROM reservations')
+    ])
+    return db, len(rows)
+
+
+def seat_list(db, start, end):
+    return [dict(row) for row in db.execute(SEATS_QUERY).fetchall()]
+
+
+def correlated_exists(db, start, end):
+    rows = db.execute("""
+        SELECT s.id, s.branch, s.area, s.has_power, s.has_monitor, s.status,
+            CASE WHEN EXISTS (
+                SELECT 1 FROM reservations r
+                WHERE r.seat_id = s.id
+                AND r.status NOT IN ('CANCELLED', 'NO_SHOW')
+                AND r.start_time < ? AND r.end_time > ?
+            ) THEN 0 ELSE 1 END AS is_available
+        FROM seats s ORDER BY s.id
+    """, (end, start)).fetchall()
+    return [bool(row['is_available']) for row in rows]
+
+
+def query_per_seat(db, start, end):
+    result = []
+    for seat in db.execute(SEATS_QUERY).fetchall():
+        count = db.execute("""
+            SELECT COUNT(*) FROM reservations
+            WHERE seat_id = ?
+            AND status NOT IN ('CANCELLED', 'NO_SHOW')
+            AND start_time < ? AND end_time > ?
+        """, (seat['id'], end, start)).fetchone()[0]
+        result.append(count == 0)
+    return result
+
+
+def bulk_engine(db, start, end):
+    seats = [dict(row) for row in db.execute(SEATS_QUERY).fetchall()]
+    blocked = [row[0] for row in db.execute(BLOCKED_QUERY, (hours(end), hours(start), end, start)).fetchall()]
+    return [seat['is_available'] for seat in availability.mark_available(seats, blocked)]
+
+
+def measure(strategy, db, start, end, rounds):
+    times, result = [], None
+    for _ in range(rounds):
+        started = time.perf_counter()
+        result = strategy(db, start, end)
+        times.append(time.perf_counter() - started)
+    return statistics.median(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--seats', type=int, default=10000)
+    parser.add_argument('--reservations', type=int, default=100000)
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    db, count = build(args.seats, args.reservations, args.days, args.seed)
+    start = EPOCH + timedelta(days=args.days // 2, hours=10)
+    window = (start.isoformat(' '), (start + timedelta(hours=2)).isoformat(' '))
+    print(f"Seat availability: {args.seats} seats, {count} reservations over {args.days} days, "
+          f"window {window[0]} - {window[1]}, median of {args.rounds} runs (SQLite stand-in)")
+    print(f"{'strategy':<18} {'queries':>8} {'ms':>9} {'available':>10}")
+    list_ms = measure(seat_list, db, window[0], window[1], args.rounds)[0] * 1000
+    print(f"{'seat list only':<18} {1:>8} {list_ms:>9.1f} {'-':>10}")
+    baseline = None
+    for label, strategy, queries in (
+        ('correlated EXISTS', correlated_exists, '1'),
+        ('query per seat', query_per_seat, f"{args.seats + 1}"),
+        ('bulk engine', bulk_engine, '2'),
+    ):
+        elapsed, result = measure(strategy, db, window[0], window[1], args.rounds)
+        baseline = baseline or result
+        assert result == baseline, f"{label} disagrees"
+        print(f"{label:<18} {queries:>8} {elapsed * 1000:>9.1f} {sum(result):>10}", flush=True)
+
+    # The NumPy pass alone, on the rows as fetched
+    seats = [dict(row) for row in db.execute(SEATS_QUERY).fetchall()]
+    blocked = [row[0] for row in db.execute(
+        BLOCKED_QUERY, (hours(window[1]), hours(window[0]), window[1], window[0])
+    ).fetchall()]
+    started = time.perf_counter()
+    for _ in range(100):
+        availability.mark_available(seats, blocked)
+    print(f"mark_available on {len(seats)} seats / {len(blocked)} blocked: "
+          f"{(time.perf_counter() - started) * 10:.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Seat cache invalidation against a real Redis: the old scheme (KEYS seats:*
+then one DEL round trip per key) vs. the generation counter (one INCR, cache
+keys embed the generation).
+
+Each round caches --keys filter combinations and then runs --invalidations
+back-to-back invalidations, as a no-show sweep does. A probe thread on its own
+connection GETs a hot key meanwhile, which is the latency every other client
+sees. Keys live under a private prefix and are removed afterwards.
+
+Usage: REDIS_URL=redis://localhost:6379/0 python scripts/bench_seat_cache_invalidation.py [--keys 100000]
+"""
+
+import argparse
+import os
+import statistics
+import threading
+import time
+
+import redis
+
+PREFIX = 'bench-invalidation'
+GENERATION_KEY = f"{PREFIX}:generation"
+
+
+def populate(client, count, generation, value):
+    pipe = client.pipeline(transaction=False)
+    for i in range(count):
+        pipe.set(f"{PREFIX}:seats:{generation}:{i}", value, ex=300)
+        if i % 5000 == 4999:
+            pipe.execute()
+    pipe.execute()
+
+
+def invalidate_keys(client):
+    # The old invalidate_seat_cache
+    client.delete(f"{PREFIX}:seat:1")
+    for key in client.keys(f"{PREFIX}:seats:*"):
+        client.delete(key)
+
+
+def invalidate_generation(client):
+    pipe = client.pipeline(transaction=False)
+    pipe.delete(f"{PREFIX}:seat:1")
+    pipe.incr(GENERATION_KEY)
+    pipe.execute()
+
+
+class Probe(threading.Thread):
+    def __init__(self, url):
+        super().__init__(daemon=True)
+        self.client = redis.from_url(url)
+        self.client.set(f"{PREFIX}:hot", b'x' * 64)
+        self.recording = threading.Event()
+        self.done = threading.Event()
+        self.latencies = []
+
+    def run(self):
+        while not self.done.is_set():
+            start = time.perf_counter()
+            self.client.get(f"{PREFIX}:hot")
+            elapsed = time.perf_counter() - start
+            if self.recording.is_set():
+                self.latencies.append(elapsed)
+            time.sleep(0.001)
+
+
+def measure(url, label, invalidate, args):
+    client = redis.from_url(url)
+    value = b'\x08' * args.value_bytes
+    probe = Probe(url)
+    probe.start()
+    elapsed = []
+    for _ in range(args.rounds):
+        generation = int(client.get(GENERATION_KEY) or 0)
+        populate(client, args.keys, generation, value)
+        probe.recording.set()
+        started = time.perf_counter()
+        for _ in range(args.invalidations):
+            invalidate(client)
+        elapsed.append(time.perf_counter() - started)
+        probe.recording.clear()
+        cleanup(client)
+    probe.done.set()
+    probe.join()
+    latencies = sorted(probe.latencies) or [0.0]
+    return {
+        'label': label,
+        'storm_s': statistics.mean(elapsed),
+        'per_invalidation_ms': statistics.mean(elapsed) / args.invalidations * 1000,
+        'probes': len(probe.latencies),
+        'p50': statistics.median(latencies) * 1000,
+        'p99': latencies[min(len(latencies) - 1, int(0.99 * len(latencies)))] * 1000,
+        'max': latencies[-1] * 1000,
+    }
+
+
+def cleanup(client):
+    pipe = client.pipeline(transaction=False)
+    for key in client.scan_iter(f"{PREFIX}:*", count=5000):
+        pipe.delete(key)
+    pipe.execute()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--url', default=os.getenv('REDIS_URL', 'redis://localhost:6379/0'))
+    parser.add_argument('--keys', type=int, default=100000, help='cached filter combinations')
+    parser.add_argument('--invalidations', type=int, default=50, help='invalidations per storm')
+    parser.add_argument('--rounds', type=int, default=3)
+    parser.add_argument('--value-bytes', type=int, default=512)
+    args = parser.parse_args()
+
+    print(f"Seat cache invalidation storm: {args.keys} cached keys, {args.invalidations} invalidations "
+          f"x {args.rounds} rounds, {args.value_bytes} B values")
+    print(f"{'scheme':<11} {'storm s':>8} {'ms/inval':>9} {'probes':>7} {'GET p50 ms':>11} "
+          f"{'GET p99 ms':>11} {'GET max ms':>11}")
+    for label, invalidate in (('keys+del', invalidate_keys), ('generation', invalidate_generation)):
+        result = measure(args.url, label, invalidate, args)
+        print(f"{result['label']:<11} {result['storm_s']:>8.3f} {result['per_invalidation_ms']:>9.3f} "
+              f"{result['probes']:>7} {result['p50']:>11.3f} {result['p99']:>11.3f} {result['max']:>11.3f}",
+              flush=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+GetSeats cache hit ratio under a mixed read/write load: one global generation
+(every seat change invalidates every seat list) vs. branch/area tags
+(server.invalidate_seat_cache bumps only the changed seat's scopes).
+
+Reads follow the GetSeats cache path with the server's own key functions
+against a real Redis (MGET the generations, GET the entry, SETEX on a miss);
+the database query is replaced by a fixed payload. Seats are laid out like
+db/seed.sql. The Redis database should be a scratch one: seat cache keys in
+it are removed afterwards.
+
+Usage: REDIS_URL=redis://localhost:6379/15 python scripts/bench_seat_cache_tags.py [--ops 20000] [--write-ratio 0.01 0.05 0.1]
+"""
+
+import argparse
+import os
+import random
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(ROOT, 'grpc'))
+sys.path.insert(0, os.path.join(ROOT, 'grpc', 'app'))
+os.environ.setdefault('REDIS_URL', 'redis://localhost:6379/15')
+
+import library_pb2  # noqa: E402
+import server  # noqa: E402
+
+LAYOUT = {
+    'Main Library': ['Silent Study Zone', 'Group Study Zone', 'Computer Area'],
+    'Science Library': ['Quiet Study', 'Lab Area'],
+    'Engineering Library': ['Open Area', 'Project Rooms'],
+}
+SEATS_PER_AREA = 9
+
+
+def seat_layout():
+    seats = {}
+    for branch, areas in LAYOUT.items():
+        for area in areas:
+            for _ in range(SEATS_PER_AREA):
+                seats[len(seats) + 1] = (branch, area)
+    return seats
+
+
+def random_request(rng):
+    branch = rng.choice([''] + list(LAYOUT))
+    area = rng.choice([''] + LAYOUT[branch]) if branch else ''
+    request = library_pb2.GetSeatsRequest(branch=branch, area=area, available_only=rng.random() < 0.7)
+    if rng.random() < 0.5:
+        request.has_power = rng.random() < 0.5
+    return request
+
+
+def invalidate_global(seat_id):
+    # One generation for every seat list
+    pipe = server.redis_client.pipeline(transaction=False)
+    pipe.delete(f"seat:{seat_id}")
+    pipe.incr(server.SEATS_GENERATION_KEY)
+    pipe.execute()
+
+
+def run(invalidate, ops, write_ratio, seed):
+    rng = random.Random(seed)
+    seat_ids = list(server.SEAT_LOCATIONS)
+    payload = b'\x0a' * 3000
+    hits = misses = writes = 0
+    for _ in range(ops):
+        if rng.random() < write_ratio:
+            invalidate(rng.choice(seat_ids))
+            writes += 1
+            continue
+        request = random_request(rng)
+        cache_key = server.seats_cache_key(request, server.redis_client.mget(
+            server.SEATS_GENERATION_KEY, server.seats_cache_tag(request.branch, request.area)
+        ))
+        if server.redis_bytes_client.get(cache_key):
+            hits += 1
+        else:
+            misses += 1
+            server.redis_bytes_client.set(cache_key, payload, ex=30)
+    return hits, misses, writes
+
+
+def cleanup():
+    pipe = server.redis_client.pipeline(transaction=False)
+    for key in server.redis_client.scan_iter('seats:*', count=5000):
+        pipe.delete(key)
+    pipe.execute()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--ops', type=int, default=20000)
+    parser.add_argument('--write-ratio', type=float, nargs='+', default=[0.01, 0.05, 0.1])
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    server.SEAT_LOCATIONS.update(seat_layout())
+    print(f"GetSeats cache hit ratio: {args.ops} ops, {len(server.SEAT_LOCATIONS)} seats in "
+          f"{sum(len(areas) for areas in LAYOUT.values())} areas of {len(LAYOUT)} branches")
+    print(f"{'writes':>7} {'scheme':<8} {'hits':>7} {'misses':>7} {'hit ratio':>10}")
+    for write_ratio in args.write_ratio:
+        for label, invalidate in (('global', invalidate_global), ('tagged', server.invalidate_seat_cache)):
+            cleanup()
+            hits, misses, _ = run(invalidate, args.ops, write_ratio, args.seed)
+            print(f"{write_ratio:>7.0%} {label:<8} {hits:>7} {misses:>7} {hits / (hits + misses):>10.3f}", flush=True)
+    cleanup()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+GetSeats cache stampede: the old miss path (Redis SET NX lock, losers poll
+every 100 ms for up to 5 s) vs. server.SingleFlight with stale-while-
+revalidate entries (pack_seats_entry / seats_entry_needs_refresh).
+
+The seat query is simulated with a sleep of --load-ms; Redis is real. Two
+scenarios, each with --threads concurrent readers of one key:
+  cold     all readers miss at once
+  expiry   readers run for --seconds while the entry's TTL (--ttl) runs out
+           repeatedly
+Reported: queries run, reader latency, and thread-seconds spent waiting.
+Use a scratch Redis database.
+
+Usage: REDIS_URL=redis://localhost:6379/15 python scripts/bench_seats_stampede.py [--threads 100] [--load-ms 200]
+"""
+
+import argparse
+import math
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent import futures
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(ROOT, 'grpc'))
+sys.path.insert(0, os.path.join(ROOT, 'grpc', 'app'))
+os.environ.setdefault('REDIS_URL', 'redis://localhost:6379/15')
+
+import server  # noqa: E402
+
+KEY = 'bench-stampede:seats'
+PAYLOAD = b'\x0a' * 3000
+
+
+class Query:
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def __call__(self):
+        with self.lock:
+            self.count += 1
+        time.sleep(self.seconds)
+        return PAYLOAD
+
+
+def old_get(query, ttl):
+    # The previous GetSeats miss path
+    redis_client, lock_key = server.redis_client, f"{KEY}:lock"
+    cached = server.redis_bytes_client.get(KEY)
+    if cached:
+        return cached
+    acquired = redis_client.set(lock_key, "1", nx=True, ex=10)
+    if not acquired:
+        for _ in range(50):
+            time.sleep(0.1)
+            cached = server.redis_bytes_client.get(KEY)
+            if cached:
+                return cached
+        acquired = redis_client.set(lock_key, "1", nx=True, ex=10)
+    payload = query()
+    if acquired:
+        server.redis_bytes_client.set(KEY, payload, ex=ttl)
+        redis_client.delete(lock_key)
+    return payload
+
+
+def new_get(query, ttl, loads, executor):
+    def load():
+        started = time.monotonic()
+        payload = query()
+        server.redis_bytes_client.set(KEY, server.pack_seats_entry(payload, time.monotonic() - started),
+                                      ex=math.ceil(ttl + server.SEATS_CACHE_STALE_TTL))
+        return payload
+
+    entry = server.redis_bytes_client.get(KEY)
+    if entry:
+        payload, refresh_at, load_seconds = server.unpack_seats_entry(entry)
+        if server.seats_entry_needs_refresh(refresh_at, load_seconds):
+            loads.do_background(KEY, load, executor)
+        return payload
+    return loads.do(KEY, load, 10.0)
+
+
+def run(get, threads, seconds):
+    latencies = []
+    lock = threading.Lock()
+    stop_at = time.monotonic() + seconds
+
+    def reader():
+        while True:
+            start = time.perf_counter()
+            get()
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+            if time.monotonic() >= stop_at:
+                return
+            time.sleep(0.01)
+
+    workers = [threading.Thread(target=reader) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'p50': statistics.median(latencies) * 1000,
+        'p99': latencies[min(len(latencies) - 1, int(0.99 * len(latencies)))] * 1000,
+        'max': latencies[-1] * 1000,
+        'busy': sum(latencies),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--threads', type=int, default=100)
+    parser.add_argument('--load-ms', type=float, default=200)
+    parser.add_argument('--ttl', type=int, default=1, help='entry TTL (s) in the expiry scenario')
+    parser.add_argument('--seconds', type=float, default=5.0)
+    args = parser.parse_args()
+
+    server.SEATS_CACHE_TTL = args.ttl
+    print(f"GetSeats stampede: {args.threads} readers, {args.load_ms:.0f} ms query, "
+          f"expiry scenario {args.seconds:.0f} s with {args.ttl} s TTL")
+    print(f"{'scenario':<8} {'scheme':<13} {'queries':>7} {'requests':>8} {'p50 ms':>8} {'p99 ms':>8} "
+          f"{'max ms':>8} {'wait thread-s':>13}")
+    for scenario, seconds in (('cold', 0), ('expiry', args.seconds)):
+        for label in ('lock+poll', 'single-flight'):
+            server.redis_client.delete(KEY, f"{KEY}:lock")
+            query = Query(args.load_ms / 1000)
+            if label == 'lock+poll':
+                def get():
+                    return old_get(query, args.ttl)
+            else:
+                loads, executor = server.SingleFlight(), futures.ThreadPoolExecutor(max_workers=4)
+
+                def get():
+                    return new_get(query, args.ttl, loads, executor)
+            result = run(get, args.threads, seconds)
+            print(f"{scenario:<8} {label:<13} {query.count:>7} {result['requests']:>8} {result['p50']:>8.1f} "
+                  f"{result['p99']:>8.1f} {result['max']:>8.1f} {result['busy']:>13.1f}", flush=True)
+    server.redis_client.delete(KEY, f"{KEY}:lock")
+
+
+if __name__ == '__main__':
+    main()
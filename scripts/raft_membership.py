@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Change the gRPC Raft cluster's membership without restarting it.
+
+Start the new node with RAFT_JOIN=true (it waits outside the configuration,
+RAFT_PEERS only tells it where the cluster is), then add it through any
+member; followers forward to the leader:
+    python scripts/raft_membership.py --target grpc-app1:9090 add grpc-app6 grpc-app6:9090
+    python scripts/raft_membership.py --target grpc-app1:9090 remove grpc-app6
+Add --learner to add a non-voting replica (it receives the log but never votes
+or counts toward the majority); adding an existing learner without --learner
+catches it up and promotes it to a voter.
+One change at a time: each call returns once the new configuration is committed.
+`status` prints the target's view of the cluster:
+    python scripts/raft_membership.py --target grpc-app1:9090 status
+"""
+
+import argparse
+import os
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(ROOT, 'grpc'))
+
+import grpc  # noqa: E402
+
+import raft_pb2  # noqa: E402
+import raft_pb2_grpc  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--target', default='localhost:9090', help='any cluster member (host:port)')
+    parser.add_argument('--timeout', type=float, default=60.0)
+    commands = parser.add_subparsers(dest='command', required=True)
+    add = commands.add_parser('add', help='catch up a server and add it as a voting member')
+    add.add_argument('server_id')
+    add.add_argument('address')
+    add.add_argument('--learner', action='store_true', help='add as a non-voting learner')
+    remove = commands.add_parser('remove', help='remove a member (the leader hands off first)')
+    remove.add_argument('server_id')
+    commands.add_parser('status', help="show the target's role, term, leader and log indexes")
+    args = parser.parse_args()
+
+    stub = raft_pb2_grpc.RaftServiceStub(grpc.insecure_channel(args.target))
+    if args.command == 'status':
+        status = stub.Status(raft_pb2.StatusRequest(), timeout=args.timeout)
+        print(f"{status.node_id}: {status.role} term={status.term} "
+              f"commit={status.commit_index} applied={status.last_applied}")
+        print(f"leader: {status.leader_id or 'unknown'}")
+        print("members: " + ", ".join(
+            f"{server.id}@{server.address}{' (learner)' if server.learner else ''}" for server in status.servers
+        ))
+        return
+    if args.command == 'add':
+        response = stub.AddServer(
+            raft_pb2.AddServerRequest(server_id=args.server_id, address=args.address, learner=args.learner),
+            timeout=args.timeout
+        )
+    else:
+        response = stub.RemoveServer(raft_pb2.RemoveServerRequest(server_id=args.server_id), timeout=args.timeout)
+
+    print(f"{args.command} {args.server_id}: {'ok' if response.success else 'failed'} ({response.message})")
+    print(f"leader: {response.leader_id or 'unknown'}")
+    print("members: " + ", ".join(f"{server.id}@{server.address}" for server in response.servers))
+    sys.exit(0 if response.success else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env bash
+
+# Compare the threaded gRPC server with the asyncio one (GRPC_SERVER_MODE).
+# For each mode the gRPC stack is rebuilt and restarted, then ghz drives
+# GetSeats through nginx at concurrency 50/100/200/1000.
+# Usage:
+#   ./scripts/run_grpc_server_modes.sh                 # both modes
+#   MODES=aio CONCURRENCY="200 1000" ./scripts/run_grpc_server_modes.sh
+# Raw output: bench/results/grpc_mode_<mode>_c<N>.txt, summary: grpc_server_modes.csv
+
+set -euo pipefail
+
+ROOT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+cd "$ROOT_DIR"
+
+RESULT_DIR="$ROOT_DIR/bench/results"
+PROTO_PATH="$ROOT_DIR/grpc/protos/library.proto"
+GHZ_TARGET="localhost:9090"
+MODES="${MODES:-threads aio}"
+CONCURRENCY="${CONCURRENCY:-50 100 200 1000}"
+DURATION="${DURATION:-30s}"
+SUMMARY="$RESULT_DIR/grpc_server_modes.csv"
+
+for cmd in docker ghz; do
+    if ! command -v "$cmd" &> /dev/null; then
+        echo "Error: $cmd is required" >&2
+        exit 1
+    fi
+done
+
+mkdir -p "$RESULT_DIR"
+echo "mode,concurrency,requests_per_sec,average_ms,p50_ms,p99_ms,errors" > "$SUMMARY"
+
+for mode in $MODES; do
+    echo "=== GRPC_SERVER_MODE=$mode ==="
+    GRPC_SERVER_MODE="$mode" docker compose --profile grpc up -d --build --force-recreate
+    # Elections and connection pools need a moment
+    sleep 15
+
+    for c in $CONCURRENCY; do
+        out="$RESULT_DIR/grpc_mode_${mode}_c${c}.txt"
+        echo "[$mode] concurrency=$c ($DURATION)"
+        ghz --insecure \
+            --proto "$PROTO_PATH" \
+            --call library.SeatService/GetSeats \
+            -d '{"available_only":true}' \
+            -c "$c" \
+            -z "$DURATION" \
+            "$GHZ_TARGET" > "$out" 2>&1 || true
+
+        rps=$(awk '/Requests\/sec:/ {print $2}' "$out")
+        avg=$(awk '/Average:/ {print $2}' "$out")
+        p50=$(awk '/50 % in/ {print $4}' "$out")
+        p99=$(awk '/99 % in/ {print $4}' "$out")
+        errors=$(awk '/^Status code distribution:/ {f=1; next} f && /\[/ && !/\[OK\]/ {n += $2} END {print n + 0}' "$out")
+        echo "$mode,$c,$rps,$avg,$p50,$p99,$errors" >> "$SUMMARY"
+    done
+done
+
+echo ""
+column -s, -t < "$SUMMARY"